@@ -0,0 +1,80 @@
+"""Benchmarks for the clause-building hot paths.
+
+    python -m benchmarks [--output FILE] [--compare BASELINE] [--tolerance 0.25]
+
+Results are written as JSON (nanoseconds per call). With --compare the
+run fails when any case is slower than the baseline beyond tolerance.
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+
+from .cases import CASES
+
+
+def measure(func, setup, rounds: int, number: int) -> dict[str, float]:
+    samples = []
+    for _ in range(rounds):
+        elapsed = 0
+        for _ in range(number):
+            if setup is not None:
+                setup()
+            start = time.perf_counter_ns()
+            func()
+            elapsed += time.perf_counter_ns() - start
+        samples.append(elapsed / number)
+    return {"median": statistics.median(samples), "min": min(samples)}
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        limit = baseline[name]["median"] * (1 + tolerance)
+        if result["median"] > limit:
+            regressions.append(
+                f"{name}: {result['median']:.0f}ns > {limit:.0f}ns "
+                f"(baseline {baseline[name]['median']:.0f}ns)"
+            )
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--compare", help="baseline JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--rounds", type=int, default=7)
+    parser.add_argument("--number", type=int, default=200)
+    parser.add_argument("--filter", default="", help="only run matching cases")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for name, (func, setup) in CASES.items():
+        if args.filter not in name:
+            continue
+        func()  # warm up imports and caches for the warm cases
+        results[name] = measure(func, setup, args.rounds, args.number)
+        print(f"{name:<28} {results[name]['median']:>12.0f} ns", file=sys.stderr)
+
+    payload = json.dumps(results, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as stream:
+            stream.write(payload)
+    else:
+        print(payload)
+
+    if args.compare:
+        with open(args.compare) as stream:
+            regressions = compare(results, json.load(stream), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+import typing
+
+import sqlalchemy as sa
+
+from gyver.query import comp as cp
+from gyver.query.attribute import CACHE_SIZE, MaybeCache, attribute_cache, retrieve_attr
+from gyver.query.group import and_, or_
+from gyver.query.memo import bind_cache
+from gyver.query.order_by import OrderBy
+from gyver.query.paginate import FieldPaginate, KeysetPaginate, encode_cursor
+from gyver.query.utils import compile_stmt
+from gyver.query.where import Where
+from tests.mocks import Another, Person, PersonAddress, RelatedPerson
+
+Case = typing.Callable[[], typing.Any]
+CASES: dict[str, tuple[Case, typing.Optional[Case]]] = {}
+
+
+def case(name: str, setup: typing.Optional[Case] = None):
+    def decorator(func: Case) -> Case:
+        CASES[name] = (func, setup)
+        return func
+
+    return decorator
+
+
+def _clear_caches():
+    attribute_cache.clear()
+    bind_cache.clear()
+
+
+@case("attribute.cold", setup=_clear_caches)
+def attribute_cold():
+    return retrieve_attr(Person, "name")
+
+
+@case("attribute.warm")
+def attribute_warm():
+    return retrieve_attr(Person, "name")
+
+
+@case("attribute.related_warm")
+def attribute_related_warm():
+    return retrieve_attr(RelatedPerson, "address.another.name")
+
+
+_thrash_cache = MaybeCache(maxsize=CACHE_SIZE)
+_thrash_table = sa.Table(
+    "bench_wide",
+    sa.MetaData(),
+    *(sa.Column(f"field{idx}", sa.Integer) for idx in range(CACHE_SIZE * 2)),
+)
+_thrash_keys = [f"field{idx}" for idx in range(CACHE_SIZE * 2)]
+
+
+@case("attribute.thrash")
+def attribute_thrash():
+    for key in _thrash_keys:
+        if _thrash_cache.get((_thrash_table, key)) is None:
+            _thrash_cache.put((_thrash_table, key), getattr(_thrash_table.c, key))
+
+
+def _wide_tree(width: int) -> typing.Any:
+    return and_(*(Where("age", idx, cp.greater) for idx in range(width)))
+
+
+def _deep_tree(depth: int) -> typing.Any:
+    tree = Where("name", "leaf")
+    for idx in range(depth):
+        tree = or_(and_(tree, Where("age", idx)), Where("name", str(idx)))
+    return tree
+
+
+_wide, _deep = _wide_tree(100), _deep_tree(30)
+
+
+@case("bind.wide_cold", setup=_clear_caches)
+def bind_wide_cold():
+    return _wide.bind(Person)
+
+
+@case("bind.wide_warm")
+def bind_wide_warm():
+    return _wide.bind(Person)
+
+
+@case("bind.deep_cold", setup=_clear_caches)
+def bind_deep_cold():
+    return _deep.bind(Person)
+
+
+_relation = Where(
+    "address", True, cp.make_relation_check(Where("address.another.name", "x"))
+)
+
+
+@case("bind.relation_exists", setup=_clear_caches)
+def bind_relation_exists():
+    return _relation.bind(RelatedPerson)
+
+
+_select = sa.select(PersonAddress).outerjoin(Another)
+
+
+@case("paginate.field")
+def paginate_field():
+    return FieldPaginate(50, 1000).apply(_select)
+
+
+_keyset = KeysetPaginate(
+    50, (OrderBy.asc("another_id"), OrderBy.asc("id")), encode_cursor([3, 1000])
+)
+
+
+@case("paginate.keyset")
+def paginate_keyset():
+    return _keyset.apply(_select)
+
+
+_statement = sa.select(Person).where(_wide.bind(Person)).limit(10)
+
+
+@case("compile.select")
+def compile_select():
+    return compile_stmt(_statement)
+
+
+_engine = sa.create_engine("sqlite:///:memory:")
+Person.__table__.create(_engine)
+
+
+@case("execute.sqlite")
+def execute_sqlite():
+    with _engine.connect() as conn:
+        return conn.execute(sa.select(Person).where(_wide.bind(Person))).all()
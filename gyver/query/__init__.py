@@ -0,0 +1,197 @@
+"""Composable, mapper-agnostic query clauses.
+
+Public names are loaded lazily on first access, so importing
+`gyver.query` only costs what is actually used.
+"""
+import importlib
+import typing
+
+if typing.TYPE_CHECKING:
+    from . import comp, instrument, memory, stream
+    from .attribute import retrieve_attr
+    from .block import WhereBlock
+    from .bulk import BulkProgress, abulk_execute, bulk_execute
+    from .cache import MemoryBackend, ResultCache
+    from .exc import (
+        FieldNotFound,
+        FilterError,
+        InvalidCursor,
+        InvalidFilter,
+        UnsupportedClause,
+    )
+    from .group import GroupWhere, and_, or_
+    from .index import disable_index, enable_index
+    from .instrument import add_sink, instrumented, remove_sink
+    from .interface import ApplyClause, BindClause, Comparator
+    from .joins import JoinPlan, plan_joins
+    from .null import NullBind
+    from .order_by import (
+        CompositeOrderBy,
+        NullsPosition,
+        OrderBy,
+        OrderDirection,
+        RankOrderBy,
+    )
+    from .paginate import (
+        FieldPaginate,
+        KeysetPaginate,
+        LimitOffsetPaginate,
+        Page,
+        Paginate,
+        TotalMode,
+        afetch_page,
+        decode_cursor,
+        encode_cursor,
+        fetch_page,
+    )
+    from .parallel import aparallel_select, parallel_select
+    from .spec import FilterParser, parse_filters
+    from .utils import as_date, as_lower, as_time, as_upper, compile_stmt
+    from .where import (
+        AlwaysFalse,
+        AlwaysTrue,
+        ApplyWhere,
+        FieldResolver,
+        RawQuery,
+        Resolver,
+        Where,
+    )
+
+_submodules = {"comp", "instrument", "memory", "stream"}
+_exports = {
+    "retrieve_attr": "attribute",
+    "WhereBlock": "block",
+    "BulkProgress": "bulk",
+    "abulk_execute": "bulk",
+    "bulk_execute": "bulk",
+    "MemoryBackend": "cache",
+    "ResultCache": "cache",
+    "FieldNotFound": "exc",
+    "FilterError": "exc",
+    "InvalidCursor": "exc",
+    "InvalidFilter": "exc",
+    "UnsupportedClause": "exc",
+    "GroupWhere": "group",
+    "and_": "group",
+    "or_": "group",
+    "disable_index": "index",
+    "enable_index": "index",
+    "add_sink": "instrument",
+    "instrumented": "instrument",
+    "remove_sink": "instrument",
+    "JoinPlan": "joins",
+    "plan_joins": "joins",
+    "ApplyClause": "interface",
+    "BindClause": "interface",
+    "Comparator": "interface",
+    "NullBind": "null",
+    "CompositeOrderBy": "order_by",
+    "NullsPosition": "order_by",
+    "OrderBy": "order_by",
+    "OrderDirection": "order_by",
+    "RankOrderBy": "order_by",
+    "FieldPaginate": "paginate",
+    "KeysetPaginate": "paginate",
+    "LimitOffsetPaginate": "paginate",
+    "Page": "paginate",
+    "Paginate": "paginate",
+    "TotalMode": "paginate",
+    "afetch_page": "paginate",
+    "decode_cursor": "paginate",
+    "encode_cursor": "paginate",
+    "fetch_page": "paginate",
+    "aparallel_select": "parallel",
+    "parallel_select": "parallel",
+    "FilterParser": "spec",
+    "parse_filters": "spec",
+    "as_date": "utils",
+    "as_lower": "utils",
+    "as_time": "utils",
+    "as_upper": "utils",
+    "compile_stmt": "utils",
+    "AlwaysFalse": "where",
+    "AlwaysTrue": "where",
+    "ApplyWhere": "where",
+    "FieldResolver": "where",
+    "RawQuery": "where",
+    "Resolver": "where",
+    "Where": "where",
+}
+
+__all__ = [
+    "AlwaysFalse",
+    "AlwaysTrue",
+    "ApplyClause",
+    "ApplyWhere",
+    "BindClause",
+    "BulkProgress",
+    "Comparator",
+    "CompositeOrderBy",
+    "FieldNotFound",
+    "FieldPaginate",
+    "FieldResolver",
+    "FilterError",
+    "FilterParser",
+    "GroupWhere",
+    "InvalidCursor",
+    "InvalidFilter",
+    "JoinPlan",
+    "KeysetPaginate",
+    "LimitOffsetPaginate",
+    "MemoryBackend",
+    "NullBind",
+    "NullsPosition",
+    "OrderBy",
+    "OrderDirection",
+    "Page",
+    "Paginate",
+    "RankOrderBy",
+    "RawQuery",
+    "Resolver",
+    "ResultCache",
+    "TotalMode",
+    "UnsupportedClause",
+    "Where",
+    "WhereBlock",
+    "abulk_execute",
+    "add_sink",
+    "afetch_page",
+    "and_",
+    "aparallel_select",
+    "as_date",
+    "as_lower",
+    "as_time",
+    "as_upper",
+    "bulk_execute",
+    "comp",
+    "compile_stmt",
+    "decode_cursor",
+    "disable_index",
+    "enable_index",
+    "encode_cursor",
+    "fetch_page",
+    "instrument",
+    "instrumented",
+    "memory",
+    "or_",
+    "parallel_select",
+    "parse_filters",
+    "plan_joins",
+    "remove_sink",
+    "retrieve_attr",
+    "stream",
+]
+
+
+def __getattr__(name: str) -> typing.Any:
+    if name in _submodules:
+        return importlib.import_module(f"{__name__}.{name}")
+    if (module := _exports.get(name)) is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{module}"), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
@@ -0,0 +1,65 @@
+import typing
+
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.base import Executable
+from sqlalchemy.sql.elements import ClauseElement, ColumnElement
+from sqlalchemy.sql.visitors import InternalTraversal
+
+
+class DialectSwitch(ColumnElement):
+    """Expression rendered as `default` unless the compiling dialect has
+    an alternative registered by name.
+
+    Alternatives take part in the cache key, so statements stay cacheable.
+    """
+
+    __visit_name__ = "gyver_dialect_switch"
+    inherit_cache = True
+    _traverse_internals = [
+        ("default", InternalTraversal.dp_clauseelement),
+        ("dialects", InternalTraversal.dp_string_list),
+        ("alternatives", InternalTraversal.dp_clauseelement_list),
+    ]
+
+    def __init__(self, default: ColumnElement, **alternatives: ColumnElement) -> None:
+        self.default = default
+        self.dialects = tuple(alternatives)
+        self.alternatives = tuple(alternatives.values())
+        self.type = default.type
+        self._is_implicitly_boolean = default._is_implicitly_boolean
+
+    def for_dialect(self, name: str) -> ColumnElement:
+        for dialect, alternative in zip(self.dialects, self.alternatives):
+            if dialect == name:
+                return alternative
+        return self.default
+
+
+@compiles(DialectSwitch)
+def _compile_dialect_switch(
+    element: DialectSwitch, compiler: typing.Any, **kw: typing.Any
+) -> str:
+    return compiler.process(element.for_dialect(compiler.dialect.name), **kw)
+
+
+class Explain(Executable, ClauseElement):
+    """`prefix` followed by `statement`, with its parameters still bound.
+
+    Not cached: a cached compile would map the plan rows onto the columns
+    of `statement`.
+    """
+
+    __visit_name__ = "gyver_explain"
+    inherit_cache = False
+
+    def __init__(self, statement: ClauseElement, prefix: str = "EXPLAIN") -> None:
+        self.statement = statement
+        self.prefix = prefix
+
+
+@compiles(Explain)
+def _compile_explain(element: Explain, compiler: typing.Any, **kw: typing.Any) -> str:
+    statement = compiler.process(element.statement, **kw)
+    # rows come from the cursor, not from the explained statement's columns
+    compiler.isplaintext = True
+    return f"{element.prefix} {statement}"
@@ -1,45 +1,195 @@
+import os
+import threading
+import weakref
+from collections import OrderedDict
 from functools import wraps
-from typing import Callable, Hashable, Mapping, Optional, OrderedDict, cast
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Hashable,
+    Mapping,
+    Optional,
+    TypeVar,
+    cast,
+)
 
+import sqlalchemy as sa
 from gyver.attrs import call_init, define
-from gyver.database.entity import AbstractEntity
 from sqlalchemy.sql import ColumnElement
 from typing_extensions import TypeGuard
 
+from . import index, instrument
 from .exc import FieldNotFound
 from .interface import FieldType, Mapper
 
-CACHE_SIZE = 250
+if TYPE_CHECKING:
+    from gyver.database.entity import AbstractEntity
+
+CACHE_SIZE = int(os.environ.get("GYVER_QUERY_CACHE_SIZE", 250))
+
+T = TypeVar("T")
+AdmissionPolicy = Callable[[Mapper], bool]
 
 
 @define
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    rejections: int
+    size: int
+    maxsize: int
+
+
+@define(frozen=False)
 class MaybeCache:
-    _cache: OrderedDict[tuple[Mapper, str], FieldType]
+    """Thread-safe LRU cache with lock-free reads.
+
+    Hits only refresh recency when the lock is free and writes are
+    serialized, so readers never block. Counters are best-effort.
 
-    def __init__(self) -> None:
-        call_init(self, OrderedDict())
+    Mappers are held weakly: entries are keyed by the mapper identity and
+    dropped once the mapper is collected, and columns owned by a table are
+    weakly held as well so they do not keep it alive. With `doorkeeper`
+    set, a key is only admitted into a full cache on its second miss, so
+    one-shot mappers cannot flush hot entries.
+    """
+
+    _cache: OrderedDict[tuple[int, Hashable], Any]
+    _mappers: dict[int, weakref.ref]
+    _seen: set[int]
+    _lock: threading.RLock
+    maxsize: int
+    admit: Optional[AdmissionPolicy]
+    doorkeeper: bool
+    hits: int
+    misses: int
+    evictions: int
+    rejections: int
+
+    def __init__(
+        self,
+        maxsize: Optional[int] = None,
+        admit: Optional[AdmissionPolicy] = None,
+        doorkeeper: bool = False,
+    ) -> None:
+        maxsize = CACHE_SIZE if maxsize is None else maxsize
+        if maxsize <= 0:
+            raise ValueError("MaybeCache maxsize must be positive")
+        call_init(
+            self,
+            OrderedDict(),
+            {},
+            set(),
+            threading.RLock(),
+            maxsize,
+            admit,
+            doorkeeper,
+            0,
+            0,
+            0,
+            0,
+        )
 
     @property
-    def cache(self) -> Mapping[tuple[Mapper, str], FieldType]:
-        return self._cache
+    def cache(self) -> Mapping[tuple[Mapper, Hashable], Any]:
+        snapshot = {}
+        for (mapper_id, field), value in list(self._cache.items()):
+            ref = self._mappers.get(mapper_id)
+            mapper = ref() if ref is not None else None
+            value = _deref(value)
+            if mapper is not None and value is not None:
+                snapshot[(mapper, field)] = value
+        return snapshot
+
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            self.hits,
+            self.misses,
+            self.evictions,
+            self.rejections,
+            len(self._cache),
+            self.maxsize,
+        )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            self._mappers.clear()
+            self._seen.clear()
+            self.hits = self.misses = self.evictions = self.rejections = 0
 
-    def get(self, key: tuple[Mapper, str]) -> Optional[FieldType]:
-        if not all(isinstance(item, Hashable) for item in key):
+    def get(self, key: tuple[Mapper, Hashable]) -> Any:
+        mapper, field = key
+        cache_key = (id(mapper), field)
+        try:
+            value = _deref(self._cache.get(cache_key))
+        except TypeError:
+            return None
+        if value is None:
+            self.misses += 1
             return None
-        if key in self._cache:
-            value = self._cache.pop(key)
-            self._cache[key] = value
-            return value
-        return None
-
-    def put(self, key: tuple[Mapper, str], field: FieldType) -> FieldType:
-        if not all(isinstance(item, Hashable) for item in key):
+        self.hits += 1
+        if self._lock.acquire(blocking=False):
+            try:
+                self._cache.move_to_end(cache_key)
+            except KeyError:
+                pass
+            finally:
+                self._lock.release()
+        return value
+
+    def put(self, key: tuple[Mapper, Hashable], field: T) -> T:
+        mapper, name = key
+        cache_key = (id(mapper), name)
+        try:
+            key_hash = hash(cache_key)
+        except TypeError:
             return field
-        if len(self._cache) >= CACHE_SIZE:
-            self._cache.popitem(last=False)
-        self._cache[key] = field
+        if self.admit is not None and not self.admit(mapper):
+            self.rejections += 1
+            return field
+        with self._lock:
+            if cache_key in self._cache:
+                self._cache.move_to_end(cache_key)
+            elif len(self._cache) >= self.maxsize:
+                if self.doorkeeper and key_hash not in self._seen:
+                    self._admit_later(key_hash)
+                    return field
+                self._seen.discard(key_hash)
+                self._cache.popitem(last=False)
+                self.evictions += 1
+            if not self._watch(mapper):
+                self.rejections += 1
+                return field
+            self._cache[cache_key] = _store(mapper, field)
         return field
 
+    def _admit_later(self, key_hash: int) -> None:
+        if len(self._seen) >= self.maxsize:
+            self._seen.clear()
+        self._seen.add(key_hash)
+        self.rejections += 1
+
+    def _watch(self, mapper: Mapper) -> bool:
+        mapper_id = id(mapper)
+        if (ref := self._mappers.get(mapper_id)) is not None and ref() is mapper:
+            return True
+        try:
+            self._mappers[mapper_id] = weakref.ref(
+                mapper, lambda _, mapper_id=mapper_id: self._forget(mapper_id)
+            )
+        except TypeError:
+            return False
+        return True
+
+    def _forget(self, mapper_id: int) -> None:
+        with self._lock:
+            self._mappers.pop(mapper_id, None)
+            for key in [key for key in self._cache if key[0] == mapper_id]:
+                del self._cache[key]
+
     def __call__(
         self, func: Callable[[Mapper, str], FieldType]
     ) -> Callable[[Mapper, str], FieldType]:
@@ -52,11 +202,60 @@ class MaybeCache:
         return inner
 
 
-@MaybeCache()
+def _store(mapper: Mapper, value: Any) -> Any:
+    if getattr(value, "table", None) is mapper:
+        return weakref.ref(value)
+    return value
+
+
+def _deref(value: Any) -> Any:
+    return value() if type(value) is weakref.ref else value
+
+
+def is_persistent_mapper(mapper: Mapper) -> bool:
+    return isinstance(mapper, (sa.Table, type))
+
+
+attribute_cache = MaybeCache(admit=is_persistent_mapper, doorkeeper=True)
+
+
 def retrieve_attr(entity: Mapper, field: str) -> FieldType:
+    if instrument.sinks:
+        return _instrumented_retrieve_attr(entity, field)
+    field_index = index.registry.get(entity)
+    if field_index is not None and field_index.covers(field):
+        return field_index.get(field)
+    return _retrieve_attr(entity, field)
+
+
+def _instrumented_retrieve_attr(entity: Mapper, field: str) -> FieldType:
+    start = instrument.now()
+    source = "retrieve_attr"
+    field_index = index.registry.get(entity)
+    if field_index is not None and field_index.covers(field):
+        attr = field_index.get(field)
+        instrument.record("attribute", start, source, entity, field, hit=True)
+        return attr
+    if (attr := attribute_cache.get((entity, field))) is not None:
+        instrument.record("attribute", start, source, entity, field, hit=True)
+        return attr
+    attr = attribute_cache.put(
+        (entity, field), _retrieve_attr.__wrapped__(entity, field)  # type: ignore
+    )
+    instrument.record("attribute", start, source, entity, field, hit=False)
+    return attr
+
+
+def entity_field(field: str) -> str:
+    """Attribute name of `field` on an entity, where `id` maps to `id_`."""
+    return "id_" if field == "id" else field
+
+
+@attribute_cache
+def _retrieve_attr(entity: Mapper, field: str) -> FieldType:
     is_entity = _is_entity(entity)
-    if field == "id" and is_entity:
-        field = "id_"
+    if is_entity:
+        field = entity_field(field)
     if "." in field:
         if is_entity:
             return _retrieve_related_field(entity, field)
@@ -68,26 +267,25 @@ def retrieve_attr(entity: Mapper, field: str) -> FieldType:
         raise FieldNotFound(name, field) from None
 
 
-def _is_entity(entity: Mapper) -> TypeGuard[type[AbstractEntity]]:
-    return isinstance(entity, type) and issubclass(entity, AbstractEntity)
+def _is_entity(entity: Mapper) -> TypeGuard["type[AbstractEntity]"]:
+    if not isinstance(entity, type):
+        return False
+    from gyver.database.entity import AbstractEntity
+
+    return issubclass(entity, AbstractEntity)
 
 
-def _retrieve_related_field(
-    entity: type[AbstractEntity], field: str
-) -> FieldType:
+def _retrieve_related_field(entity: "type[AbstractEntity]", field: str) -> FieldType:
     *fields, target_field = field.split(".")
     current_mapper = entity
-    for f in fields:
-        if f == "id":
-            f = "id_"
+    for f in map(entity_field, fields):
         try:
             attr = cast(ColumnElement, getattr(current_mapper, f))
         except AttributeError:
             raise FieldNotFound(entity.__name__, f) from None
         else:
             current_mapper = attr.entity.class_
-    if target_field == "id":
-        target_field = "id_"
+    target_field = entity_field(target_field)
     try:
         return getattr(current_mapper, target_field)
     except AttributeError:
@@ -0,0 +1,202 @@
+import functools
+import sys
+import threading
+import weakref
+from array import array
+from typing import Any, Callable, Iterable, Iterator, Optional, Sequence, Union
+
+import sqlalchemy as sa
+from gyver.attrs import call_init, define
+
+from . import attribute
+from . import comp as cp
+from . import interface
+from .memo import memo_bind, node_hash, same_value, unhashable
+from .typedef import ClauseType
+from .where import Where
+
+Row = Union[tuple[str, Any], tuple[str, Any, interface.Comparator]]
+
+ComparatorRef = Callable[[], Optional[interface.Comparator]]
+
+_comparators: list[Optional[ComparatorRef]] = []
+_comparator_ids: "weakref.WeakKeyDictionary[interface.Comparator, int]" = (
+    weakref.WeakKeyDictionary()
+)
+_pinned_ids: dict[interface.Comparator, int] = {}
+_free_ids: list[int] = []
+_lock = threading.RLock()
+
+
+def _live(cid: int) -> Optional[interface.Comparator]:
+    ref = _comparators[cid]
+    return None if ref is None else ref()
+
+
+def _find(comp: interface.Comparator) -> Optional[tuple[int, interface.Comparator]]:
+    try:
+        cid = _comparator_ids.get(comp)
+    except TypeError:
+        cid = _pinned_ids.get(comp)
+    if cid is None or (registered := _live(cid)) is None:
+        return None
+    return cid, registered
+
+
+def _register(comp: interface.Comparator) -> tuple[int, interface.Comparator]:
+    """Id of `comp` and the registered comparator that owns the id."""
+    if (found := _find(comp)) is not None:
+        return found
+    with _lock:
+        if (found := _find(comp)) is not None:
+            return found
+        cid = _free_ids.pop() if _free_ids else len(_comparators)
+        try:
+            ref: ComparatorRef = weakref.ref(comp, functools.partial(_release, cid))
+            _comparator_ids[comp] = cid
+        except TypeError:
+            ref = functools.partial(_pinned, comp)
+            _pinned_ids[comp] = cid
+        if cid == len(_comparators):
+            _comparators.append(ref)
+        else:
+            _comparators[cid] = ref
+        return cid, comp
+
+
+def _pinned(comp: interface.Comparator) -> interface.Comparator:
+    return comp
+
+
+def _release(cid: int, _: Any) -> None:
+    with _lock:
+        _comparators[cid] = None
+        _free_ids.append(cid)
+
+
+def comparator_id(comp: interface.Comparator) -> int:
+    """Small shared id for `comp`, registered on first use.
+
+    Comparators are held weakly and a block keeps its own alive, so the
+    ids of comparators nothing uses any more, such as per-call closures,
+    are recycled. Builtins that cannot be weakly referenced stay.
+    """
+    return _register(comp)[0]
+
+
+def comparator(cid: int) -> interface.Comparator:
+    if (comp := _live(cid)) is None:
+        raise KeyError(cid)
+    return comp
+
+
+@define
+class WhereBlock(interface.BindClause):
+    """A flat run of plain predicates joined by a single operator.
+
+    Fields, values and comparator ids are stored column-wise, so a block
+    costs a handful of containers instead of one node per predicate.
+    """
+
+    fields: tuple[str, ...]
+    values: tuple[Any, ...]
+    comps: array
+    operator: Callable[..., interface.SaComparison]
+    mark: Optional[str]
+    _held: tuple[interface.Comparator, ...]
+    _hash: Optional[int]
+
+    type_ = ClauseType.BIND
+
+    def __init__(
+        self,
+        fields: Sequence[str],
+        values: Sequence[Any],
+        comps: Union[interface.Comparator, Sequence[interface.Comparator]] = (
+            cp.equals
+        ),
+        operator: Callable[..., interface.SaComparison] = sa.and_,
+        mark: Optional[str] = None,
+    ) -> None:
+        if not fields:
+            raise ValueError("WhereBlock requires at least one predicate")
+        if callable(comps):
+            cid, comp = _register(comps)
+            ids, held = array("I", [cid]) * len(fields), {cid: comp}
+        else:
+            entries = [_register(comp) for comp in comps]
+            ids, held = array("I", [cid for cid, _ in entries]), dict(entries)
+        if not len(fields) == len(values) == len(ids):
+            raise ValueError("WhereBlock columns must have the same length")
+        fields, values = tuple(map(sys.intern, fields)), tuple(values)
+        call_init(
+            self,
+            fields,
+            values,
+            ids,
+            operator,
+            mark,
+            tuple(held.values()),
+            node_hash(fields, values, ids.tobytes(), operator, mark),
+        )
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: Iterable[Row],
+        operator: Callable[..., interface.SaComparison] = sa.and_,
+        mark: Optional[str] = None,
+    ) -> "WhereBlock":
+        fields, values, comps = [], [], []
+        for row in rows:
+            fields.append(row[0])
+            values.append(row[1])
+            comps.append(row[2] if len(row) > 2 else cp.equals)
+        return cls(fields, values, comps, operator, mark)
+
+    @classmethod
+    def from_columns(
+        cls,
+        fields: Sequence[str],
+        values: Sequence[Any],
+        comps: Union[interface.Comparator, Sequence[interface.Comparator]] = (
+            cp.equals
+        ),
+        operator: Callable[..., interface.SaComparison] = sa.and_,
+        mark: Optional[str] = None,
+    ) -> "WhereBlock":
+        return cls(fields, values, comps, operator, mark)
+
+    def __len__(self) -> int:
+        return len(self.fields)
+
+    def __iter__(self) -> Iterator[Where]:
+        for field, value, cid in zip(self.fields, self.values, self.comps):
+            yield Where(field, value, comparator(cid))
+
+    def __eq__(self, other: object) -> bool:
+        return (
+            type(self) is type(other)
+            and self.fields == other.fields  # type: ignore
+            and self.comps == other.comps  # type: ignore
+            and self.operator is other.operator  # type: ignore
+            and self.mark == other.mark  # type: ignore
+            and same_value(self.values, other.values)  # type: ignore
+        )
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            raise unhashable(self)
+        return self._hash
+
+    @memo_bind
+    def bind(self, mapper: interface.Mapper) -> interface.SaComparison:
+        retrieve_attr = attribute.retrieve_attr
+        return self.operator(
+            *(
+                comparator(cid)(retrieve_attr(mapper, field), value)
+                if value is not None
+                else sa.true()
+                for field, value, cid in zip(self.fields, self.values, self.comps)
+            )
+        )
@@ -0,0 +1,181 @@
+import asyncio
+import time
+import typing
+
+import sqlalchemy as sa
+from gyver.attrs import define
+from sqlalchemy.sql import Delete, Update
+
+from . import instrument, interface
+from .order_by import OrderBy
+from .paginate import KeysetPaginate
+from .where import ApplyWhere
+
+Mutation = typing.Union[Update, Delete]
+
+
+@define
+class BulkProgress:
+    """State of a bulk mutation after a batch.
+
+    `checkpoint` is a keyset cursor past the last processed key; pass it
+    back to resume. `done` is False when the run stopped on its budget.
+    """
+
+    batches: int = 0
+    rows: int = 0
+    checkpoint: typing.Optional[str] = None
+    done: bool = False
+
+
+ProgressCallback = typing.Callable[[BulkProgress], typing.Any]
+
+
+@define
+class _Plan:
+    mutation: Mutation
+    keys: tuple[sa.Column, ...]
+    where: typing.Optional[ApplyWhere]
+    batch_size: int
+    max_rows: typing.Optional[int]
+
+    def select(self, processed: int, checkpoint: typing.Optional[str]):
+        limit = self.batch_size
+        if self.max_rows is not None:
+            limit = min(limit, self.max_rows - processed)
+        if limit <= 0:
+            return None
+        paginate = KeysetPaginate(
+            limit, tuple(OrderBy.asc(key.key) for key in self.keys), checkpoint
+        )
+        return paginate, paginate.apply(self.filter(sa.select(*self.keys)))
+
+    def mutate(self, rows: typing.Sequence[typing.Any]) -> Mutation:
+        if len(self.keys) == 1:
+            condition = self.keys[0].in_([row[0] for row in rows])
+        else:
+            condition = sa.tuple_(*self.keys).in_([tuple(row) for row in rows])
+        return self.filter(self.mutation.where(condition))
+
+    def filter(self, statement):
+        return statement if self.where is None else self.where.apply(statement)
+
+
+def _plan(
+    mapper: interface.Mapper,
+    statement: Mutation,
+    where: typing.Sequence[interface.BindClause],
+    batch_size: int,
+    max_rows: typing.Optional[int],
+) -> _Plan:
+    if not isinstance(statement, (Update, Delete)):
+        raise TypeError(f"expected an Update or Delete, got {type(statement)!r}")
+    if batch_size < 1:
+        raise ValueError("batch_size must be positive")
+    keys = tuple(statement.table.primary_key.columns)  # type: ignore
+    if not keys:
+        raise ValueError(f"{statement.table} has no primary key")
+    apply_where = ApplyWhere(mapper, *where) if where else None
+    return _Plan(statement, keys, apply_where, batch_size, max_rows)
+
+
+def _advance(
+    progress: BulkProgress,
+    paginate: KeysetPaginate,
+    rows: typing.Sequence[typing.Any],
+    rowcount: int,
+) -> BulkProgress:
+    return BulkProgress(
+        progress.batches + 1,
+        progress.rows + (rowcount if rowcount >= 0 else len(rows)),
+        paginate.next_cursor(rows[-1]),
+        len(rows) < paginate.limit,
+    )
+
+
+def bulk_execute(
+    executor: typing.Any,
+    mapper: interface.Mapper,
+    statement: Mutation,
+    *where: interface.BindClause,
+    batch_size: int = 1000,
+    pause: float = 0.0,
+    max_rows: typing.Optional[int] = None,
+    checkpoint: typing.Optional[str] = None,
+    on_batch: typing.Optional[ProgressCallback] = None,
+    commit: bool = False,
+) -> BulkProgress:
+    """Run `statement` over the rows matching `where` in primary key batches.
+
+    Each batch selects up to `batch_size` keys past the checkpoint and
+    mutates only those rows, re-checking `where`. With `commit` the
+    executor is committed after every batch so locks are held for one
+    batch only. `max_rows` caps how many keys are visited.
+    """
+    plan = _plan(mapper, statement, where, batch_size, max_rows)
+    progress = BulkProgress(checkpoint=checkpoint)
+    scanned = 0
+    while (selected := plan.select(scanned, progress.checkpoint)) is not None:
+        paginate, query = selected
+        start = instrument.now()
+        rows = executor.execute(query).all()
+        if not rows:
+            return BulkProgress(
+                progress.batches, progress.rows, progress.checkpoint, True
+            )
+        result = executor.execute(plan.mutate(rows))
+        if commit:
+            executor.commit()
+        scanned += len(rows)
+        progress = _advance(progress, paginate, rows, result.rowcount)
+        if instrument.sinks:
+            instrument.record("bulk_batch", start, "bulk_execute", mapper)
+        if on_batch is not None:
+            on_batch(progress)
+        if progress.done:
+            return progress
+        if pause:
+            time.sleep(pause)
+    return progress
+
+
+async def abulk_execute(
+    executor: typing.Any,
+    mapper: interface.Mapper,
+    statement: Mutation,
+    *where: interface.BindClause,
+    batch_size: int = 1000,
+    pause: float = 0.0,
+    max_rows: typing.Optional[int] = None,
+    checkpoint: typing.Optional[str] = None,
+    on_batch: typing.Optional[ProgressCallback] = None,
+    commit: bool = False,
+) -> BulkProgress:
+    plan = _plan(mapper, statement, where, batch_size, max_rows)
+    progress = BulkProgress(checkpoint=checkpoint)
+    scanned = 0
+    while (selected := plan.select(scanned, progress.checkpoint)) is not None:
+        paginate, query = selected
+        start = instrument.now()
+        rows = (await executor.execute(query)).all()
+        if not rows:
+            return BulkProgress(
+                progress.batches, progress.rows, progress.checkpoint, True
+            )
+        result = await executor.execute(plan.mutate(rows))
+        if commit:
+            await executor.commit()
+        scanned += len(rows)
+        progress = _advance(progress, paginate, rows, result.rowcount)
+        if instrument.sinks:
+            instrument.record("bulk_batch", start, "abulk_execute", mapper)
+        if on_batch is not None:
+            on_batch(progress)
+        if progress.done:
+            return progress
+        if pause:
+            await asyncio.sleep(pause)
+    return progress
+
+
+__all__ = ["BulkProgress", "abulk_execute", "bulk_execute"]
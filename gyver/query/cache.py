@@ -0,0 +1,341 @@
+import itertools
+import threading
+import time
+import typing
+import weakref
+from collections import OrderedDict
+
+import sqlalchemy as sa
+from gyver.attrs import call_init, define
+from sqlalchemy.sql import Delete, Executable, Insert, Update
+from sqlalchemy.sql.util import find_tables
+
+from . import instrument
+from .attribute import CACHE_SIZE
+
+Key = typing.Hashable
+Tables = frozenset[str]
+
+_caches: "weakref.WeakSet[ResultCache]" = weakref.WeakSet()
+_engines: "weakref.WeakKeyDictionary[sa.Engine, int]" = weakref.WeakKeyDictionary()
+_engine_ids = itertools.count()
+_watch_lock = threading.Lock()
+_PENDING = "gyver_query_cache_pending"
+
+
+class CacheBackend(typing.Protocol):
+    """Storage for cached results.
+
+    Keys are process-local hashables; `tables` lists the tables a result
+    was read from so `invalidate` can drop it.
+    """
+
+    def get(self, key: Key) -> typing.Optional[list[typing.Any]]:
+        ...
+
+    def set(
+        self,
+        key: Key,
+        value: list[typing.Any],
+        tables: Tables,
+        ttl: typing.Optional[float],
+    ) -> None:
+        ...
+
+    def invalidate(self, tables: typing.Iterable[str]) -> None:
+        ...
+
+    def clear(self) -> None:
+        ...
+
+
+@define(frozen=False)
+class MemoryBackend:
+    """In-process LRU backend with per-entry expiry."""
+
+    _entries: OrderedDict[Key, tuple[typing.Optional[float], Tables, list]]
+    _by_table: dict[str, set[Key]]
+    _lock: threading.RLock
+    maxsize: int
+
+    def __init__(self, maxsize: typing.Optional[int] = None) -> None:
+        maxsize = CACHE_SIZE if maxsize is None else maxsize
+        if maxsize <= 0:
+            raise ValueError("MemoryBackend maxsize must be positive")
+        call_init(self, OrderedDict(), {}, threading.RLock(), maxsize)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Key) -> typing.Optional[list[typing.Any]]:
+        with self._lock:
+            if (entry := self._entries.get(key)) is None:
+                return None
+            expires, _, value = entry
+            if expires is not None and expires <= time.monotonic():
+                self._drop(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(
+        self,
+        key: Key,
+        value: list[typing.Any],
+        tables: Tables,
+        ttl: typing.Optional[float],
+    ) -> None:
+        expires = None if ttl is None else time.monotonic() + ttl
+        with self._lock:
+            self._drop(key)
+            while len(self._entries) >= self.maxsize:
+                self._drop(next(iter(self._entries)))
+            self._entries[key] = (expires, tables, value)
+            for table in tables:
+                self._by_table.setdefault(table, set()).add(key)
+
+    def invalidate(self, tables: typing.Iterable[str]) -> None:
+        with self._lock:
+            for table in tables:
+                for key in self._by_table.pop(table, ()):
+                    self._drop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_table.clear()
+
+    def _drop(self, key: Key) -> None:
+        if (entry := self._entries.pop(key, None)) is None:
+            return
+        for table in entry[1]:
+            if (keys := self._by_table.get(table)) is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_table[table]
+
+
+def statement_key(
+    statement: Executable, bind: typing.Any = None
+) -> typing.Optional[Key]:
+    """SQLAlchemy cache key plus bound values, None if not cacheable.
+
+    With a `bind` (engine, connection or session) the key is also tied
+    to its engine, so equal statements against two databases differ.
+    """
+    cache_key = statement._generate_cache_key()  # type: ignore
+    if cache_key is None:
+        return None
+    values = tuple(_freeze(param.effective_value) for param in cache_key.bindparams)
+    key = (watch(bind), cache_key.key, values)
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def statement_tables(statement: Executable) -> Tables:
+    return frozenset(
+        table.fullname
+        for table in find_tables(
+            statement, include_aliases=True, include_crud=True  # type: ignore
+        )
+        if hasattr(table, "fullname")
+    )
+
+
+def _freeze(value: typing.Any) -> typing.Any:
+    if isinstance(value, (list, tuple)):
+        return tuple(map(_freeze, value))
+    if isinstance(value, (set, frozenset)):
+        return frozenset(map(_freeze, value))
+    return value
+
+
+def _table_names(tables: typing.Iterable[typing.Any]) -> list[str]:
+    names = []
+    for table in tables:
+        if isinstance(table, str):
+            names.append(table)
+        elif (fullname := getattr(table, "fullname", None)) is not None:
+            names.append(fullname)
+        else:
+            names.append(table.__table__.fullname)
+    return names
+
+
+def invalidate(*tables: typing.Any) -> None:
+    """Drop cached results read from `tables` in every live ResultCache.
+
+    Accepts tables, entities or table names.
+    """
+    if not _caches:
+        return
+    names = _table_names(tables)
+    for cache in list(_caches):
+        cache.backend.invalidate(names)
+
+
+def _engine(bind: typing.Any) -> typing.Optional[sa.Engine]:
+    bind = getattr(bind, "sync_session", bind)
+    if hasattr(bind, "get_bind"):
+        bind = bind.get_bind()
+    bind = getattr(bind, "sync_engine", bind)
+    engine = getattr(bind, "engine", None)
+    return engine if isinstance(engine, sa.Engine) else None
+
+
+def watch(bind: typing.Any) -> typing.Optional[int]:
+    """Invalidate cached results when `bind` commits a mutation.
+
+    Inserts, updates and deletes run through the engine behind `bind`
+    are collected per connection and dropped from every live ResultCache
+    once that connection commits or rolls back. Until then the connection
+    bypasses the cache, so it sees its own writes and never stores rows
+    another connection could read after a rollback. Returns the id used
+    for the engine in cache keys, None if no engine is found.
+    `ResultCache.execute` watches its executor on its own.
+    """
+    if (engine := _engine(bind)) is None:
+        return None
+    with _watch_lock:
+        if (engine_id := _engines.get(engine)) is None:
+            engine_id = _engines[engine] = next(_engine_ids)
+            sa.event.listen(engine, "after_execute", _record)
+            sa.event.listen(engine, "commit", _flush)
+            sa.event.listen(engine, "rollback", _flush)
+    return engine_id
+
+
+def _record(conn: sa.Connection, statement: typing.Any, *_: typing.Any) -> None:
+    if not _caches or not isinstance(statement, (Insert, Update, Delete)):
+        return
+    tables = statement_tables(statement)
+    if conn._is_autocommit_isolation():
+        invalidate(*tables)
+    else:
+        conn.info.setdefault(_PENDING, set()).update(tables)
+
+
+def _flush(conn: sa.Connection) -> None:
+    if tables := conn.info.pop(_PENDING, None):
+        invalidate(*tables)
+
+
+def _connection(executor: typing.Any) -> typing.Optional[sa.Connection]:
+    executor = getattr(executor, "sync_session", executor)
+    if hasattr(executor, "get_bind"):
+        return executor.connection() if executor.in_transaction() else None
+    executor = getattr(executor, "sync_connection", executor)
+    return executor if isinstance(executor, sa.Connection) else None
+
+
+def _has_pending(executor: typing.Any) -> bool:
+    conn = _connection(executor)
+    return conn is not None and bool(conn.info.get(_PENDING))
+
+
+@define(frozen=False, slots=False, eq=False)
+class ResultCache:
+    """Opt-in cache for the rows of repeated selects.
+
+    Results are keyed by the statement's SQLAlchemy cache key and bound
+    values and the executor's engine, so only identical statements share
+    rows. Once a connection of a watched engine ends a transaction with
+    an insert, update or delete, the results of the tables it touched are
+    dropped, and it skips the cache while that transaction is open (see
+    `watch`). `execute` always returns a list: the rows (or scalars) of a
+    select, or of a mutation's RETURNING clause, empty without one. Rows
+    are materialized, so it is meant for column selects rather than ORM
+    entities.
+    """
+
+    backend: CacheBackend
+    ttl: typing.Optional[float]
+    hits: int
+    misses: int
+
+    def __init__(
+        self,
+        backend: typing.Optional[CacheBackend] = None,
+        ttl: typing.Optional[float] = None,
+    ) -> None:
+        call_init(self, backend or MemoryBackend(), ttl, 0, 0)
+        _caches.add(self)
+
+    def execute(
+        self, executor: typing.Any, statement: Executable, scalars: bool = False
+    ) -> list[typing.Any]:
+        key = self._key(executor, statement)
+        if (rows := self._lookup(key, scalars)) is not None:
+            return rows
+        result = executor.execute(statement)
+        return self._store(key, statement, scalars, result)
+
+    async def aexecute(
+        self, executor: typing.Any, statement: Executable, scalars: bool = False
+    ) -> list[typing.Any]:
+        key = self._key(executor, statement)
+        if (rows := self._lookup(key, scalars)) is not None:
+            return rows
+        result = await executor.execute(statement)
+        return self._store(key, statement, scalars, result)
+
+    def invalidate(self, *tables: typing.Any) -> None:
+        self.backend.invalidate(_table_names(tables))
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+    def _key(self, executor: typing.Any, statement: Executable) -> typing.Optional[Key]:
+        if isinstance(statement, (Insert, Update, Delete)):
+            watch(executor)
+            return None
+        if _has_pending(executor):
+            return None
+        return statement_key(statement, executor)
+
+    def _lookup(
+        self, key: typing.Optional[Key], scalars: bool
+    ) -> typing.Optional[list[typing.Any]]:
+        if key is None:
+            return None
+        start = instrument.now()
+        rows = self.backend.get((key, scalars))
+        if rows is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        if instrument.sinks:
+            instrument.record(
+                "result_cache", start, "ResultCache", hit=rows is not None
+            )
+        return None if rows is None else list(rows)
+
+    def _store(
+        self,
+        key: typing.Optional[Key],
+        statement: Executable,
+        scalars: bool,
+        result: typing.Any,
+    ) -> list[typing.Any]:
+        if not result.returns_rows:
+            return []
+        rows = list(result.scalars().all() if scalars else result.all())
+        if key is not None:
+            self.backend.set(
+                (key, scalars), rows, statement_tables(statement), self.ttl
+            )
+        return rows
+
+
+__all__ = [
+    "CacheBackend",
+    "MemoryBackend",
+    "ResultCache",
+    "invalidate",
+    "statement_key",
+    "statement_tables",
+    "watch",
+]
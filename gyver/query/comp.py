@@ -1,8 +1,18 @@
+import builtins
+import enum
+import json
+import re
 import typing
 
 import sqlalchemy as sa
+from sqlalchemy.dialects import mysql, postgresql
+from sqlalchemy.sql.elements import Grouping
 
 from . import interface
+from ._dialect import DialectSwitch
+
+LARGE_IN_THRESHOLD = 1000
+DEFAULT_CHUNK_SIZE = 1000
 
 
 def always_true(
@@ -12,6 +22,13 @@ def always_true(
     return sa.true()
 
 
+def always_false(
+    field: interface.FieldType, target: typing.Any
+) -> interface.SaComparison:
+    del field, target
+    return sa.false()
+
+
 def equals(field: interface.FieldType, target: typing.Any) -> interface.SaComparison:
     return field == target
 
@@ -74,59 +91,517 @@ def llike(field: interface.FieldType, target: str) -> interface.SaComparison:
     return field.like(f"%{target}")
 
 
-def insensitive_like(
-    opt: typing.Literal["like", "rlike", "llike"] = "like"
-) -> interface.Comparator[str]:
-    fmt = {"like": "%{target}%", "rlike": "%{target}", "llike": "{target}%"}[opt]
+INSENSITIVE_LIKE_PATTERNS = {
+    "like": "%{target}%",
+    "rlike": "%{target}",
+    "llike": "{target}%",
+}
+
 
+def _insensitive_like(fmt: str) -> interface.Comparator[str]:
     def comparator(field: interface.FieldType, target: str):
         return field.ilike(fmt.format(target=target))
 
     return comparator
 
 
+_insensitive_likes = {
+    opt: _insensitive_like(fmt) for opt, fmt in INSENSITIVE_LIKE_PATTERNS.items()
+}
+
+
+def insensitive_like(
+    opt: typing.Literal["like", "rlike", "llike"] = "like"
+) -> interface.Comparator[str]:
+    return _insensitive_likes[opt]
+
+
 def isnull(field: interface.FieldType, target: bool) -> interface.SaComparison:
     return field.is_(None) if target else field.is_not(None)
 
 
+def _as_sequence(target: typing.Iterable) -> typing.Sequence:
+    if isinstance(target, (list, tuple)):
+        return target
+    if callable(tolist := getattr(target, "tolist", None)):
+        # numpy arrays: one conversion to driver-friendly python values
+        return tolist()
+    return tuple(target)
+
+
 def includes(
     field: interface.FieldType, target: typing.Sequence
 ) -> interface.SaComparison:
-    return field.in_(list(target))
+    return field.in_(_as_sequence(target))
 
 
 def excludes(
     field: interface.FieldType, target: typing.Sequence
 ) -> interface.SaComparison:
-    return field.not_in(list(target))
+    return field.not_in(_as_sequence(target))
+
+
+class InStrategy(str, enum.Enum):
+    AUTO = "auto"
+    EXPANDING = "expanding"
+    LITERAL = "literal"
+    ARRAY = "array"
+    VALUES = "values"
+    CHUNKED = "chunked"
+
+
+def _literal_in(field: interface.FieldType, values: typing.Sequence):
+    return field.in_(sa.bindparam(None, values, expanding=True, literal_execute=True))
+
+
+def _array_in(field: interface.FieldType, values: typing.Sequence, literal: bool):
+    fallback = _literal_in(field, values) if literal else field.in_(values)
+    array = sa.bindparam(None, values, type_=postgresql.ARRAY(field.type))
+    return DialectSwitch(fallback, postgresql=field == sa.any_(array))
+
+
+def _values_in(field: interface.FieldType, values: typing.Sequence):
+    column = sa.column("value", field.type)
+    rows = [(value,) for value in values]
+    table = sa.values(column, name="gyver_in", literal_binds=True).data(rows)
+    sqlite_rows = sa.select(sa.literal_column("column1")).select_from(
+        sa.values(column, literal_binds=True).data(rows)
+    )
+    return DialectSwitch(field.in_(sa.select(table)), sqlite=field.in_(sqlite_rows))
+
+
+def _chunked_in(field: interface.FieldType, values: typing.Sequence, size: int):
+    # `range` is shadowed by the comparator of the same name
+    starts = builtins.range(0, len(values), size)
+    return sa.or_(*(field.in_(values[slice(start, start + size)]) for start in starts))
+
+
+def _in_clause(
+    field: interface.FieldType,
+    target: typing.Iterable,
+    strategy: InStrategy,
+    threshold: int,
+    chunk_size: int,
+) -> interface.SaComparison:
+    values = _as_sequence(target)
+    if not values:
+        return field.in_(values)
+    if strategy is InStrategy.AUTO:
+        if len(values) <= threshold:
+            return field.in_(values)
+        return _array_in(field, values, literal=True)
+    if strategy is InStrategy.LITERAL:
+        return _literal_in(field, values)
+    if strategy is InStrategy.ARRAY:
+        return _array_in(field, values, literal=False)
+    if strategy is InStrategy.VALUES:
+        return _values_in(field, values)
+    if strategy is InStrategy.CHUNKED:
+        return _chunked_in(field, values, chunk_size)
+    return field.in_(values)
+
+
+def includes_using(
+    strategy: InStrategy = InStrategy.AUTO,
+    threshold: int = LARGE_IN_THRESHOLD,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> interface.Comparator[typing.Iterable]:
+    """`includes` with a strategy suited to large targets.
+
+    AUTO binds small targets as an expanding IN and larger ones as a
+    single `= ANY(array)` on PostgreSQL or inlined literals elsewhere.
+    LITERAL inlines the values, ARRAY always uses `= ANY`, VALUES emits a
+    semi-join on an inline VALUES list and CHUNKED ORs IN lists of at most
+    `chunk_size` values.
+    """
+
+    def comparator(
+        field: interface.FieldType, target: typing.Iterable
+    ) -> interface.SaComparison:
+        return _in_clause(field, target, strategy, threshold, chunk_size)
+
+    return comparator
+
+
+def excludes_using(
+    strategy: InStrategy = InStrategy.AUTO,
+    threshold: int = LARGE_IN_THRESHOLD,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> interface.Comparator[typing.Iterable]:
+    def comparator(
+        field: interface.FieldType, target: typing.Iterable
+    ) -> interface.SaComparison:
+        return sa.not_(_in_clause(field, target, strategy, threshold, chunk_size))
+
+    return comparator
+
+
+JsonPath = typing.Union[str, typing.Sequence[typing.Union[str, int]]]
+
+
+def _json_keys(path: JsonPath) -> tuple[typing.Union[str, int], ...]:
+    if isinstance(path, str):
+        return tuple(
+            int(key) if key.isdigit() else key
+            for key in path.removeprefix("$").strip(".").split(".")
+            if key
+        )
+    return tuple(path)
+
+
+def _json_path(keys: typing.Sequence[typing.Union[str, int]]) -> str:
+    return "$" + "".join(
+        f"[{key}]" if isinstance(key, int) else f".{json.dumps(key)}" for key in keys
+    )
+
+
+def _jsonb(field: interface.FieldType) -> interface.FieldType:
+    if isinstance(field, DialectSwitch):
+        field = field.for_dialect("postgresql")
+    if isinstance(field.type, postgresql.JSONB):
+        return field
+    return sa.cast(field, postgresql.JSONB)
+
+
+def _jsonb_literal(value: typing.Any) -> interface.FieldType:
+    return sa.cast(sa.literal(json.dumps(value)), postgresql.JSONB)
+
+
+def _json_each(field: interface.FieldType):
+    return sa.func.json_each(field).table_valued("value")
+
+
+_JSON_SCALAR_TYPES = {
+    bool: None,
+    int: ("integer", "real"),
+    float: ("integer", "real"),
+    str: ("text",),
+}
+
+
+def _json_child(path: typing.Any, suffix: str) -> typing.Any:
+    return path + suffix if isinstance(path, str) else path.op("||")(suffix)
+
+
+def _sqlite_scalar(field: interface.FieldType, path: typing.Any, target: typing.Any):
+    kind = sa.func.json_type(field, path)
+    if target is None:
+        return kind == "null"
+    if isinstance(target, bool):
+        return kind == ("true" if target else "false")
+    types = _JSON_SCALAR_TYPES.get(type(target), ("text",))
+    return sa.and_(kind.in_(types), sa.func.json_extract(field, path) == target)
+
+
+def _sqlite_contains(
+    field: interface.FieldType, path: typing.Any, target: typing.Any, top: bool
+):
+    # mirrors jsonb @>: objects contain their keys recursively, arrays
+    # contain each target element somewhere, and only a top-level array
+    # contains a bare scalar
+    kind = sa.func.json_type(field, path)
+    if isinstance(target, dict):
+        return sa.and_(
+            kind == "object",
+            *(
+                _sqlite_contains(
+                    field, _json_child(path, _json_path([key])[1:]), value, False
+                )
+                for key, value in target.items()
+            ),
+        )
+    if isinstance(target, (list, tuple)):
+        return sa.and_(
+            kind == "array",
+            *(_sqlite_element(field, path, value) for value in target),
+        )
+    if not top:
+        return _sqlite_scalar(field, path, target)
+    return sa.or_(
+        _sqlite_scalar(field, path, target),
+        sa.and_(kind == "array", _sqlite_element(field, path, target)),
+    )
+
+
+def _sqlite_element(field: interface.FieldType, path: typing.Any, target: typing.Any):
+    each = sa.func.json_each(field, path).table_valued("fullkey")
+    return sa.exists(
+        sa.select(1)
+        .select_from(each)
+        .where(_sqlite_contains(field, each.c.fullkey, target, False))
+        .correlate_except(each)
+    )
+
+
+def json_extract(field: interface.FieldType, path: JsonPath) -> interface.FieldType:
+    """The JSON value at `path`, as `#>` on PostgreSQL (usable by expression
+    indexes) and `json_extract` elsewhere."""
+    keys = _json_keys(path)
+    pg_path = "{%s}" % ",".join(json.dumps(str(key)) for key in keys)
+    return DialectSwitch(
+        sa.func.json_extract(field, _json_path(keys), type_=sa.JSON),
+        postgresql=_jsonb(field).op("#>", return_type=postgresql.JSONB)(
+            sa.cast(sa.literal(pg_path), postgresql.ARRAY(sa.Text))
+        ),
+    )
 
 
 def json_contains(
     field: interface.FieldType, target: typing.Any
 ) -> interface.SaComparison:
-    return sa.func.json_contains(field, f'"{target}"')
+    """The JSON document or array contains `target`.
+
+    PostgreSQL uses `@>` on JSONB (GIN indexable), MySQL `MEMBER OF` for
+    scalars (multi-valued indexes) and `JSON_CONTAINS` otherwise, SQLite
+    an equivalent walk with `json_type`/`json_each`.
+    """
+    document = json.dumps(target)
+    default = sa.func.json_contains(field, document)
+    sqlite = _sqlite_contains(field, "$", target, top=True)
+    alternatives = {
+        "postgresql": _jsonb(field).op("@>", is_comparison=True)(
+            _jsonb_literal(target)
+        ),
+        "sqlite": sqlite,
+    }
+    if not isinstance(target, (dict, list, tuple)):
+        alternatives["mysql"] = sa.literal(target).op("MEMBER OF", is_comparison=True)(
+            Grouping(field)
+        )
+    return DialectSwitch(default, **alternatives)
+
+
+def json_has_key(field: interface.FieldType, target: str) -> interface.SaComparison:
+    return DialectSwitch(
+        sa.func.json_contains_path(field, "one", _json_path([target])) == 1,
+        postgresql=_jsonb(field).has_key(target),
+        sqlite=sa.func.json_type(field, _json_path([target])).is_not(None),
+    )
 
 
 def json_empty(
     field: interface.FieldType, target: typing.Any
 ) -> interface.SaComparison:
     func_length = sa.func.json_length(field)
-    return func_length == 0 if target else func_length != 0
+    pg_empty = _jsonb(field).in_([_jsonb_literal([]), _jsonb_literal({})])
+    has_items = sa.exists(sa.select(1).select_from(_json_each(field)))
+    if target:
+        return DialectSwitch(func_length == 0, postgresql=pg_empty, sqlite=~has_items)
+    return DialectSwitch(func_length != 0, postgresql=~pg_empty, sqlite=has_items)
+
+
+DEFAULT_TEXT_CONFIG = "english"
+_TEXT_CONFIG = re.compile(r"^[a-z_]+$")
+
+
+def _regconfig(config: str):
+    # inlined so the expression matches `to_tsvector('<config>', col)` indexes
+    if not _TEXT_CONFIG.match(config):
+        raise ValueError(f"invalid text search configuration {config!r}")
+    return sa.literal_column(f"'{config}'::regconfig")
+
+
+def _tsvector(field: interface.FieldType, config: str):
+    if isinstance(field.type, postgresql.TSVECTOR):
+        return field
+    return sa.func.to_tsvector(_regconfig(config), field)
+
+
+def _terms(target: str) -> list[str]:
+    """Words of `target` as quoted phrases, embedded quotes dropped.
+
+    MySQL boolean mode has no way to escape a quote inside a phrase.
+    """
+    return [f'"{term}"' for term in target.replace('"', "").split()]
+
+
+def _fts_table(field: interface.FieldType, fts_table: typing.Optional[str]):
+    name = fts_table or f"{field.table.name}_fts"
+    return sa.table(name, sa.column("rowid"), sa.column(field.name))
+
+
+def _rowid(field: interface.FieldType):
+    # only a lone INTEGER primary key aliases the SQLite rowid
+    keys = list(field.table.primary_key)
+    if (
+        len(keys) == 1
+        and isinstance(keys[0].type, sa.Integer)
+        and not isinstance(keys[0].type, (sa.BigInteger, sa.SmallInteger))
+    ):
+        return keys[0]
+    return sa.literal_column(f"{field.table.name}.rowid")
+
+
+def _text_search(
+    field: interface.FieldType,
+    target: str,
+    config: str,
+    fts_table: typing.Optional[str],
+) -> interface.SaComparison:
+    if not (terms := _terms(target)):
+        return sa.true()
+    fts = _fts_table(field, fts_table)
+    sqlite = _rowid(field).in_(
+        sa.select(fts.c.rowid).where(
+            fts.c[field.name].op("MATCH", is_comparison=True)(" ".join(terms))
+        )
+    )
+    return DialectSwitch(
+        sa.and_(*(field.ilike(f"%{term}%") for term in target.split())),
+        postgresql=_tsvector(field, config).op("@@", is_comparison=True)(
+            sa.func.websearch_to_tsquery(_regconfig(config), target)
+        ),
+        mysql=mysql.match(
+            field, against=" ".join(f"+{term}" for term in terms)
+        ).in_boolean_mode(),
+        sqlite=sqlite,
+    )
+
+
+def search_using(
+    config: str = DEFAULT_TEXT_CONFIG, fts_table: typing.Optional[str] = None
+) -> interface.Comparator[str]:
+    """Full-text match on every word of the target.
+
+    PostgreSQL matches `to_tsvector(config, field)` (or a TSVECTOR column)
+    against `websearch_to_tsquery`, MySQL uses `MATCH ... AGAINST` in
+    boolean mode and SQLite a FTS5 table named `fts_table`, by default
+    `<table>_fts`, keyed by the table's rowid. Other dialects fall back
+    to `ILIKE` per word. A target without words matches every row.
+    """
+
+    def comparator(field: interface.FieldType, target: str) -> interface.SaComparison:
+        return _text_search(field, target, config, fts_table)
+
+    return comparator
+
+
+search = search_using()
+
+
+def search_rank(
+    field: interface.FieldType,
+    target: str,
+    config: str = DEFAULT_TEXT_CONFIG,
+    fts_table: typing.Optional[str] = None,
+) -> interface.FieldType:
+    """Relevance of `field` for `target`, higher is better."""
+    if not (terms := _terms(target)):
+        return sa.literal(0.0)
+    fts = _fts_table(field, fts_table)
+    sqlite = (
+        sa.select(-sa.func.bm25(sa.literal_column(fts.name)))
+        .where(
+            fts.c.rowid == _rowid(field),
+            fts.c[field.name].op("MATCH")(" ".join(terms)),
+        )
+        .scalar_subquery()
+    )
+    return DialectSwitch(
+        sa.literal(0.0),
+        postgresql=sa.func.ts_rank(
+            _tsvector(field, config),
+            sa.func.websearch_to_tsquery(_regconfig(config), target),
+        ),
+        mysql=mysql.match(
+            field, against=" ".join(f"+{term}" for term in terms)
+        ).in_boolean_mode(),
+        sqlite=sqlite,
+    )
+
+
+def fuzzy_match(field: interface.FieldType, target: str) -> interface.SaComparison:
+    """Trigram similarity (`pg_trgm` `%`) on PostgreSQL, `ILIKE` elsewhere."""
+    return DialectSwitch(
+        field.ilike(f"%{target}%"),
+        postgresql=field.op("%", is_comparison=True)(target),
+    )
+
+
+class RelationStrategy(str, enum.Enum):
+    EXISTS = "exists"
+    IN = "in"
 
 
 def make_relation_check(
     clause: interface.BindClause,
+    strategy: RelationStrategy = RelationStrategy.EXISTS,
+    min_count: int = 1,
 ) -> interface.Comparator[bool]:
+    """Check for related rows matching `clause`, at least `min_count` of them.
+
+    `EXISTS` emits a correlated subquery through `has()`/`any()`, `IN`
+    an uncorrelated `key IN (SELECT ...)` semi-join (`NOT IN` anti-join
+    when negated). Composite keys always use `EXISTS`.
+    """
+    # imported here as optimize builds on the comparators of this module
+    from .optimize import is_always_true, simplify
+
+    if min_count < 1:
+        raise ValueError("min_count must be at least 1")
+    clause = simplify(clause)
+    is_empty = is_always_true(clause)
+
     def _relation_exists(
         field: interface.FieldType, target: bool
     ) -> interface.SaComparison:
-        comp = clause.bind(field.class_)
-        func = (
-            field.has
-            if field.property.direction.name.lower() not in ("onetomany", "manytomany")
-            else field.any
-        )
-        result = func() if str(comp) == str(sa.true()) else func(comp)
-        return result if target else ~result
+        prop = field.property
+        criterion = None if is_empty else clause.bind(field.class_)
+        keys = _relation_keys(prop) if strategy is RelationStrategy.IN else None
+        if keys is not None:
+            result = _relation_in(prop, keys, criterion, min_count)
+        elif min_count > 1:
+            result = _relation_count(prop, criterion) >= min_count
+        else:
+            func = field.any if prop.uselist else field.has
+            result = func() if criterion is None else func(criterion)
+        if target:
+            return result
+        if keys is not None and keys[0].nullable:
+            return sa.or_(keys[0].is_(None), ~result)
+        return ~result
 
     return _relation_exists
+
+
+def _relation_keys(prop) -> typing.Optional[tuple[sa.Column, sa.Column]]:
+    pairs = prop.synchronize_pairs if prop.secondary is not None else None
+    if pairs is None:
+        pairs = prop.local_remote_pairs
+    if len(pairs) != 1 or (
+        prop.secondary is not None and len(prop.secondary_synchronize_pairs) != 1
+    ):
+        return None
+    return pairs[0]
+
+
+def _relation_from(prop):
+    if prop.secondary is None:
+        return prop.target
+    return prop.secondary.join(prop.target, prop.secondaryjoin)
+
+
+def _relation_in(prop, keys, criterion, min_count: int) -> interface.SaComparison:
+    local, remote = keys
+    subquery = (
+        sa.select(remote)
+        .select_from(_relation_from(prop))
+        .where(remote.is_not(None))
+        .correlate(None)
+    )
+    if criterion is not None:
+        subquery = subquery.where(criterion)
+    if min_count > 1:
+        subquery = subquery.group_by(remote).having(sa.func.count() >= min_count)
+    return local.in_(subquery)
+
+
+def _relation_count(prop, criterion) -> sa.ColumnElement[int]:
+    subquery = (
+        sa.select(sa.func.count())
+        .select_from(_relation_from(prop))
+        .where(prop.primaryjoin)
+    )
+    if criterion is not None:
+        subquery = subquery.where(criterion)
+    return subquery.scalar_subquery()
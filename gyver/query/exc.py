@@ -8,3 +8,18 @@ class FilterError(GyverError):
 class FieldNotFound(FilterError, AttributeError):
     def __init__(self, name: str, field: str) -> None:
         super().__init__(f"type {name} has no {field} attribute")
+
+
+class InvalidCursor(FilterError, ValueError):
+    def __init__(self, cursor: str) -> None:
+        super().__init__(f"invalid pagination cursor {cursor!r}")
+
+
+class InvalidFilter(FilterError, ValueError):
+    def __init__(self, key: str, reason: str) -> None:
+        super().__init__(f"invalid filter {key!r}: {reason}")
+
+
+class UnsupportedClause(FilterError, TypeError):
+    def __init__(self, clause: object) -> None:
+        super().__init__(f"cannot evaluate {clause!r} in memory")
@@ -2,9 +2,10 @@ import warnings
 from typing import Callable, Optional, Sequence
 
 import sqlalchemy as sa
-from gyver.attrs import call_init, define
+from gyver.attrs import call_init, define, info
 
 from . import interface
+from .memo import memo_bind, node_hash, unhashable
 
 
 @define
@@ -12,6 +13,8 @@ class GroupWhere:
     where: Sequence[interface.BindClause]
     operator: Callable[..., interface.SaComparison]
     mark: Optional[str]
+    _hash: Optional[int] = info(default=None, eq=False, order=False)
+    _memoizable: bool = info(default=True, eq=False, order=False)
 
     def __init__(
         self,
@@ -27,11 +30,28 @@ class GroupWhere:
             warnings.warn(
                 "GroupWhere with flag strict received clauses with different mark"
             )
-        call_init(self, tuple(marked), operator, mark)
+        marked = tuple(marked)
+        call_init(
+            self,
+            marked,
+            operator,
+            mark,
+            node_hash(marked, operator, mark),
+            all(getattr(item, "_memoizable", True) for item in marked),
+        )
 
     def __bool__(self):
         return bool(self.where)
 
+    def __hash__(self) -> int:
+        if self._hash is None:
+            raise unhashable(self)
+        return self._hash
+
+    def extend(self, *where: interface.BindClause) -> "GroupWhere":
+        return GroupWhere(*self.where, *where, operator=self.operator, mark=self.mark)
+
+    @memo_bind
     def bind(self, mapper: interface.Mapper) -> interface.SaComparison:
         return self.operator(*(clause.bind(mapper) for clause in self.where))
 
@@ -0,0 +1,158 @@
+import threading
+from typing import TYPE_CHECKING, Any, Mapping, Optional
+
+import sqlalchemy as sa
+from gyver.attrs import call_init, define
+
+from .exc import FieldNotFound
+from .interface import FieldType, Mapper
+
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Mapper as OrmMapper
+
+DEFAULT_DEPTH = 2
+
+
+@define
+class FieldIndex:
+    name: str
+    depth: int
+    fields: Mapping[str, FieldType]
+
+    def covers(self, field: str) -> bool:
+        return field.count(".") <= self.depth
+
+    def get(self, field: str) -> FieldType:
+        attr = self.fields.get(field)
+        if attr is None:
+            raise FieldNotFound(self.name, field)
+        return attr
+
+    def __contains__(self, field: str) -> bool:
+        return field in self.fields
+
+
+def build_index(mapper: Mapper, depth: int = DEFAULT_DEPTH) -> FieldIndex:
+    if isinstance(mapper, type):
+        from sqlalchemy.orm import Mapper as OrmMapper
+
+        orm_mapper = sa.inspect(mapper, raiseerr=False)
+        if isinstance(orm_mapper, OrmMapper):
+            fields = _index_entity(orm_mapper, depth, {})
+            return FieldIndex(mapper.__name__, depth, fields)
+    if isinstance(mapper, sa.Table):
+        return FieldIndex("query", 0, {col.key: col for col in mapper.c})
+    raise TypeError(f"cannot build a field index for {mapper!r}")
+
+
+def _index_entity(
+    mapper: "OrmMapper",
+    depth: int,
+    seen: dict[tuple["OrmMapper", int], dict[str, FieldType]],
+) -> dict[str, FieldType]:
+    if (cached := seen.get((mapper, depth))) is not None:
+        return cached
+    entity = mapper.class_
+    fields: dict[str, FieldType] = {
+        key: getattr(entity, key) for key in mapper.all_orm_descriptors.keys()
+    }
+    if "id_" in fields:
+        fields.setdefault("id", fields["id_"])
+    seen[(mapper, depth)] = fields
+    if depth > 0:
+        for relation in mapper.relationships:
+            related = _index_entity(relation.mapper, depth - 1, seen)
+            fields.update(
+                (f"{relation.key}.{key}", attr) for key, attr in related.items()
+            )
+    return fields
+
+
+@define(frozen=False)
+class IndexRegistry:
+    """Opt-in per-mapper field indexes consulted by `retrieve_attr`.
+
+    When enabled, entities and tables are indexed on first touch, so
+    resolving any path up to `depth` relationships is a single dict lookup.
+    Indexes live in the `info` of the table or of the entity's class
+    manager, so they are collected with it instead of being held here.
+    """
+
+    depth: int
+    enabled: bool
+    _key: object
+    _generation: int
+    _lock: threading.Lock
+
+    def __init__(self, depth: int = DEFAULT_DEPTH) -> None:
+        call_init(self, depth, False, object(), 0, threading.Lock())
+
+    def enable(self, depth: Optional[int] = None) -> None:
+        if depth is not None and depth != self.depth:
+            self.clear()
+            self.depth = depth
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+
+    def get(self, mapper: Mapper) -> Optional[FieldIndex]:
+        if not self.enabled or (info := _info(mapper)) is None:
+            return None
+        if (field_index := self._cached(info)) is not None:
+            return field_index
+        return self._store(mapper, info)
+
+    def warm(self, *mappers: Mapper) -> None:
+        if not mappers:
+            from gyver.database.entity import AbstractEntity
+
+            mappers = tuple(
+                orm_mapper.class_ for orm_mapper in AbstractEntity.registry.mappers
+            )
+        for mapper in mappers:
+            if (info := _info(mapper)) is None:
+                raise TypeError(f"cannot build a field index for {mapper!r}")
+            self._store(mapper, info)
+
+    def __contains__(self, mapper: Mapper) -> bool:
+        info = _info(mapper)
+        return info is not None and self._cached(info) is not None
+
+    def _cached(self, info: dict[Any, Any]) -> Optional[FieldIndex]:
+        entry = info.get(self._key)
+        if entry is None or entry[0] != self._generation:
+            return None
+        return entry[1]
+
+    def _store(self, mapper: Mapper, info: dict[Any, Any]) -> FieldIndex:
+        generation = self._generation
+        field_index = build_index(mapper, self.depth)
+        with self._lock:
+            info[self._key] = (generation, field_index)
+        return field_index
+
+
+def _info(mapper: Mapper) -> Optional[dict[Any, Any]]:
+    if isinstance(mapper, sa.Table):
+        return mapper.info
+    if isinstance(mapper, type) and "__mapper__" in mapper.__dict__:
+        return mapper._sa_class_manager.info
+    return None
+
+
+registry = IndexRegistry()
+
+
+def enable_index(depth: Optional[int] = None, warm: bool = False) -> None:
+    registry.enable(depth)
+    if warm:
+        registry.warm()
+
+
+def disable_index() -> None:
+    registry.disable()
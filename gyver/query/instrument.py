@@ -0,0 +1,233 @@
+import inspect
+import logging
+import threading
+import time
+from functools import wraps
+from typing import Any, Callable, Optional, Protocol, TypeVar
+
+from gyver.attrs import call_init, define
+
+from .interface import Mapper
+
+T = TypeVar("T")
+
+sinks: tuple["Sink", ...] = ()
+"""Active sinks. Hot paths only pay for a truthiness check while empty."""
+
+_lock = threading.Lock()
+
+
+@define
+class Event:
+    name: str
+    duration_ns: int
+    source: str
+    mapper: Optional[str] = None
+    field: Optional[str] = None
+    hit: Optional[bool] = None
+
+
+class Sink(Protocol):
+    def record(self, event: Event) -> None:
+        ...
+
+
+def add_sink(sink: Sink) -> None:
+    global sinks
+    with _lock:
+        sinks = (*sinks, sink)
+
+
+def remove_sink(sink: Sink) -> None:
+    global sinks
+    with _lock:
+        sinks = tuple(item for item in sinks if item is not sink)
+
+
+def clear_sinks() -> None:
+    global sinks
+    with _lock:
+        sinks = ()
+
+
+class instrumented:
+    """Attach `sinks` for the duration of a `with` block."""
+
+    def __init__(self, *sinks: Sink) -> None:
+        self.sinks = sinks
+
+    def __enter__(self) -> "instrumented":
+        for sink in self.sinks:
+            add_sink(sink)
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        for sink in self.sinks:
+            remove_sink(sink)
+
+
+def mapper_name(mapper: Any) -> Optional[str]:
+    if mapper is None:
+        return None
+    return getattr(mapper, "__name__", None) or getattr(
+        mapper, "name", type(mapper).__name__
+    )
+
+
+def now() -> int:
+    return time.perf_counter_ns()
+
+
+def record(
+    name: str,
+    start: int,
+    source: str,
+    mapper: Optional[Mapper] = None,
+    field: Optional[str] = None,
+    hit: Optional[bool] = None,
+) -> None:
+    event = Event(
+        name, time.perf_counter_ns() - start, source, mapper_name(mapper), field, hit
+    )
+    for sink in sinks:
+        sink.record(event)
+
+
+def timed(name: str) -> Callable[[Callable[..., T]], Callable[..., T]]:
+    """Time every call to the decorated function while sinks are attached."""
+
+    def decorator(func: Callable[..., T]) -> Callable[..., T]:
+        source = func.__qualname__
+
+        if inspect.iscoroutinefunction(func):
+
+            @wraps(func)
+            async def ainner(*args: Any, **kwargs: Any) -> Any:
+                if not sinks:
+                    return await func(*args, **kwargs)
+                start = time.perf_counter_ns()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    record(name, start, source)
+
+            return ainner  # type: ignore
+
+        @wraps(func)
+        def inner(*args: Any, **kwargs: Any) -> T:
+            if not sinks:
+                return func(*args, **kwargs)
+            start = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(name, start, source)
+
+        return inner
+
+    return decorator
+
+
+@define
+class LoggingSink:
+    logger: logging.Logger = logging.getLogger("gyver.query")
+    level: int = logging.DEBUG
+
+    def record(self, event: Event) -> None:
+        if not self.logger.isEnabledFor(self.level):
+            return
+        self.logger.log(
+            self.level,
+            "%s %s mapper=%s field=%s hit=%s %.1fus",
+            event.name,
+            event.source,
+            event.mapper,
+            event.field,
+            event.hit,
+            event.duration_ns / 1000,
+        )
+
+
+@define(frozen=False)
+class Counter:
+    count: int = 0
+    hits: int = 0
+    misses: int = 0
+    total_ns: int = 0
+
+
+CounterKey = tuple[str, Optional[str], Optional[str]]
+
+
+@define(frozen=False)
+class CounterSink:
+    """Prometheus-style counters per (event, mapper, field)."""
+
+    counters: dict[CounterKey, Counter]
+    _lock: threading.Lock
+
+    def __init__(self) -> None:
+        call_init(self, {}, threading.Lock())
+
+    def record(self, event: Event) -> None:
+        key = (event.name, event.mapper, event.field)
+        with self._lock:
+            if (counter := self.counters.get(key)) is None:
+                counter = self.counters[key] = Counter()
+            counter.count += 1
+            counter.total_ns += event.duration_ns
+            if event.hit is True:
+                counter.hits += 1
+            elif event.hit is False:
+                counter.misses += 1
+
+    def by_mapper(self, name: str) -> dict[Optional[str], Counter]:
+        totals: dict[Optional[str], Counter] = {}
+        with self._lock:
+            for (event, mapper, _), counter in self.counters.items():
+                if event != name:
+                    continue
+                total = totals.setdefault(mapper, Counter())
+                total.count += counter.count
+                total.hits += counter.hits
+                total.misses += counter.misses
+                total.total_ns += counter.total_ns
+        return totals
+
+    def reset(self) -> None:
+        with self._lock:
+            self.counters.clear()
+
+
+@define
+class OpenTelemetrySink:
+    """Emit each event as a span, back-dated by its duration.
+
+    Takes any tracer exposing `start_span`; defaults to the global
+    `opentelemetry` tracer, which must then be installed.
+    """
+
+    tracer: Any
+
+    def __init__(self, tracer: Any = None) -> None:
+        if tracer is None:
+            from opentelemetry import trace
+
+            tracer = trace.get_tracer("gyver.query")
+        call_init(self, tracer)
+
+    def record(self, event: Event) -> None:
+        end = time.time_ns()
+        attributes = {"gyver.query.source": event.source}
+        if event.mapper is not None:
+            attributes["gyver.query.mapper"] = event.mapper
+        if event.field is not None:
+            attributes["gyver.query.field"] = event.field
+        if event.hit is not None:
+            attributes["gyver.query.cache_hit"] = event.hit
+        span = self.tracer.start_span(
+            f"gyver.query.{event.name}",
+            start_time=end - event.duration_ns,
+            attributes=attributes,
+        )
+        span.end(end_time=end)
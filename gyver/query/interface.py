@@ -4,7 +4,6 @@ from functools import wraps
 
 import sqlalchemy as sa
 import typing_extensions
-from gyver.database.entity import AbstractEntity
 from sqlalchemy.sql import Delete, Select, Update
 from sqlalchemy.sql.elements import BooleanClauseList, ColumnElement
 from sqlalchemy.sql.functions import Function
@@ -12,6 +11,9 @@ from sqlalchemy.sql.functions import Function
 from ._helpers import MockTable
 from .typedef import ClauseType
 
+if typing.TYPE_CHECKING:
+    from gyver.database.entity import AbstractEntity
+
 P = typing_extensions.ParamSpec("P")
 
 ExecutableType = typing.Union[Select, Update, Delete]
@@ -21,7 +23,7 @@ Comparison = typing.Union[ColumnElement[sa.Boolean], BooleanClauseList, Function
 SaComparison = ColumnElement[bool]
 FieldType = typing.Union[ColumnElement, sa.Column]
 T = typing.TypeVar("T", contravariant=True)
-Mapper = typing.Union[sa.Table, type[AbstractEntity], MockTable]
+Mapper = typing.Union[sa.Table, "type[AbstractEntity]", MockTable]
 
 
 def cast_comp(comp: Comparison) -> SaComparison:
@@ -42,10 +44,14 @@ class Comparator(typing.Protocol[T]):
 
 
 class Clause(typing.Protocol):
+    __slots__ = ()
+
     type_: typing.ClassVar[ClauseType]
 
 
 class BindClause(Clause, typing.Protocol):
+    __slots__ = ()
+
     type_: typing.Literal[ClauseType.BIND]
 
     def bind(self, mapper: Mapper) -> SaComparison:
@@ -53,6 +59,8 @@ class BindClause(Clause, typing.Protocol):
 
 
 class ApplyClause(Clause, typing.Protocol[ExecutableT]):
+    __slots__ = ()
+
     type_: typing.Literal[ClauseType.APPLY]
 
     def apply(self, query: ExecutableT) -> ExecutableT:
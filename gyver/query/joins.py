@@ -0,0 +1,210 @@
+import typing
+
+import sqlalchemy as sa
+from gyver.attrs import define
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.util import find_tables
+
+from . import comp as cp
+from . import interface
+from .block import WhereBlock
+from .exc import FieldNotFound
+from .group import GroupWhere, and_
+from .order_by import CompositeOrderBy, OrderBy
+from .typedef import ClauseType
+from .where import Where
+
+Path = tuple[str, ...]
+
+
+@define
+class _Leaf:
+    hops: Path
+    column: str
+    where: Where
+
+
+@define
+class JoinPlan:
+    """Joins and a rewritten filter for clauses over dotted paths.
+
+    To-one paths are joined once each; filters crossing a to-many
+    relationship become correlated EXISTS so rows are never multiplied.
+    """
+
+    entity: type
+    joins: tuple[Path, ...]
+    where: typing.Optional[interface.BindClause]
+    order: tuple[OrderBy, ...]
+    outer: bool = True
+
+    type_ = ClauseType.APPLY
+
+    def apply(self, query: Select) -> Select:
+        joined = {
+            table for from_ in query.get_final_froms() for table in find_tables(from_)
+        }
+        for path in self.joins:
+            owner = _entity_at(self.entity, path[:-1])
+            target = _entity_at(self.entity, path)
+            if sa.inspect(target).local_table in joined:
+                continue
+            query = query.join(getattr(owner, path[-1]), isouter=self.outer)
+        if self.where is not None:
+            query = query.where(self.where.bind(self.entity))
+        return CompositeOrderBy(*self.order).apply(query)
+
+
+def plan_joins(
+    entity: type,
+    *where: interface.BindClause,
+    order: typing.Sequence[OrderBy] = (),
+    outer: bool = True,
+) -> JoinPlan:
+    joins: dict[Path, None] = {}
+    clause = _rewrite(entity, and_(*where), joins) if where else None
+    for field in collect_fields(*order):
+        hops, _ = _split(field)
+        if _first_many(entity, hops) is not None:
+            raise ValueError(f"cannot order by to-many path {field}")
+        _add_joins(joins, hops)
+    _check_targets(entity, joins)
+    return JoinPlan(entity, tuple(joins), clause, tuple(order), outer)
+
+
+def collect_fields(*clauses: typing.Any) -> list[str]:
+    """Every field referenced by `clauses`, in first-seen order."""
+    fields: dict[str, None] = {}
+    for clause in clauses:
+        if isinstance(clause, Where):
+            fields[clause.field] = None
+        elif isinstance(clause, WhereBlock):
+            fields.update(dict.fromkeys(clause.fields))
+        elif isinstance(clause, GroupWhere):
+            fields.update(dict.fromkeys(collect_fields(*clause.where)))
+        elif isinstance(clause, OrderBy) and clause.field is not None:
+            fields[clause.field] = None
+        elif isinstance(clause, CompositeOrderBy):
+            fields.update(dict.fromkeys(collect_fields(*clause.orders)))
+    return list(fields)
+
+
+def _split(field: str) -> tuple[Path, str]:
+    *hops, column = field.split(".")
+    return tuple(hops), column
+
+
+def _relationship(entity: type, name: str):
+    relationships = sa.inspect(entity).relationships
+    if name not in relationships:
+        raise FieldNotFound(entity.__name__, name)
+    return relationships[name]
+
+
+def _entity_at(entity: type, hops: Path) -> type:
+    for hop in hops:
+        entity = _relationship(entity, hop).mapper.class_
+    return entity
+
+
+def _first_many(entity: type, hops: Path) -> typing.Optional[int]:
+    for idx, hop in enumerate(hops):
+        relation = _relationship(entity, hop)
+        if relation.uselist:
+            return idx
+        entity = relation.mapper.class_
+    return None
+
+
+def _add_joins(joins: dict[Path, None], hops: Path) -> None:
+    for idx in range(1, len(hops) + 1):
+        joins.setdefault(hops[:idx], None)
+
+
+def _check_targets(entity: type, joins: dict[Path, None]) -> None:
+    seen = {entity: ()}
+    for path in joins:
+        target = _entity_at(entity, path)
+        if seen.setdefault(target, path) != path:
+            raise ValueError(
+                f"{target.__name__} is reachable through more than one joined path"
+            )
+
+
+def _rewrite(
+    entity: type, clause: interface.BindClause, joins: dict[Path, None]
+) -> interface.BindClause:
+    if isinstance(clause, WhereBlock):
+        if not any("." in field for field in clause.fields):
+            return clause
+        clause = GroupWhere(*clause, operator=clause.operator, mark=clause.mark)
+    if isinstance(clause, Where):
+        return _rewrite_group(entity, [clause], joins, merge=False)[0]
+    if not isinstance(clause, GroupWhere):
+        return clause
+    children = _rewrite_group(
+        entity, list(clause.where), joins, merge=clause.operator is sa.and_
+    )
+    return GroupWhere(*children, operator=clause.operator, mark=clause.mark)
+
+
+def _rewrite_group(
+    entity: type,
+    clauses: list[interface.BindClause],
+    joins: dict[Path, None],
+    merge: bool,
+) -> list[interface.BindClause]:
+    # to-many filters are kept in place as their path until all siblings
+    # sharing it have been collected
+    result: list[typing.Union[interface.BindClause, Path]] = []
+    exists: dict[Path, list[_Leaf]] = {}
+    for clause in clauses:
+        if not isinstance(clause, Where):
+            result.append(_rewrite(entity, clause, joins))
+            continue
+        if "." not in clause.field:
+            result.append(clause)
+            continue
+        hops, column = _split(clause.field)
+        many = _first_many(entity, hops)
+        if many is None:
+            _add_joins(joins, hops)
+            result.append(clause)
+            continue
+        _add_joins(joins, hops[:many])
+        path = hops[: many + 1]
+        leaf = _Leaf(hops[slice(many + 1, None)], column, clause)
+        if not merge:
+            result.append(_exists(".".join(path), path[-1], [leaf]))
+        elif path in exists:
+            exists[path].append(leaf)
+        else:
+            exists[path] = [leaf]
+            result.append(path)
+    return [
+        _exists(".".join(item), item[-1], exists[item])
+        if isinstance(item, tuple)
+        else item
+        for item in result
+    ]
+
+
+def _exists(field: str, hop: str, leaves: list[_Leaf]) -> Where:
+    # relation checks bind their inner clause to the relationship owner,
+    # so inner fields are spelled from the owner through `hop`
+    inner: list[typing.Union[interface.BindClause, str]] = []
+    nested: dict[str, list[_Leaf]] = {}
+    for leaf in leaves:
+        if not leaf.hops:
+            inner.append(leaf.where.with_field(f"{hop}.{leaf.column}"))
+            continue
+        if leaf.hops[0] not in nested:
+            nested[leaf.hops[0]] = []
+            inner.append(leaf.hops[0])
+        nested[leaf.hops[0]].append(_Leaf(leaf.hops[1:], leaf.column, leaf.where))
+    clauses = [
+        _exists(f"{hop}.{item}", item, nested[item]) if isinstance(item, str) else item
+        for item in inner
+    ]
+    clause = clauses[0] if len(clauses) == 1 else and_(*clauses)
+    return Where(field, True, cp.make_relation_check(clause))
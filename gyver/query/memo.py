@@ -0,0 +1,80 @@
+from functools import wraps
+from typing import Any, Callable, Optional, TypeVar
+
+from . import instrument, interface
+from .attribute import MaybeCache, is_persistent_mapper
+
+ClauseT = TypeVar("ClauseT", bound=interface.BindClause)
+
+bind_cache = MaybeCache(admit=is_persistent_mapper, doorkeeper=True)
+
+
+def node_hash(*parts: Any) -> Optional[int]:
+    """Hash of a clause's `parts`, None if any of them is unhashable.
+
+    Clauses are frozen, so they compute this once and return it from
+    `__hash__` instead of rehashing their children on every lookup.
+    """
+    try:
+        return hash(parts)
+    except TypeError:
+        return None
+
+
+def unhashable(node: Any) -> TypeError:
+    return TypeError(f"unhashable clause: {type(node).__name__!r}")
+
+
+def same_value(left: Any, right: Any) -> bool:
+    """`left == right` where the types match too, also inside containers.
+
+    Plain equality treats `(True, 2)` and `(1, 2)` as equal, but they bind
+    to different SQL.
+    """
+    if type(left) is not type(right):
+        return False
+    if isinstance(left, (tuple, list)):
+        return len(left) == len(right) and all(map(same_value, left, right))
+    if isinstance(left, (set, frozenset)):
+        return {(type(item), item) for item in left} == {
+            (type(item), item) for item in right
+        }
+    return left == right
+
+
+def memo_bind(
+    func: Callable[[ClauseT, interface.Mapper], interface.SaComparison]
+) -> Callable[[ClauseT, interface.Mapper], interface.SaComparison]:
+    """Memoize `bind` per (mapper, clause) for hashable clauses.
+
+    Clauses whose `_memoizable` is false, such as a `Where` with a resolver
+    that may read context, are bound every time.
+    """
+
+    @wraps(func)
+    def inner(self: ClauseT, mapper: interface.Mapper) -> interface.SaComparison:
+        if not getattr(self, "_memoizable", True):
+            return func(self, mapper)
+        if instrument.sinks:
+            return _instrumented_bind(func, self, mapper)
+        if (result := bind_cache.get((mapper, self))) is not None:  # type: ignore
+            return result
+        return bind_cache.put((mapper, self), func(self, mapper))  # type: ignore
+
+    return inner
+
+
+def _instrumented_bind(
+    func: Callable[[ClauseT, interface.Mapper], interface.SaComparison],
+    clause: ClauseT,
+    mapper: interface.Mapper,
+) -> interface.SaComparison:
+    start = instrument.now()
+    field = getattr(clause, "field", None)
+    source = type(clause).__qualname__
+    if (result := bind_cache.get((mapper, clause))) is not None:  # type: ignore
+        instrument.record("bind", start, source, mapper, field, hit=True)
+        return result
+    result = bind_cache.put((mapper, clause), func(clause, mapper))  # type: ignore
+    instrument.record("bind", start, source, mapper, field, hit=False)
+    return result
@@ -0,0 +1,302 @@
+import functools
+import operator
+import re
+import typing
+
+import sqlalchemy as sa
+
+from . import attribute
+from . import comp as cp
+from . import interface
+from .block import WhereBlock
+from .exc import FieldNotFound, UnsupportedClause
+from .group import GroupWhere
+from .null import NullBind
+from .where import AlwaysFalse, AlwaysTrue, FieldResolver, Where
+
+if typing.TYPE_CHECKING:
+    import numpy as np
+
+Predicate = typing.Callable[[typing.Any], bool]
+RowOp = typing.Callable[[typing.Any, typing.Any], bool]
+ArrayOp = typing.Callable[["np.ndarray", typing.Any], "np.ndarray"]
+Columns = typing.Mapping[str, typing.Any]
+
+_row_ops: dict[interface.Comparator, RowOp] = {}
+_array_ops: dict[interface.Comparator, ArrayOp] = {}
+_combinators: dict[typing.Callable, typing.Callable[[typing.Iterable], bool]] = {
+    sa.and_: all,
+    sa.or_: any,
+}
+
+
+def register(
+    comparator: interface.Comparator,
+    row_op: RowOp,
+    array_op: typing.Optional[ArrayOp] = None,
+) -> None:
+    """Teach the evaluator a comparator.
+
+    `row_op(value, target)` and `array_op(values, target)` only see
+    non-null values; nulls never match, as in SQL.
+    """
+    _row_ops[comparator] = row_op
+    if array_op is not None:
+        _array_ops[comparator] = array_op
+
+
+@functools.lru_cache(maxsize=256)
+def _like_regex(pattern: str, flags: int = 0) -> "re.Pattern[str]":
+    parts = (
+        ".*" if char == "%" else "." if char == "_" else re.escape(char)
+        for char in pattern
+    )
+    return re.compile("".join(parts), flags | re.DOTALL)
+
+
+def _like_op(fmt: str, flags: int = 0) -> RowOp:
+    def row_op(value: typing.Any, target: str) -> bool:
+        regex = _like_regex(fmt.format(target=target), flags)
+        return regex.fullmatch(str(value)) is not None
+
+    return row_op
+
+
+def _like_array_op(fmt: str, flags: int = 0) -> ArrayOp:
+    def array_op(values: "np.ndarray", target: str) -> "np.ndarray":
+        import numpy as np
+
+        match = _like_regex(fmt.format(target=target), flags).fullmatch
+        return np.fromiter(
+            (match(str(value)) is not None for value in values), bool, len(values)
+        )
+
+    return array_op
+
+
+def _in(values: "np.ndarray", target: typing.Iterable) -> "np.ndarray":
+    import numpy as np
+
+    return np.isin(values, list(target))
+
+
+def _not_in(values: "np.ndarray", target: typing.Iterable) -> "np.ndarray":
+    return ~_in(values, target)
+
+
+for _comp, _op in (
+    (cp.equals, operator.eq),
+    (cp.not_equals, operator.ne),
+    (cp.greater, operator.gt),
+    (cp.greater_equals, operator.ge),
+    (cp.lesser, operator.lt),
+    (cp.lesser_equals, operator.le),
+):
+    register(_comp, _op, _op)
+register(
+    cp.between,
+    lambda value, target: target[0] <= value <= target[1],
+    lambda values, target: (values >= target[0]) & (values <= target[1]),
+)
+register(
+    cp.range,
+    lambda value, target: target[0] <= value < target[1],
+    lambda values, target: (values >= target[0]) & (values < target[1]),
+)
+register(cp.includes, lambda value, target: value in target, _in)
+register(cp.excludes, lambda value, target: value not in target, _not_in)
+for _comp, _fmt in (
+    (cp.like, "%{target}%"),
+    (cp.rlike, "{target}%"),
+    (cp.llike, "%{target}"),
+):
+    register(_comp, _like_op(_fmt), _like_array_op(_fmt))
+for _opt, _fmt in cp.INSENSITIVE_LIKE_PATTERNS.items():
+    register(
+        cp.insensitive_like(_opt),  # type: ignore
+        _like_op(_fmt, re.IGNORECASE),
+        _like_array_op(_fmt, re.IGNORECASE),
+    )
+
+
+class _Many(list):
+    """Values reached through a to-many hop."""
+
+
+def _getter(field: str) -> typing.Callable[[typing.Any], typing.Any]:
+    parts = field.split(".")
+
+    def get(item: typing.Any, idx: int = 0) -> typing.Any:
+        for pos in range(idx, len(parts)):
+            if item is None:
+                return None
+            if pos and isinstance(item, (list, tuple)):
+                return _Many(get(child, pos) for child in item)
+            if isinstance(item, typing.Mapping):
+                item = item.get(parts[pos])
+            elif hasattr(item, parts[pos]):
+                item = getattr(item, parts[pos])
+            elif hasattr(item, name := attribute.entity_field(parts[pos])):
+                item = getattr(item, name)
+            else:
+                raise FieldNotFound(type(item).__name__, parts[pos])
+        return item
+
+    return get
+
+
+def _flatten(value: typing.Any) -> list[typing.Any]:
+    if not isinstance(value, _Many):
+        return [value]
+    return [item for child in value for item in _flatten(child)]
+
+
+def _leaf(where: Where) -> Predicate:
+    if where.value is None or where.comp is cp.always_true:
+        return lambda _: True
+    if where.comp is cp.always_false:
+        return lambda _: False
+    if where.comp is cp.isnull:
+        get, expected = _getter(where.field), bool(where.value)
+        return lambda row: any(
+            (value is None) is expected for value in _flatten(get(row))
+        )
+    if (op := _row_ops.get(where.comp)) is None or not _resolvable(where):
+        raise UnsupportedClause(where)
+    get = _getter(where.field)
+    if isinstance(where.resolver, FieldResolver):
+        other = _getter(where.resolver.val)
+        return lambda row: any(
+            value is not None and target is not None and op(value, target)
+            for value in _flatten(get(row))
+            for target in _flatten(other(row))
+        )
+    target = where.value
+    if where.comp in (cp.includes, cp.excludes):
+        target = _as_container(target)
+    return lambda row: any(
+        value is not None and op(value, target) for value in _flatten(get(row))
+    )
+
+
+def _resolvable(where: Where) -> bool:
+    return where.resolver is None or type(where.resolver) is FieldResolver
+
+
+def _as_container(target: typing.Iterable) -> typing.Container:
+    values = cp._as_sequence(target)
+    try:
+        return frozenset(values)
+    except TypeError:
+        return values
+
+
+def _combine(
+    clauses: typing.Iterable[interface.BindClause], combinator: typing.Callable
+) -> typing.Optional[Predicate]:
+    if (reduce := _combinators.get(combinator)) is None:
+        return None
+    predicates = [compile_predicate(clause) for clause in clauses]
+    return lambda row: reduce(predicate(row) for predicate in predicates)
+
+
+def compile_predicate(clause: interface.BindClause) -> Predicate:
+    """Turn a clause tree into a `row -> bool` callable.
+
+    Rows may be mappings or objects; dotted fields walk nested values and
+    match if any element of a nested list does, like a relation check.
+    Nulls never match a comparison, as in SQL.
+    """
+    if isinstance(clause, Where):
+        return _leaf(clause)
+    if isinstance(clause, (AlwaysTrue, NullBind)):
+        return lambda _: True
+    if isinstance(clause, AlwaysFalse):
+        return lambda _: False
+    if isinstance(clause, (GroupWhere, WhereBlock)):
+        items = clause.where if isinstance(clause, GroupWhere) else clause
+        if (predicate := _combine(items, clause.operator)) is not None:
+            return predicate
+    raise UnsupportedClause(clause)
+
+
+def filter_rows(
+    clause: interface.BindClause, rows: typing.Iterable[typing.Any]
+) -> list[typing.Any]:
+    predicate = compile_predicate(clause)
+    return [row for row in rows if predicate(row)]
+
+
+def _nulls(values: "np.ndarray") -> "np.ndarray":
+    import numpy as np
+
+    if values.dtype.kind == "f":
+        return np.isnan(values)
+    if values.dtype.kind in "mM":
+        return np.isnat(values)
+    if values.dtype.kind == "O":
+        return np.fromiter((value is None for value in values), bool, len(values))
+    return np.zeros(len(values), bool)
+
+
+def _column(columns: Columns, field: str) -> "np.ndarray":
+    import numpy as np
+
+    if field not in columns:
+        raise FieldNotFound("columns", field)
+    return np.asarray(columns[field])
+
+
+def _leaf_mask(where: Where, columns: Columns, size: int) -> "np.ndarray":
+    import numpy as np
+
+    if where.value is None or where.comp is cp.always_true:
+        return np.ones(size, bool)
+    if where.comp is cp.always_false:
+        return np.zeros(size, bool)
+    values = _column(columns, where.field)
+    nulls = _nulls(values)
+    if where.comp is cp.isnull:
+        return nulls if where.value else ~nulls
+    if (op := _array_ops.get(where.comp)) is None or not _resolvable(where):
+        raise UnsupportedClause(where)
+    valid = ~nulls
+    result = np.zeros(size, bool)
+    if isinstance(where.resolver, FieldResolver):
+        others = _column(columns, where.resolver.val)
+        valid &= ~_nulls(others)
+        result[valid] = op(values[valid], others[valid])
+        return result
+    result[valid] = op(values[valid], where.value)
+    return result
+
+
+def mask(
+    clause: interface.BindClause,
+    columns: Columns,
+    size: typing.Optional[int] = None,
+) -> "np.ndarray":
+    """Boolean mask of the rows in `columns` that match `clause`.
+
+    `columns` maps field names to equally long arrays; NaN, NaT and None
+    count as null. Requires NumPy.
+    """
+    import numpy as np
+
+    if size is None:
+        size = len(next(iter(columns.values()))) if columns else 0
+    if isinstance(clause, Where):
+        return _leaf_mask(clause, columns, size)
+    if isinstance(clause, (AlwaysTrue, NullBind)):
+        return np.ones(size, bool)
+    if isinstance(clause, AlwaysFalse):
+        return np.zeros(size, bool)
+    if isinstance(clause, (GroupWhere, WhereBlock)):
+        items = clause.where if isinstance(clause, GroupWhere) else clause
+        reduce = {sa.and_: np.logical_and, sa.or_: np.logical_or}.get(clause.operator)
+        if reduce is not None:
+            return reduce.reduce([mask(item, columns, size) for item in items])
+    raise UnsupportedClause(clause)
+
+
+__all__ = ["compile_predicate", "filter_rows", "mask", "register"]
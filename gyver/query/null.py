@@ -7,6 +7,12 @@ from .typedef import ClauseType
 class NullBind(interface.BindClause):
     type_ = ClauseType.BIND
 
+    def __eq__(self, other: object) -> bool:
+        return type(self) is type(other)
+
+    def __hash__(self) -> int:
+        return hash(type(self))
+
     def bind(self, mapper: interface.Mapper) -> interface.SaComparison:
         del mapper
         return sa.true()
@@ -0,0 +1,244 @@
+import typing
+from collections.abc import Iterator
+
+import sqlalchemy as sa
+
+from . import comp as cp
+from . import interface
+from . import where as wh
+from .group import GroupWhere
+from .null import NullBind
+
+_IDENTITY = {sa.and_: True, sa.or_: False}
+
+
+def is_always_true(clause: interface.BindClause) -> bool:
+    if isinstance(clause, (wh.AlwaysTrue, NullBind)):
+        return True
+    if isinstance(clause, wh.Where):
+        return clause.value is None or clause.comp is cp.always_true
+    return False
+
+
+def is_always_false(clause: interface.BindClause) -> bool:
+    if isinstance(clause, wh.AlwaysFalse):
+        return True
+    if isinstance(clause, wh.Where):
+        return clause.value is not None and clause.comp is cp.always_false
+    return False
+
+
+def simplify(clause: interface.BindClause) -> interface.BindClause:
+    """Rewrite a clause tree into an equivalent, smaller one.
+
+    Same-operator groups are flattened, identity elements (true in AND,
+    false in OR) are dropped, absorbing ones short-circuit the group and
+    no-op clauses are replaced by `AlwaysTrue`/`AlwaysFalse`.
+    """
+    if isinstance(clause, GroupWhere):
+        return _simplify_group(clause)
+    if is_always_true(clause):
+        return wh.AlwaysTrue()
+    if is_always_false(clause):
+        return wh.AlwaysFalse()
+    return clause
+
+
+def _constant(value: bool) -> interface.BindClause:
+    return wh.AlwaysTrue() if value else wh.AlwaysFalse()
+
+
+def _simplify_group(group: GroupWhere) -> interface.BindClause:
+    children = [simplify(clause) for clause in group.where]
+    identity = _IDENTITY.get(group.operator)
+    if identity is None:
+        return GroupWhere(*children, operator=group.operator, mark=group.mark)
+    flattened: list[interface.BindClause] = []
+    for child in children:
+        if isinstance(child, GroupWhere) and child.operator is group.operator:
+            flattened.extend(child.where)
+        elif isinstance(child, (wh.AlwaysTrue, wh.AlwaysFalse)):
+            if is_always_true(child) is not identity:
+                return _constant(not identity)
+        else:
+            flattened.append(child)
+    if not flattened:
+        return _constant(identity)
+    if len(flattened) == 1 and getattr(flattened[0], "mark", None) == group.mark:
+        return flattened[0]
+    return GroupWhere(*flattened, operator=group.operator, mark=group.mark)
+
+
+_RANGE_COMPARATORS = {
+    cp.equals,
+    cp.greater,
+    cp.greater_equals,
+    cp.lesser,
+    cp.lesser_equals,
+    cp.between,
+    cp.range,
+    cp.includes,
+}
+_SET_COMPARATORS = {cp.equals, cp.includes}
+
+
+def merge_predicates(clause: interface.BindClause) -> interface.BindClause:
+    """Merge predicates on the same field using comparator semantics.
+
+    ORs of `equals`/`includes` become a single `includes`, and ANDs of
+    bounds, `equals` and `includes` are intersected into the tightest
+    equivalent predicates. Contradictions become `AlwaysFalse`, which
+    `is_always_false` reports so the query can be skipped.
+    """
+    clause = simplify(clause)
+    if not isinstance(clause, GroupWhere):
+        return clause
+    children = [merge_predicates(child) for child in clause.where]
+    if clause.operator is sa.and_:
+        children = _merge_fields(
+            children, _SET_COMPARATORS | _RANGE_COMPARATORS, _intersect
+        )
+    elif clause.operator is sa.or_:
+        children = _merge_fields(children, _SET_COMPARATORS, _union)
+    return simplify(GroupWhere(*children, operator=clause.operator, mark=clause.mark))
+
+
+def _mergeable(clause: interface.BindClause, comparators: set) -> bool:
+    return (
+        isinstance(clause, wh.Where)
+        and clause.resolver is None
+        and clause.comp in comparators
+    )
+
+
+def _merge_fields(
+    children: list[interface.BindClause],
+    comparators: set,
+    merge: typing.Callable[[str, list["wh.Where"]], list[interface.BindClause]],
+) -> list[interface.BindClause]:
+    by_field: dict[str, list["wh.Where"]] = {}
+    children = [_materialized(child) for child in children]
+    for child in children:
+        if _mergeable(child, comparators):
+            by_field.setdefault(child.field, []).append(child)
+    result: list[interface.BindClause] = []
+    for child in children:
+        if not _mergeable(child, comparators) or len(by_field[child.field]) == 1:
+            result.append(child)
+            continue
+        predicates = by_field[child.field]
+        if child is predicates[0]:
+            try:
+                result.extend(merge(child.field, predicates))
+            except TypeError:
+                result.extend(predicates)
+    return result
+
+
+def _materialized(clause: interface.BindClause) -> interface.BindClause:
+    # merging reads the values, and a failed merge keeps the originals
+    if (
+        isinstance(clause, wh.Where)
+        and clause.comp is cp.includes
+        and isinstance(clause.value, Iterator)
+    ):
+        return wh.Where(clause.field, tuple(clause.value), cp.includes)
+    return clause
+
+
+def _unique(values) -> list:
+    seen, unique = set(), []
+    for value in values:
+        key = (type(value), value)
+        if key not in seen:
+            seen.add(key)
+            unique.append(value)
+    return unique
+
+
+def _member_key(value) -> tuple:
+    # SQL matches 1, 1.0 and Decimal("1") alike, but booleans bind apart
+    return isinstance(value, bool), value
+
+
+def _values(where: "wh.Where") -> list:
+    value = where.value
+    return list(value) if where.comp is cp.includes else [value]
+
+
+def _union(field: str, predicates: list["wh.Where"]) -> list[interface.BindClause]:
+    values = _unique(value for where in predicates for value in _values(where))
+    return [wh.Where(field, tuple(values), cp.includes)]
+
+
+def _intersect(field: str, predicates: list["wh.Where"]) -> list[interface.BindClause]:
+    lower, upper, members = None, None, None
+    for where in predicates:
+        value = where.value
+        if where.comp in _SET_COMPARATORS:
+            found = _unique(_values(where))
+            if members is None:
+                members = found
+            else:
+                keys = set(map(_member_key, found))
+                members = [v for v in members if _member_key(v) in keys]
+        elif where.comp in (cp.greater, cp.greater_equals):
+            lower = _tighter(lower, (value, where.comp is cp.greater_equals), max)
+        elif where.comp in (cp.lesser, cp.lesser_equals):
+            upper = _tighter(upper, (value, where.comp is cp.lesser_equals), min)
+        else:
+            left, right = value
+            lower = _tighter(lower, (left, True), max)
+            upper = _tighter(upper, (right, where.comp is cp.between), min)
+    if members is not None:
+        members = [value for value in members if _within(value, lower, upper)]
+        if not members:
+            return [wh.AlwaysFalse()]
+        if len(members) == 1:
+            return [wh.Where(field, members[0])]
+        return [wh.Where(field, tuple(members), cp.includes)]
+    return _bounds(field, lower, upper)
+
+
+def _tighter(current, candidate, pick):
+    if current is None:
+        return candidate
+    (value, inclusive), (other, other_inclusive) = current, candidate
+    if value == other:
+        return value, inclusive and other_inclusive
+    return current if pick(value, other) == value else candidate
+
+
+def _within(value, lower, upper) -> bool:
+    if lower is not None:
+        bound, inclusive = lower
+        if value < bound or (value == bound and not inclusive):
+            return False
+    if upper is not None:
+        bound, inclusive = upper
+        if value > bound or (value == bound and not inclusive):
+            return False
+    return True
+
+
+def _bounds(field: str, lower, upper) -> list[interface.BindClause]:
+    if lower is None or upper is None:
+        value, inclusive = lower or upper
+        if lower is not None:
+            comp = cp.greater_equals if inclusive else cp.greater
+        else:
+            comp = cp.lesser_equals if inclusive else cp.lesser
+        return [wh.Where(field, value, comp)]
+    (left, left_inclusive), (right, right_inclusive) = lower, upper
+    if left > right or (left == right and not (left_inclusive and right_inclusive)):
+        return [wh.AlwaysFalse()]
+    if left == right:
+        return [wh.Where(field, left)]
+    if left_inclusive and right_inclusive:
+        return [wh.Where(field, (left, right), cp.between)]
+    if left_inclusive:
+        return [wh.Where(field, (left, right), cp.range)]
+    return [
+        wh.Where(field, left, cp.greater),
+        wh.Where(field, right, cp.lesser_equals if right_inclusive else cp.lesser),
+    ]
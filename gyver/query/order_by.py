@@ -1,10 +1,15 @@
 import enum
+import functools
 import typing
 
-from gyver.attrs import define
+import sqlalchemy as sa
+from gyver.attrs import call_init, define
 from sqlalchemy.sql import ColumnElement, Select
 
+from gyver.query import attribute
+from gyver.query import comp as cp
 from gyver.query import interface
+from gyver.query.exc import FieldNotFound
 
 
 class OrderDirection(enum.Enum):
@@ -12,10 +17,44 @@ class OrderDirection(enum.Enum):
     DESC = "desc"
 
 
+class NullsPosition(enum.Enum):
+    FIRST = "first"
+    LAST = "last"
+
+
+@functools.lru_cache(maxsize=attribute.CACHE_SIZE)
+def _column_map(raw_columns: tuple[typing.Any, ...]) -> dict[str, ColumnElement]:
+    """Selected columns by key, shared by every statement with that select list.
+
+    Keyed by the raw select list rather than the statement, since `where`,
+    `order_by` and friends return a new Select each time.
+    """
+    columns: dict[str, ColumnElement] = {}
+    for col in sa.select(*raw_columns).selected_columns:
+        columns.setdefault(col.key, col)
+    return columns
+
+
+def find_column(query: Select, field: str) -> ColumnElement:
+    """Resolve `field` from the selected columns, then the selected entities."""
+    if (col := _column_map(tuple(query._raw_columns)).get(field)) is not None:
+        return col
+    for description in query.column_descriptions:
+        entity = description.get("entity")
+        if entity is None:
+            continue
+        try:
+            return attribute.retrieve_attr(entity, field)
+        except FieldNotFound:
+            continue
+    raise ValueError(f"Field {field} does not exist in query")
+
+
 @define
 class OrderBy:
     field: typing.Optional[str]
     direction: OrderDirection
+    nulls: typing.Optional[NullsPosition] = None
     type_ = interface.ClauseType.APPLY
 
     @property
@@ -27,12 +66,12 @@ class OrderBy:
         return cls(field=None, direction=OrderDirection.ASC)
 
     @classmethod
-    def asc(cls, field: str):
-        return cls(field, OrderDirection.ASC)
+    def asc(cls, field: str, nulls: typing.Optional[NullsPosition] = None):
+        return cls(field, OrderDirection.ASC, nulls)
 
     @classmethod
-    def desc(cls, field: str):
-        return cls(field, OrderDirection.DESC)
+    def desc(cls, field: str, nulls: typing.Optional[NullsPosition] = None):
+        return cls(field, OrderDirection.DESC, nulls)
 
     def apply(self, query: Select) -> Select:
         return (
@@ -42,10 +81,60 @@ class OrderBy:
         )
 
     def _find_column(self, query: Select) -> ColumnElement:
-        try:
-            return next(col for col in query.selected_columns if col.key == self.field)
-        except StopIteration:
-            raise ValueError(f"Field {self.field} does not exist in query") from None
+        return find_column(query, typing.cast(str, self.field))
 
     def _apply_order(self, col: ColumnElement):
-        return col.asc() if self.direction is OrderDirection.ASC else col.desc()
+        order = col.asc() if self.direction is OrderDirection.ASC else col.desc()
+        if self.nulls is NullsPosition.FIRST:
+            return order.nulls_first()
+        if self.nulls is NullsPosition.LAST:
+            return order.nulls_last()
+        return order
+
+
+@define
+class CompositeOrderBy:
+    orders: tuple[OrderBy, ...]
+    type_ = interface.ClauseType.APPLY
+
+    def __init__(self, *orders: OrderBy) -> None:
+        call_init(self, tuple(order for order in orders if order._should_apply))
+
+    def apply(self, query: Select) -> Select:
+        if not self.orders:
+            return query
+        return query.order_by(
+            *(order._apply_order(order._find_column(query)) for order in self.orders)
+        )
+
+
+@define
+class RankOrderBy:
+    """Order by full-text relevance of `field` for `target`, best first."""
+
+    field: str
+    target: typing.Optional[str]
+    direction: OrderDirection = OrderDirection.DESC
+    config: str = cp.DEFAULT_TEXT_CONFIG
+    fts_table: typing.Optional[str] = None
+    type_ = interface.ClauseType.APPLY
+
+    @property
+    def _should_apply(self):
+        return bool(self.target)
+
+    def apply(self, query: Select) -> Select:
+        return (
+            query.order_by(self._apply_order(self._find_column(query)))
+            if self._should_apply
+            else query
+        )
+
+    def _find_column(self, query: Select) -> ColumnElement:
+        return find_column(query, self.field)
+
+    def _apply_order(self, col: ColumnElement):
+        rank = cp.search_rank(
+            col, typing.cast(str, self.target), self.config, self.fts_table
+        )
+        return rank.asc() if self.direction is OrderDirection.ASC else rank.desc()
@@ -1,11 +1,26 @@
+import base64
+import binascii
+import enum
+import json
+import typing
 from abc import ABC, abstractmethod
+from datetime import date, datetime, time
+from decimal import Decimal
+from uuid import UUID
 
+import sqlalchemy as sa
 from gyver.attrs import define
-from sqlalchemy.sql import Select
+from sqlalchemy.engine import Dialect
+from sqlalchemy.sql import ColumnElement, Select
 
+from . import attribute
 from . import comp as cp
+from . import instrument
+from ._dialect import Explain
 from ._helpers import MockTable
+from .exc import FieldNotFound, InvalidCursor
 from .interface import ApplyClause, Comparator
+from .order_by import OrderBy, OrderDirection, find_column
 from .typedef import ClauseType
 from .where import Where
 
@@ -29,6 +44,7 @@ class Paginate(ApplyClause, ABC):
 
 
 class LimitOffsetPaginate(Paginate):
+    @instrument.timed("paginate")
     def apply(self, query: Select) -> Select:
         return query.limit(self.limit).offset(self.offset)
 
@@ -38,6 +54,7 @@ class FieldPaginate(Paginate):
     field: str = "id"
     jump_comparison: Comparator[int] = cp.greater
 
+    @instrument.timed("paginate")
     def apply(self, query: Select) -> Select:
         return query.where(
             Where(self.field, self.offset, self.jump_comparison).bind(
@@ -49,3 +66,350 @@ class FieldPaginate(Paginate):
 class _NullPaginate(Paginate):
     def apply(self, query: Select) -> Select:
         return query
+
+
+_ENCODERS: dict[type, tuple[str, typing.Callable[[typing.Any], typing.Any]]] = {
+    datetime: ("datetime", datetime.isoformat),
+    date: ("date", date.isoformat),
+    time: ("time", time.isoformat),
+    Decimal: ("decimal", str),
+    UUID: ("uuid", str),
+}
+_DECODERS: dict[str, typing.Callable[[typing.Any], typing.Any]] = {
+    "datetime": datetime.fromisoformat,
+    "date": date.fromisoformat,
+    "time": time.fromisoformat,
+    "decimal": Decimal,
+    "uuid": UUID,
+}
+
+
+@define
+class Cursor:
+    values: tuple[typing.Any, ...]
+    backwards: bool = False
+
+
+def encode_cursor(values: typing.Sequence[typing.Any], backwards: bool = False) -> str:
+    encoded = []
+    for value in values:
+        tag = _ENCODERS.get(type(value))
+        encoded.append([tag[0], tag[1](value)] if tag else value)
+    payload = json.dumps({"v": encoded, "b": backwards}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Cursor:
+    try:
+        payload = json.loads(
+            base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        )
+        values = tuple(
+            _DECODERS[value[0]](value[1]) if isinstance(value, list) else value
+            for value in payload["v"]
+        )
+        return Cursor(values, bool(payload["b"]))
+    except (binascii.Error, ValueError, TypeError, KeyError, IndexError):
+        raise InvalidCursor(cursor) from None
+
+
+@define
+class KeysetPaginate(ApplyClause):
+    """Seek pagination over an ordered set of fields.
+
+    `order` must end in a unique tiebreaker and its fields must not be
+    null. Pages fetched with a backwards cursor come in reverse order,
+    use `restore_order` to flip them back.
+    """
+
+    type_ = ClauseType.APPLY
+    limit: int
+    order: tuple[OrderBy, ...]
+    cursor: typing.Optional[str] = None
+    row_comparison: bool = True
+
+    @property
+    def backwards(self) -> bool:
+        return self.cursor is not None and decode_cursor(self.cursor).backwards
+
+    @instrument.timed("paginate")
+    def apply(self, query: Select) -> Select:
+        if not self.order or any(order.field is None for order in self.order):
+            raise ValueError("KeysetPaginate requires at least one order field")
+        columns = [
+            _keyset_column(query, typing.cast(str, order.field)) for order in self.order
+        ]
+        backwards = False
+        if self.cursor is not None:
+            cursor = decode_cursor(self.cursor)
+            if len(cursor.values) != len(columns):
+                raise InvalidCursor(self.cursor)
+            backwards = cursor.backwards
+            query = query.where(self._seek(columns, cursor.values, backwards))
+        return query.order_by(
+            *(
+                _sort(col, order.direction, backwards)
+                for col, order in zip(columns, self.order)
+            )
+        ).limit(self.limit)
+
+    def next_cursor(self, row: typing.Any) -> str:
+        return encode_cursor(self._row_values(row))
+
+    def prev_cursor(self, row: typing.Any) -> str:
+        return encode_cursor(self._row_values(row), backwards=True)
+
+    def restore_order(self, rows: typing.Sequence[typing.Any]) -> list[typing.Any]:
+        return list(reversed(rows)) if self.backwards else list(rows)
+
+    def _row_values(self, row: typing.Any) -> list[typing.Any]:
+        return [_row_value(row, typing.cast(str, order.field)) for order in self.order]
+
+    def _seek(
+        self,
+        columns: list[ColumnElement],
+        values: tuple[typing.Any, ...],
+        backwards: bool,
+    ) -> ColumnElement[bool]:
+        ascending = [
+            (order.direction is OrderDirection.ASC) is not backwards
+            for order in self.order
+        ]
+        if self.row_comparison and len(set(ascending)) == 1:
+            left, right = sa.tuple_(*columns), sa.tuple_(*values)
+            return left > right if ascending[0] else left < right
+        return sa.or_(
+            *(
+                sa.and_(
+                    *(col == value for col, value in zip(columns[:idx], values)),
+                    columns[idx] > values[idx]
+                    if ascending[idx]
+                    else columns[idx] < values[idx],
+                )
+                for idx in range(len(columns))
+            )
+        )
+
+
+def _sort(col: ColumnElement, direction: OrderDirection, backwards: bool):
+    return (
+        col.asc() if (direction is OrderDirection.ASC) is not backwards else col.desc()
+    )
+
+
+def _keyset_column(query: Select, field: str) -> ColumnElement:
+    # cursors read the field back from each row, see `_row_value`
+    column = find_column(query, field)
+    descriptions = query.column_descriptions
+    names = {
+        item["name"] for item in descriptions if item["expr"] is not item.get("entity")
+    }
+    if names.isdisjoint((field, attribute.entity_field(field))) and not (
+        descriptions and _on_entity(descriptions[0], field)
+    ):
+        raise ValueError(
+            f"Field {field} must be selected for keyset pagination to read its cursor"
+        )
+    return column
+
+
+def _on_entity(description: dict[str, typing.Any], field: str) -> bool:
+    entity = description.get("entity")
+    if entity is None or description["expr"] is not entity:
+        return False
+    try:
+        attribute.retrieve_attr(entity, field)
+    except FieldNotFound:
+        return False
+    return True
+
+
+def _row_value(row: typing.Any, key: str) -> typing.Any:
+    if isinstance(row, typing.Mapping):
+        return row[key]
+    if (mapping := getattr(row, "_mapping", None)) is not None:
+        for name in (key, attribute.entity_field(key)):
+            if name in mapping:
+                return mapping[name]
+        # rows of `select(Entity)` only hold the instance
+        return _row_value(row[0], key)
+    state = sa.inspect(row, raiseerr=False)
+    if state is not None and hasattr(state, "mapper"):
+        for prop in state.mapper.column_attrs:
+            if any(key in (col.key, col.name) for col in prop.columns):
+                return getattr(row, prop.key)
+    if hasattr(row, key):
+        return getattr(row, key)
+    return getattr(row, attribute.entity_field(key))
+
+
+class TotalMode(str, enum.Enum):
+    NONE = "none"
+    EXACT = "exact"
+    ESTIMATE = "estimate"
+
+
+@define
+class Page:
+    items: list[typing.Any]
+    has_next: bool
+    total: typing.Optional[int] = None
+    estimated: bool = False
+
+
+_TOTAL_LABEL = "_gyver_total"
+
+
+def page_statement(
+    query: Select, paginate: ApplyClause, total: TotalMode = TotalMode.NONE
+) -> Select:
+    """Paginated statement fetching one lookahead row for `has_next`.
+
+    With `TotalMode.EXACT` a `count(*) OVER ()` column is appended; for
+    seek paginators it counts the rows from the current page onwards.
+    """
+    if total is TotalMode.EXACT:
+        query = query.add_columns(sa.func.count().over().label(_TOTAL_LABEL))
+    stmt = paginate.apply(query)
+    if not paginate.limit:  # type: ignore
+        return stmt
+    return stmt.limit(paginate.limit + 1)  # type: ignore
+
+
+def build_page(
+    rows: typing.Sequence[typing.Any],
+    limit: int,
+    count: typing.Optional[int] = None,
+    scalars: bool = False,
+) -> Page:
+    has_next = bool(limit) and len(rows) > limit
+    rows = rows[:limit] if limit else rows
+    return Page([row[0] if scalars else row for row in rows], has_next, count)
+
+
+def _page_rows(
+    result: typing.Any, total: TotalMode
+) -> tuple[list[typing.Any], typing.Optional[int]]:
+    if total is not TotalMode.EXACT:
+        return result.all(), None
+    # strip the window total while keeping rows as Row objects
+    width = len(result.keys())
+    frozen = result.freeze()
+    count = frozen().columns(width - 1).scalars().first()
+    return frozen().columns(*range(width - 1)).all(), count or 0
+
+
+def _count_statement(query: Select) -> Select:
+    return sa.select(sa.func.count()).select_from(query.order_by(None).subquery())
+
+
+def _needs_count(
+    paginate: ApplyClause, rows: typing.Sequence[typing.Any], total: TotalMode
+) -> bool:
+    # an empty offset page cannot tell the total from its window; seek
+    # pages count from the cursor onwards, so zero is right for them
+    return (
+        total is TotalMode.EXACT
+        and not rows
+        and isinstance(paginate, LimitOffsetPaginate)
+        and bool(paginate.offset)
+    )
+
+
+def estimate_statement(
+    query: Select, dialect: Dialect
+) -> typing.Optional[sa.Executable]:
+    """Statement returning the planner's row estimate for `query`, if any.
+
+    MySQL only offers table statistics, so it is used for unfiltered
+    single-table selects only.
+    """
+    if dialect.name == "postgresql":
+        return Explain(query, "EXPLAIN (FORMAT JSON)")
+    froms = query.get_final_froms()
+    if dialect.name in ("mysql", "mariadb") and len(froms) == 1:
+        if isinstance(table := froms[0], sa.Table) and _unfiltered(query):
+            return sa.text(
+                "SELECT TABLE_ROWS FROM information_schema.TABLES "
+                "WHERE TABLE_SCHEMA = COALESCE(:schema, DATABASE()) "
+                "AND TABLE_NAME = :name"
+            ).bindparams(schema=table.schema, name=table.name)
+    return None
+
+
+def _unfiltered(query: Select) -> bool:
+    return (
+        query.whereclause is None
+        and not query._group_by_clauses
+        and query._having_criteria == ()
+        and not query._distinct
+    )
+
+
+def _read_estimate(value: typing.Any) -> int:
+    if isinstance(value, (str, bytes)):
+        value = json.loads(value)
+    if isinstance(value, list):
+        value = value[0]["Plan"]["Plan Rows"]
+    return int(value)
+
+
+def _dialect(executor: typing.Any) -> Dialect:
+    if (dialect := getattr(executor, "dialect", None)) is not None:
+        return dialect
+    return executor.get_bind().dialect
+
+
+@instrument.timed("fetch_page")
+def fetch_page(
+    executor: typing.Any,
+    query: Select,
+    paginate: ApplyClause,
+    total: TotalMode = TotalMode.NONE,
+    scalars: bool = False,
+) -> Page:
+    """Fetch a page and its metadata in a single round trip.
+
+    `TotalMode.ESTIMATE` runs a cheap planner/statistics lookup where the
+    dialect offers one and falls back to an exact window total otherwise.
+    """
+    estimate = None
+    if total is TotalMode.ESTIMATE:
+        if (stmt := estimate_statement(query, _dialect(executor))) is None:
+            total = TotalMode.EXACT
+        else:
+            estimate = _read_estimate(executor.execute(stmt).scalar_one())
+    result = executor.execute(page_statement(query, paginate, total))
+    rows, count = _page_rows(result, total)
+    if _needs_count(paginate, rows, total):
+        count = executor.execute(_count_statement(query)).scalar_one()
+    page = build_page(rows, paginate.limit, count, scalars)  # type: ignore
+    return _with_estimate(page, estimate)
+
+
+@instrument.timed("fetch_page")
+async def afetch_page(
+    executor: typing.Any,
+    query: Select,
+    paginate: ApplyClause,
+    total: TotalMode = TotalMode.NONE,
+    scalars: bool = False,
+) -> Page:
+    estimate = None
+    if total is TotalMode.ESTIMATE:
+        if (stmt := estimate_statement(query, _dialect(executor))) is None:
+            total = TotalMode.EXACT
+        else:
+            estimate = _read_estimate((await executor.execute(stmt)).scalar_one())
+    result = await executor.execute(page_statement(query, paginate, total))
+    rows, count = _page_rows(result, total)
+    if _needs_count(paginate, rows, total):
+        count = (await executor.execute(_count_statement(query))).scalar_one()
+    page = build_page(rows, paginate.limit, count, scalars)  # type: ignore
+    return _with_estimate(page, estimate)
+
+
+def _with_estimate(page: Page, estimate: typing.Optional[int]) -> Page:
+    if estimate is None:
+        return page
+    return Page(page.items, page.has_next, estimate, estimated=True)
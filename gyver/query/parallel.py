@@ -0,0 +1,202 @@
+import asyncio
+import typing
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import sqlalchemy as sa
+from sqlalchemy.sql import ColumnElement, Select, operators
+from sqlalchemy.sql.elements import UnaryExpression
+from sqlalchemy.sql.functions import FunctionElement
+from sqlalchemy.sql.visitors import iterate
+
+from . import comp as cp
+from . import instrument
+from .order_by import find_column
+
+Bounds = tuple[typing.Any, typing.Any]
+
+_AGGREGATES = frozenset(
+    {"count", "sum", "avg", "min", "max", "group_concat", "string_agg", "array_agg"}
+)
+
+
+def split_range(low: typing.Any, high: typing.Any, shards: int) -> list[Bounds]:
+    """Split `[low, high]` into up to `shards` disjoint ranges.
+
+    Ranges are half-open; the first has no lower bound and the last no
+    upper bound (None), so values outside `[low, high]` are still
+    covered. Works for numbers, dates and datetimes.
+    """
+    if shards < 1:
+        raise ValueError("shards must be positive")
+    span = high - low
+    if isinstance(span, int):
+        points = [low + span * idx // shards for idx in range(shards)]
+    else:
+        points = [low + span * idx / shards for idx in range(shards)]
+    points = list(dict.fromkeys(points))
+    return list(zip([None, *points[1:]], [*points[1:], None]))
+
+
+def shard_statements(
+    query: Select, column: ColumnElement, bounds: typing.Sequence[Bounds]
+) -> list[Select]:
+    statements = [query.where(_shard(column, *item)) for item in bounds]
+    if getattr(column, "nullable", True):
+        statements.append(query.where(cp.isnull(column, True)))
+    return statements
+
+
+def _shard(column: ColumnElement, left: typing.Any, right: typing.Any):
+    if left is None and right is None:
+        return cp.isnull(column, False)
+    if left is None:
+        return cp.lesser(column, right)
+    if right is None:
+        return cp.greater_equals(column, left)
+    return cp.range(column, (left, right))
+
+
+def bounds_statement(query: Select, column: ColumnElement) -> Select:
+    return query.with_only_columns(
+        sa.func.min(column), sa.func.max(column), maintain_column_froms=True
+    ).order_by(None)
+
+
+def _aggregates(query: Select) -> bool:
+    return any(
+        isinstance(element, FunctionElement) and element.name.lower() in _AGGREGATES
+        for column in query.selected_columns
+        for element in iterate(column)
+    )
+
+
+def _descending(query: Select, column: ColumnElement) -> typing.Optional[bool]:
+    """Direction of `query`'s leading ORDER BY if it is on `column`."""
+    if not query._order_by_clauses:
+        return None
+    element, desc = query._order_by_clauses[0], False
+    while isinstance(element, UnaryExpression):
+        desc = desc or element.modifier is operators.desc_op
+        element = element.element
+    if not column.compare(element):
+        raise ValueError(f"cannot return shards of {column} in another ORDER BY")
+    return desc
+
+
+def _prepare(
+    query: Select, field: str, ordered: bool
+) -> tuple[Select, ColumnElement, bool]:
+    if query._limit_clause is not None or query._offset_clause is not None:
+        raise ValueError("cannot shard a query with LIMIT or OFFSET")
+    if (
+        query._group_by_clauses
+        or query._having_criteria
+        or query._distinct
+        or _aggregates(query)
+    ):
+        raise ValueError("cannot shard a query with GROUP BY, DISTINCT or aggregates")
+    column = find_column(query, field)
+    if not ordered:
+        return query, column, False
+    if (desc := _descending(query, column)) is None:
+        return query.order_by(column), column, False
+    return query, column, desc
+
+
+def _merge(shards: typing.Iterable[list], reverse: bool) -> list[typing.Any]:
+    shards = list(shards)
+    if reverse:
+        shards.reverse()
+    return [row for rows in shards for row in rows]
+
+
+def _fetch(engine: sa.Engine, statement: Select, scalars: bool) -> list[typing.Any]:
+    start = instrument.now()
+    with engine.connect() as conn:
+        result = conn.execute(statement)
+        rows = list(result.scalars().all() if scalars else result.all())
+    if instrument.sinks:
+        instrument.record("shard", start, "parallel_select")
+    return rows
+
+
+def parallel_select(
+    engine: sa.Engine,
+    query: Select,
+    field: str,
+    shards: int = 4,
+    workers: typing.Optional[int] = None,
+    ordered: bool = False,
+    scalars: bool = False,
+    bounds: typing.Optional[Bounds] = None,
+) -> list[typing.Any]:
+    """Run `query` as disjoint range shards over `field`, concurrently.
+
+    Each shard uses its own pooled connection from `engine`, at most
+    `workers` (default `shards`) at once, so the pool must allow that many.
+    `bounds` skips the min/max lookup. With `ordered` the result is sorted
+    by `field`, otherwise shards are concatenated as they finish. An ORDER
+    BY already on `query` is kept within each shard; with `ordered` it
+    must lead with `field`, in either direction. Grouped, distinct and
+    aggregate selects cannot be split and raise ValueError.
+    """
+    query, column, reverse = _prepare(query, field, ordered)
+    if bounds is None:
+        with engine.connect() as conn:
+            bounds = tuple(conn.execute(bounds_statement(query, column)).one())
+    if bounds[0] is None:
+        return _fetch(engine, query, scalars)
+    statements = shard_statements(query, column, split_range(*bounds, shards))
+    with ThreadPoolExecutor(max_workers=workers or shards) as pool:
+        futures = [
+            pool.submit(_fetch, engine, statement, scalars) for statement in statements
+        ]
+        if ordered:
+            return _merge((future.result() for future in futures), reverse)
+        return [row for future in as_completed(futures) for row in future.result()]
+
+
+async def aparallel_select(
+    engine: typing.Any,
+    query: Select,
+    field: str,
+    shards: int = 4,
+    workers: typing.Optional[int] = None,
+    ordered: bool = False,
+    scalars: bool = False,
+    bounds: typing.Optional[Bounds] = None,
+) -> list[typing.Any]:
+    """Async `parallel_select` over an `AsyncEngine`."""
+    query, column, reverse = _prepare(query, field, ordered)
+    semaphore = asyncio.Semaphore(workers or shards)
+
+    async def fetch(statement: Select) -> list[typing.Any]:
+        async with semaphore:
+            start = instrument.now()
+            async with engine.connect() as conn:
+                result = await conn.execute(statement)
+                rows = list(result.scalars().all() if scalars else result.all())
+            if instrument.sinks:
+                instrument.record("shard", start, "aparallel_select")
+            return rows
+
+    if bounds is None:
+        async with engine.connect() as conn:
+            result = await conn.execute(bounds_statement(query, column))
+            bounds = tuple(result.one())
+    if bounds[0] is None:
+        return await fetch(query)
+    statements = shard_statements(query, column, split_range(*bounds, shards))
+    tasks = [asyncio.ensure_future(fetch(statement)) for statement in statements]
+    if ordered:
+        return _merge(await asyncio.gather(*tasks), reverse)
+    return [row for task in asyncio.as_completed(tasks) for row in await task]
+
+
+__all__ = [
+    "aparallel_select",
+    "bounds_statement",
+    "parallel_select",
+    "shard_statements",
+    "split_range",
+]
@@ -0,0 +1,174 @@
+import typing
+from datetime import date, datetime, time
+from decimal import Decimal
+
+from gyver.attrs import call_init, define
+
+from . import attribute
+from . import comp as cp
+from . import interface
+from .exc import InvalidFilter
+from .group import and_
+from .null import NullBind
+from .where import Where
+
+SEPARATOR = "__"
+LIST_SEPARATOR = ","
+
+Converter = typing.Callable[[typing.Any], typing.Any]
+
+
+@define
+class Operator:
+    comp: interface.Comparator
+    arity: typing.Literal["one", "many", "pair", "flag", "text"] = "one"
+
+
+OPERATORS: typing.Mapping[str, Operator] = {
+    "eq": Operator(cp.equals),
+    "ne": Operator(cp.not_equals),
+    "gt": Operator(cp.greater),
+    "gte": Operator(cp.greater_equals),
+    "lt": Operator(cp.lesser),
+    "lte": Operator(cp.lesser_equals),
+    "between": Operator(cp.between, "pair"),
+    "range": Operator(cp.range, "pair"),
+    "like": Operator(cp.like, "text"),
+    "rlike": Operator(cp.rlike, "text"),
+    "llike": Operator(cp.llike, "text"),
+    "ilike": Operator(cp.insensitive_like(), "text"),
+    "in": Operator(cp.includes, "many"),
+    "nin": Operator(cp.excludes, "many"),
+    "isnull": Operator(cp.isnull, "flag"),
+}
+
+_TRUTHY = {"1", "true", "yes", "on"}
+_FALSY = {"0", "false", "no", "off"}
+_PARSERS: dict[type, Converter] = {
+    int: int,
+    float: float,
+    Decimal: Decimal,
+    datetime: datetime.fromisoformat,
+    date: date.fromisoformat,
+    time: time.fromisoformat,
+}
+
+
+def _parse_bool(value: typing.Any) -> bool:
+    if not isinstance(value, str):
+        return bool(value)
+    if value.lower() in _TRUTHY:
+        return True
+    if value.lower() in _FALSY:
+        return False
+    raise ValueError(f"expected a boolean, got {value!r}")
+
+
+def _scalar_converter(field: interface.FieldType) -> typing.Optional[Converter]:
+    try:
+        python_type = field.type.python_type
+    except (AttributeError, NotImplementedError):
+        return None
+    return _parse_bool if python_type is bool else _PARSERS.get(python_type)
+
+
+def _split(value: typing.Any) -> typing.Sequence:
+    return value.split(LIST_SEPARATOR) if isinstance(value, str) else value
+
+
+@define
+class FilterStep:
+    key: str
+    field: str
+    operator: Operator
+    convert: typing.Optional[Converter]
+
+    def build(self, value: typing.Any) -> Where:
+        try:
+            expected = self._convert(value)
+        except InvalidFilter:
+            raise
+        except (TypeError, ValueError, ArithmeticError) as err:
+            raise InvalidFilter(self.key, str(err)) from None
+        return Where(self.field, expected, self.operator.comp)
+
+    def _convert(self, value: typing.Any) -> typing.Any:
+        arity = self.operator.arity
+        if arity == "flag":
+            return _parse_bool(value)
+        if arity == "text" or value is None:
+            return value
+        if arity == "one":
+            return self._coerce(value)
+        values = tuple(self._coerce(item) for item in _split(value))
+        if arity == "pair" and len(values) != 2:
+            raise InvalidFilter(self.key, "expected two values")
+        return values
+
+    def _coerce(self, value: typing.Any) -> typing.Any:
+        if self.convert is None or not isinstance(value, str):
+            return value
+        return self.convert(value)
+
+
+@define
+class FilterPlan:
+    steps: tuple[FilterStep, ...]
+
+    def build(self, params: typing.Mapping[str, typing.Any]) -> interface.BindClause:
+        if not self.steps:
+            return NullBind()
+        return and_(*(step.build(params[step.key]) for step in self.steps))
+
+
+@define(frozen=False)
+class FilterParser:
+    """Parses `field__op=value` mappings into `Where` trees.
+
+    Plans are validated against the mapper once and cached per
+    (mapper, keys), so repeated requests only convert values.
+    """
+
+    operators: typing.Mapping[str, Operator]
+    plans: attribute.MaybeCache
+
+    def __init__(
+        self,
+        operators: typing.Mapping[str, Operator] = OPERATORS,
+        maxsize: typing.Optional[int] = None,
+    ) -> None:
+        call_init(
+            self,
+            operators,
+            attribute.MaybeCache(maxsize, admit=attribute.is_persistent_mapper),
+        )
+
+    def plan(self, mapper: interface.Mapper, keys: typing.Iterable[str]) -> FilterPlan:
+        keys = frozenset(keys)
+        if (cached := self.plans.get((mapper, keys))) is not None:
+            return cached
+        steps = tuple(self._step(mapper, key) for key in sorted(keys))
+        return self.plans.put((mapper, keys), FilterPlan(steps))
+
+    def parse(
+        self, mapper: interface.Mapper, params: typing.Mapping[str, typing.Any]
+    ) -> interface.BindClause:
+        return self.plan(mapper, params.keys()).build(params)
+
+    def _step(self, mapper: interface.Mapper, key: str) -> FilterStep:
+        field, sep, name = key.rpartition(SEPARATOR)
+        if not sep:
+            field, name = key, "eq"
+        if (operator := self.operators.get(name)) is None:
+            raise InvalidFilter(key, f"unknown operator {name!r}")
+        column = attribute.retrieve_attr(mapper, field)
+        return FilterStep(key, field, operator, _scalar_converter(column))
+
+
+default_parser = FilterParser()
+
+
+def parse_filters(
+    mapper: interface.Mapper, params: typing.Mapping[str, typing.Any]
+) -> interface.BindClause:
+    return default_parser.parse(mapper, params)
@@ -0,0 +1,114 @@
+import asyncio
+import typing
+
+from sqlalchemy.sql import Select
+
+from . import interface
+from ._helpers import MockTable
+from .order_by import OrderBy
+from .paginate import KeysetPaginate
+from .where import ApplyWhere
+
+
+class Executor(typing.Protocol):
+    def execute(self, statement: Select) -> typing.Any:
+        ...
+
+
+class AsyncExecutor(typing.Protocol):
+    async def execute(self, statement: Select) -> typing.Any:
+        ...
+
+
+def _filtered(
+    query: Select,
+    where: typing.Sequence[interface.BindClause],
+    mapper: typing.Optional[interface.Mapper],
+) -> Select:
+    if not where:
+        return query
+    return ApplyWhere(mapper or MockTable(query.selected_columns), *where).apply(query)
+
+
+def _rows(result: typing.Any, scalars: bool) -> list[typing.Any]:
+    return list(result.scalars().all() if scalars else result.all())
+
+
+def stream(
+    executor: Executor,
+    query: Select,
+    order: typing.Sequence[OrderBy],
+    where: typing.Sequence[interface.BindClause] = (),
+    mapper: typing.Optional[interface.Mapper] = None,
+    page_size: int = 1000,
+    scalars: bool = False,
+    batches: bool = False,
+) -> typing.Iterator[typing.Any]:
+    """Walk every row matching `where` with keyset pagination.
+
+    Yields rows, or lists of rows when `batches` is set; at most one page
+    is held in memory.
+    """
+    query = _filtered(query, where, mapper)
+    paginate = KeysetPaginate(page_size, tuple(order))
+    while True:
+        rows = _rows(executor.execute(paginate.apply(query)), scalars)
+        if not rows:
+            return
+        if batches:
+            yield rows
+        else:
+            yield from rows
+        if len(rows) < page_size:
+            return
+        paginate = KeysetPaginate(
+            page_size, paginate.order, paginate.next_cursor(rows[-1])
+        )
+
+
+async def astream(
+    executor: AsyncExecutor,
+    query: Select,
+    order: typing.Sequence[OrderBy],
+    where: typing.Sequence[interface.BindClause] = (),
+    mapper: typing.Optional[interface.Mapper] = None,
+    page_size: int = 1000,
+    scalars: bool = False,
+    batches: bool = False,
+    prefetch: bool = True,
+) -> typing.AsyncIterator[typing.Any]:
+    """Async `stream` that fetches page N+1 while page N is consumed.
+
+    With `prefetch` the executor runs queries while the consumer holds a
+    page, so it should be a dedicated connection or session. At most two
+    pages are held in memory.
+    """
+    query = _filtered(query, where, mapper)
+
+    async def fetch(paginate: KeysetPaginate) -> list[typing.Any]:
+        return _rows(await executor.execute(paginate.apply(query)), scalars)
+
+    paginate = KeysetPaginate(page_size, tuple(order))
+    pending: typing.Optional[asyncio.Future] = asyncio.ensure_future(fetch(paginate))
+    try:
+        while pending is not None:
+            rows = await pending
+            pending = None
+            if not rows:
+                return
+            if len(rows) == page_size:
+                paginate = KeysetPaginate(
+                    page_size, paginate.order, paginate.next_cursor(rows[-1])
+                )
+                if prefetch:
+                    pending = asyncio.ensure_future(fetch(paginate))
+            if batches:
+                yield rows
+            else:
+                for row in rows:
+                    yield row
+            if len(rows) == page_size and pending is None:
+                pending = asyncio.ensure_future(fetch(paginate))
+    finally:
+        if pending is not None and not pending.done():
+            pending.cancel()
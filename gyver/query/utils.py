@@ -1,20 +1,37 @@
 import typing
+from datetime import date, datetime, time, timedelta
 
 import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.sql.elements import CompilerElement
+from sqlalchemy.sql.functions import Function
 
-from . import interface
+from . import comp as cp
+from . import instrument, interface
 
 T = typing.TypeVar("T")
 
+Rewrite = typing.Callable[
+    [interface.Comparator, interface.FieldType, typing.Any],
+    typing.Optional[interface.SaComparison],
+]
+
 
 def _make_converter(
     converter: typing.Callable[[interface.FieldType], interface.FieldType],
+    rewrite: typing.Optional[Rewrite] = None,
 ):
     def _converter(
         comparator: interface.Comparator[T],
     ) -> interface.Comparator[T]:
         def _comp(field: interface.FieldType, target: T) -> interface.SaComparison:
+            if comparator in _SET_COMPARATORS and target is not None:
+                # read once, rewrites inspect it before we may fall back
+                target = cp._as_sequence(target)  # type: ignore
+            if rewrite is not None:
+                result = rewrite(comparator, field, target)
+                if result is not None:
+                    return result
             return comparator(converter(field), target)
 
         return _comp
@@ -22,14 +39,166 @@ def _make_converter(
     return _converter
 
 
-as_date = _make_converter(sa.func.date)
-as_time = _make_converter(sa.func.time)
-as_lower = _make_converter(sa.func.lower)
-as_upper = _make_converter(sa.func.upper)
+def _column(field: interface.FieldType) -> typing.Any:
+    return getattr(field, "expression", field)
+
+
+def _is_day(value: typing.Any) -> bool:
+    return type(value) is date
+
+
+def _day(value: date) -> datetime:
+    return datetime.combine(value, time.min)
+
+
+def _next_day(value: date) -> datetime:
+    return _day(value) + timedelta(days=1)
+
+
+def _on_day(field: interface.FieldType, value: date) -> interface.SaComparison:
+    return sa.and_(field >= _day(value), field < _next_day(value))
+
+
+_DAY_REWRITES: dict[typing.Callable, typing.Callable] = {
+    cp.equals: _on_day,
+    cp.not_equals: lambda field, value: sa.or_(
+        field < _day(value), field >= _next_day(value)
+    ),
+    cp.greater: lambda field, value: field >= _next_day(value),
+    cp.greater_equals: lambda field, value: field >= _day(value),
+    cp.lesser: lambda field, value: field < _day(value),
+    cp.lesser_equals: lambda field, value: field < _next_day(value),
+}
+_DAY_RANGE_REWRITES: dict[typing.Callable, typing.Callable] = {
+    cp.between: lambda field, left, right: sa.and_(
+        field >= _day(left), field < _next_day(right)
+    ),
+    cp.range: lambda field, left, right: sa.and_(
+        field >= _day(left), field < _day(right)
+    ),
+}
+
+
+def _date_rewrite(
+    comparator: interface.Comparator, field: interface.FieldType, target: typing.Any
+) -> typing.Optional[interface.SaComparison]:
+    if isinstance(field.type, sa.Date):
+        return comparator(field, target)
+    if not isinstance(field.type, sa.DateTime):
+        return None
+    if comparator in _DAY_REWRITES and _is_day(target):
+        return _DAY_REWRITES[comparator](field, target)
+    if comparator in _DAY_RANGE_REWRITES and isinstance(target, (tuple, list)):
+        if len(target) == 2 and all(map(_is_day, target)):
+            return _DAY_RANGE_REWRITES[comparator](field, *target)
+    if comparator is cp.includes and isinstance(target, (tuple, list, set)):
+        if target and all(map(_is_day, target)):
+            return sa.or_(*(_on_day(field, value) for value in target))
+    return None
+
+
+def _time_rewrite(
+    comparator: interface.Comparator, field: interface.FieldType, target: typing.Any
+) -> typing.Optional[interface.SaComparison]:
+    return comparator(field, target) if isinstance(field.type, sa.Time) else None
+
+
+_CASE_COMPARATORS = {
+    cp.equals,
+    cp.not_equals,
+    cp.includes,
+    cp.excludes,
+    cp.like,
+    cp.rlike,
+    cp.llike,
+}
+_SET_COMPARATORS = {cp.includes, cp.excludes}
+
+
+def is_case_insensitive(field: interface.FieldType) -> bool:
+    """Whether comparisons on `field` already ignore case.
+
+    True for CITEXT, collations that only fold case (`nocase`, `*_as_ci`)
+    and columns declared with `info={"case_insensitive": True}`;
+    accent-insensitive `_ci` collations are not treated as such.
+    """
+    if getattr(_column(field), "info", {}).get("case_insensitive"):
+        return True
+    if isinstance(field.type, postgresql.CITEXT):
+        return True
+    collation = (getattr(field.type, "collation", None) or "").lower()
+    return collation.endswith("_as_ci") or collation == "nocase"
+
+
+def _indexed_case(field: interface.FieldType) -> set[str]:
+    column = _column(field)
+    table = getattr(column, "table", None)
+    found = set()
+    for index in getattr(table, "indexes", ()):
+        for expression in index.expressions:
+            if (
+                isinstance(expression, Function)
+                and expression.name in ("lower", "upper")
+                and any(clause.compare(column) for clause in expression.clauses)
+            ):
+                found.add(expression.name)
+    return found
+
+
+def _case_rewrite(name: str):
+    fold = str.lower if name == "lower" else str.upper
+    other = "upper" if name == "lower" else "lower"
+    other_fold = str.upper if name == "lower" else str.lower
+
+    def _rewrite(
+        comparator: interface.Comparator,
+        field: interface.FieldType,
+        target: typing.Any,
+    ) -> typing.Optional[interface.SaComparison]:
+        if comparator not in _CASE_COMPARATORS:
+            return None
+        values = target if comparator in _SET_COMPARATORS else [target]
+        # folding is only reversible for ascii values already in `name` case
+        if not all(
+            isinstance(value, str) and value.isascii() and fold(value) == value
+            for value in values
+        ):
+            return None
+        if is_case_insensitive(field):
+            return comparator(field, target)
+        indexed = _indexed_case(field)
+        if (
+            name not in indexed
+            and other in indexed
+            and comparator not in (cp.like, cp.rlike, cp.llike)
+        ):
+            folded = (
+                [other_fold(value) for value in values]
+                if comparator in _SET_COMPARATORS
+                else other_fold(target)
+            )
+            return comparator(getattr(sa.func, other)(field), folded)
+        return None
+
+    return _rewrite
+
+
+as_date = _make_converter(sa.func.date, _date_rewrite)
+as_time = _make_converter(sa.func.time, _time_rewrite)
+as_lower = _make_converter(sa.func.lower, _case_rewrite("lower"))
+as_upper = _make_converter(sa.func.upper, _case_rewrite("upper"))
 
 
+@instrument.timed("compile")
 def compile_stmt(stmt: CompilerElement) -> str:
     return str(stmt.compile(compile_kwargs={"literal_binds": True}))
 
 
-__all__ = ["as_date", "as_time", "as_lower", "as_upper", "compile_stmt"]
+__all__ = [
+    "as_date",
+    "as_time",
+    "as_lower",
+    "as_upper",
+    "compile_stmt",
+    "is_case_insensitive",
+]
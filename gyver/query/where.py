@@ -1,3 +1,4 @@
+import sys
 import typing
 
 import sqlalchemy as sa
@@ -5,8 +6,9 @@ from gyver.attrs import call_init, define
 
 from . import attribute
 from . import comp as cp
-from . import interface
+from . import instrument, interface, optimize
 from .group import and_
+from .memo import memo_bind, node_hash, same_value, unhashable
 from .typedef import ClauseType
 
 T = typing.TypeVar("T")
@@ -23,17 +25,33 @@ class Resolver(typing.Generic[T]):
     def __bool__(self):
         return self.val is not None
 
+    def __eq__(self, other: object) -> bool:
+        return type(self) is type(other) and same_value(
+            self.val, other.val  # type: ignore
+        )
+
+    def __hash__(self) -> int:
+        return hash((type(self), self.val))
+
 
 class FieldResolver(Resolver[str]):
     def resolve(self, mapper: interface.Mapper):
         return attribute.retrieve_attr(mapper, self.val)
 
 
-@define(frozen=False)
+@define
 class Where(interface.BindClause, typing.Generic[T]):
+    """Compare `field` against `value`.
+
+    Plain values are stored inline; only non-default resolver classes
+    keep a `Resolver` instance. Field names are interned.
+    """
+
     field: str
-    expected: Resolver[T]
+    value: typing.Any
     comp: interface.Comparator[T] = cp.equals
+    resolver: typing.Optional[Resolver[T]] = None
+    _hash: typing.Optional[int] = None
 
     def __init__(
         self,
@@ -42,19 +60,60 @@ class Where(interface.BindClause, typing.Generic[T]):
         comp: interface.Comparator[T] = cp.equals,
         resolver_class: type[Resolver[T]] = Resolver,
     ) -> None:
+        resolver = None if resolver_class is Resolver else resolver_class(expected)
+        field = sys.intern(field)
         call_init(
             self,
             field,
-            resolver_class(expected),
+            expected,
             comp,
+            resolver,
+            node_hash(field, expected, comp, type(resolver)),
         )
 
     type_ = ClauseType.BIND
 
+    @property
+    def expected(self) -> Resolver[T]:
+        """The resolver for `value`, built on access for plain values.
+
+        Binding reads `value` and `resolver` directly, so this stays off
+        the hot path.
+        """
+        return self.resolver if self.resolver is not None else Resolver(self.value)
+
+    @property
+    def _memoizable(self) -> bool:
+        # a custom resolver may read context, only field lookups are stable
+        return self.resolver is None or type(self.resolver) is FieldResolver
+
+    def with_field(self, field: str) -> "Where[T]":
+        """The same comparison against another field."""
+        resolver_class = Resolver if self.resolver is None else type(self.resolver)
+        return Where(field, self.value, self.comp, resolver_class)
+
+    def __eq__(self, other: object) -> bool:
+        return (
+            type(self) is type(other)
+            and self.field == other.field  # type: ignore
+            and self.comp == other.comp  # type: ignore
+            and same_value(self.value, other.value)  # type: ignore
+            and self.resolver == other.resolver  # type: ignore
+        )
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            raise unhashable(self)
+        return self._hash
+
+    @memo_bind
     def bind(self, mapper: interface.Mapper) -> interface.SaComparison:
-        resolved = self.expected.resolve(mapper)
-        attr = attribute.retrieve_attr(mapper, self.field)
-        return self.comp(attr, resolved) if self.expected else sa.true()
+        if self.value is None:
+            return sa.true()
+        resolved = (
+            self.value if self.resolver is None else self.resolver.resolve(mapper)
+        )
+        return self.comp(attribute.retrieve_attr(mapper, self.field), resolved)
 
 
 _placeholder_column = sa.Column("placeholder")
@@ -63,10 +122,29 @@ _placeholder_column = sa.Column("placeholder")
 class AlwaysTrue(interface.BindClause):
     type_ = ClauseType.BIND
 
+    def __eq__(self, other: object) -> bool:
+        return type(self) is type(other)
+
+    def __hash__(self) -> int:
+        return hash(type(self))
+
     def bind(self, mapper: interface.Mapper) -> interface.SaComparison:
         return cp.always_true(_placeholder_column, mapper)
 
 
+class AlwaysFalse(interface.BindClause):
+    type_ = ClauseType.BIND
+
+    def __eq__(self, other: object) -> bool:
+        return type(self) is type(other)
+
+    def __hash__(self) -> int:
+        return hash(type(self))
+
+    def bind(self, mapper: interface.Mapper) -> interface.SaComparison:
+        return cp.always_false(_placeholder_column, mapper)
+
+
 class RawQuery(interface.BindClause):
     type_ = ClauseType.BIND
 
@@ -82,7 +160,12 @@ class ApplyWhere(interface.ApplyClause):
     type_ = ClauseType.APPLY
 
     def __init__(self, mapper: interface.Mapper, *where: interface.BindClause) -> None:
-        self.where = and_(*where).bind(mapper)
+        if not instrument.sinks:
+            self.where = optimize.simplify(and_(*where)).bind(mapper)
+            return
+        start = instrument.now()
+        self.where = optimize.simplify(and_(*where)).bind(mapper)
+        instrument.record("apply_where", start, "ApplyWhere", mapper)
 
     def apply(self, query: interface.ExecutableT) -> interface.ExecutableT:
         return query.where(self.where)
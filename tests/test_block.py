@@ -0,0 +1,89 @@
+import gc
+import operator
+
+import pytest
+import sqlalchemy as sa
+from gyver.database import default_metadata
+
+from gyver.query import comp
+from gyver.query.block import WhereBlock, comparator, comparator_id
+from gyver.query.group import and_, or_
+from gyver.query.memo import bind_cache
+from gyver.query.utils import compile_stmt
+from gyver.query.where import Where
+
+mapper = sa.Table(
+    "block_users",
+    default_metadata,
+    sa.Column("id", sa.Integer),
+    sa.Column("name", sa.String),
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    bind_cache.clear()
+    yield
+    bind_cache.clear()
+
+
+def test_block_binds_like_the_equivalent_group():
+    block = WhereBlock.from_rows([("id", 1, comp.greater), ("name", "x")])
+    group = and_(Where("id", 1, comp.greater), Where("name", "x"))
+    assert compile_stmt(block.bind(mapper)) == compile_stmt(group.bind(mapper))
+    assert list(block) == list(group.where)
+
+
+def test_from_columns_shares_a_comparator_and_operator():
+    block = WhereBlock.from_columns(["id", "id"], [1, 2], operator=sa.or_)
+    group = or_(Where("id", 1), Where("id", 2))
+    assert compile_stmt(block.bind(mapper)) == compile_stmt(group.bind(mapper))
+    assert len(block) == 2
+
+
+def test_none_values_bind_to_true():
+    block = WhereBlock.from_columns(["id", "name"], [1, None])
+    assert compile_stmt(block.bind(mapper)) == compile_stmt(
+        sa.and_(mapper.c.id == 1, sa.true())
+    )
+
+
+def test_block_stores_columns_compactly():
+    block = WhereBlock.from_rows(
+        (f"field{idx % 3}", idx, comp.greater) for idx in range(1000)
+    )
+    assert len(set(block.comps)) == 1
+    assert comparator(block.comps[0]) is comp.greater
+    assert block.fields[0] is block.fields[3]
+    assert comparator_id(comp.greater) == block.comps[0]
+
+
+def test_unused_comparator_ids_are_recycled():
+    def make():
+        return lambda field, target: field == target
+
+    block = WhereBlock.from_columns(["id"], [1], make())
+    cid = block.comps[0]
+    gc.collect()
+    assert comparator(cid)(mapper.c.id, 1).compare(mapper.c.id == 1)
+    del block
+    gc.collect()
+    with pytest.raises(KeyError):
+        comparator(cid)
+    assert comparator_id(make()) == cid
+    assert comparator(comparator_id(operator.eq)) is operator.eq
+
+
+def test_block_equality_and_memoization():
+    block = WhereBlock.from_columns(["id"], [1])
+    assert block == WhereBlock.from_rows([("id", 1)])
+    assert hash(block) == hash(WhereBlock.from_rows([("id", 1)]))
+    assert block != WhereBlock.from_columns(["id"], [True])
+    assert block.bind(mapper) is WhereBlock.from_columns(["id"], [1]).bind(mapper)
+
+
+def test_block_validates_columns():
+    with pytest.raises(ValueError):
+        WhereBlock.from_columns([], [])
+    with pytest.raises(ValueError):
+        WhereBlock.from_columns(["id"], [1, 2])
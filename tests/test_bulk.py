@@ -0,0 +1,121 @@
+import asyncio
+import importlib.util
+
+import pytest
+import sqlalchemy as sa
+from gyver.database import make_table
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from gyver.query import comp
+from gyver.query.bulk import BulkProgress, abulk_execute, bulk_execute
+from gyver.query.where import Where
+
+requires_aiosqlite = pytest.mark.skipif(
+    importlib.util.find_spec("aiosqlite") is None, reason="aiosqlite not installed"
+)
+
+bulk_table = make_table(
+    "bulk_items",
+    sa.Column("id", sa.Integer, primary_key=True),
+    sa.Column("kind", sa.Text),
+    sa.Column("seen", sa.Boolean, default=False),
+)
+rows = [
+    {"id": idx, "kind": "odd" if idx % 2 else "even", "seen": False}
+    for idx in range(1, 26)
+]
+
+
+@pytest.fixture
+def engine():
+    engine = sa.create_engine("sqlite:///:memory:", poolclass=sa.pool.StaticPool)
+    with engine.connect() as conn:
+        bulk_table.create(conn)
+        conn.execute(bulk_table.insert().values(rows))
+        conn.commit()
+    yield engine
+    engine.dispose()
+
+
+def _seen(conn) -> list[int]:
+    query = sa.select(bulk_table.c.id).where(bulk_table.c.seen).order_by("id")
+    return conn.scalars(query).all()
+
+
+def test_bulk_update_walks_matching_rows_in_batches(engine: sa.Engine):
+    progress: list[BulkProgress] = []
+    with engine.connect() as conn:
+        result = bulk_execute(
+            conn,
+            bulk_table,
+            sa.update(bulk_table).values(seen=True),
+            Where("kind", "even"),
+            batch_size=5,
+            on_batch=progress.append,
+            commit=True,
+        )
+        assert _seen(conn) == list(range(2, 26, 2))
+    assert [item.rows for item in progress] == [5, 10, 12]
+    assert result.batches == 3 and result.rows == 12 and result.done
+
+
+def test_bulk_delete_respects_budget_and_resumes(engine: sa.Engine):
+    statement = sa.delete(bulk_table)
+    where = Where("id", 20, comp.lesser_equals)
+    with engine.connect() as conn:
+        first = bulk_execute(
+            conn, bulk_table, statement, where, batch_size=4, max_rows=6
+        )
+        assert (first.rows, first.batches, first.done) == (6, 2, False)
+        rest = bulk_execute(
+            conn,
+            bulk_table,
+            statement,
+            where,
+            batch_size=4,
+            checkpoint=first.checkpoint,
+        )
+        assert rest.rows == 14 and rest.done
+        assert conn.scalars(sa.select(bulk_table.c.id)).all() == list(range(21, 26))
+
+
+def test_bulk_execute_without_filters_visits_every_row(engine: sa.Engine):
+    with engine.connect() as conn:
+        result = bulk_execute(conn, bulk_table, sa.delete(bulk_table), batch_size=10)
+        assert conn.scalars(sa.select(bulk_table.c.id)).all() == []
+    assert (result.rows, result.batches, result.done) == (25, 3, True)
+
+
+def test_bulk_execute_rejects_selects():
+    with pytest.raises(TypeError):
+        bulk_execute(None, bulk_table, sa.select(bulk_table))  # type: ignore
+    with pytest.raises(ValueError):
+        bulk_execute(None, bulk_table, sa.delete(bulk_table), batch_size=0)
+
+
+@requires_aiosqlite
+def test_abulk_execute_matches_sync():
+    async def run():
+        engine = create_async_engine(
+            "sqlite+aiosqlite:///:memory:", poolclass=sa.pool.StaticPool
+        )
+        async with engine.connect() as conn:
+            await conn.run_sync(bulk_table.create)
+            await conn.execute(bulk_table.insert().values(rows))
+            progress = await abulk_execute(
+                conn,
+                bulk_table,
+                sa.update(bulk_table).values(seen=True),
+                Where("kind", "odd"),
+                batch_size=4,
+                pause=0.001,
+                commit=True,
+            )
+            seen = (
+                await conn.execute(sa.select(sa.func.count()).where(bulk_table.c.seen))
+            ).scalar()
+        await engine.dispose()
+        return progress, seen
+
+    progress, seen = asyncio.run(run())
+    assert (progress.rows, progress.batches, seen) == (13, 4, 13)
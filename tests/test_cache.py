@@ -0,0 +1,169 @@
+import time
+
+import pytest
+import sqlalchemy as sa
+
+from gyver.query import comp
+from gyver.query.bulk import bulk_execute
+from gyver.query.cache import (
+    MemoryBackend,
+    ResultCache,
+    invalidate,
+    statement_key,
+    statement_tables,
+    watch,
+)
+from gyver.query.where import ApplyWhere, Where
+
+metadata = sa.MetaData()
+items = sa.Table(
+    "cache_items",
+    metadata,
+    sa.Column("id", sa.Integer, primary_key=True),
+    sa.Column("name", sa.Text),
+)
+others = sa.Table(
+    "cache_others", metadata, sa.Column("id", sa.Integer, primary_key=True)
+)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = sa.create_engine(f"sqlite:///{tmp_path / 'cache.db'}")
+    metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(
+            items.insert(), [{"id": idx, "name": f"n{idx}"} for idx in range(1, 6)]
+        )
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def conn(engine):
+    with engine.connect() as conn:
+        yield conn
+
+
+@pytest.fixture
+def calls(engine):
+    executed = []
+    sa.event.listen(engine, "before_execute", lambda *args: executed.append(args))
+    return executed
+
+
+def _select(*where):
+    where = where or (Where("id", 0, comp.greater),)
+    return ApplyWhere(items, *where).apply(sa.select(items.c.id).order_by(items.c.id))
+
+
+def test_statement_key_includes_bound_values(engine):
+    first = statement_key(_select(Where("id", 1)))
+    assert first == statement_key(_select(Where("id", 1)))
+    assert first != statement_key(_select(Where("id", 2)))
+    assert statement_key(_select(Where("id", [1, 2], comp.includes))) is not None
+    assert statement_tables(
+        sa.select(items.c.id).join(others, others.c.id == items.c.id)
+    ) == {"cache_items", "cache_others"}
+    other = sa.create_engine("sqlite://")
+    assert statement_key(_select(), engine) == statement_key(_select(), engine)
+    assert statement_key(_select(), engine) != statement_key(_select(), other)
+    assert watch(engine) != watch(other) and watch(object()) is None
+    other.dispose()
+
+
+def test_identical_selects_hit_the_cache(conn, calls):
+    cache = ResultCache()
+    query = _select(Where("id", 3, comp.greater))
+    assert cache.execute(conn, query, scalars=True) == [4, 5]
+    assert cache.execute(conn, _select(Where("id", 3, comp.greater)), True) == [4, 5]
+    assert cache.execute(conn, _select(Where("id", 4, comp.greater)), True) == [5]
+    assert (len(calls), cache.hits, cache.misses) == (2, 1, 2)
+
+
+def test_other_engines_do_not_share_results(conn):
+    cache = ResultCache()
+    other = sa.create_engine("sqlite://")
+    metadata.create_all(other)
+    assert cache.execute(conn, _select(), scalars=True) == [1, 2, 3, 4, 5]
+    with other.connect() as other_conn:
+        assert cache.execute(other_conn, _select(), scalars=True) == []
+    other.dispose()
+
+
+def test_mutations_invalidate_when_the_transaction_ends(conn):
+    cache = ResultCache()
+    query = _select(Where("name", "n1"))
+    assert cache.execute(conn, query, scalars=True) == [1]
+    update = ApplyWhere(items, Where("id", 1)).apply(sa.update(items).values(name="x"))
+    assert cache.execute(conn, update) == []
+    assert cache.execute(conn, query, scalars=True) == []
+    conn.rollback()
+    assert cache.execute(conn, query, scalars=True) == [1]
+    conn.execute(update)
+    conn.commit()
+    assert cache.execute(conn, query, scalars=True) == []
+    deleted = sa.delete(items).where(items.c.id == 2).returning(items.c.id)
+    assert cache.execute(conn, deleted, scalars=True) == [2]
+    conn.commit()
+    assert cache.execute(conn, query, scalars=True) == []
+    assert (cache.hits, cache.misses) == (0, 4)
+
+
+def test_rolled_back_writes_are_never_cached(engine, conn):
+    cache = ResultCache()
+    query = _select(Where("id", 1)).with_only_columns(items.c.name)
+    assert cache.execute(conn, query, scalars=True) == ["n1"]
+    conn.execute(sa.update(items).where(items.c.id == 1).values(name="dirty"))
+    assert cache.execute(conn, query, scalars=True) == ["dirty"]
+    conn.rollback()
+    with engine.connect() as other:
+        assert cache.execute(other, query, scalars=True) == ["n1"]
+    assert cache.execute(conn, query, scalars=True) == ["n1"]
+
+
+def test_connections_see_their_own_writes(conn):
+    cache = ResultCache()
+    query = _select(Where("id", 1)).with_only_columns(items.c.name)
+    assert cache.execute(conn, query, scalars=True) == ["n1"]
+    update = sa.update(items).where(items.c.id == 1).values(name="mine")
+    cache.execute(conn, update)
+    assert cache.execute(conn, query, scalars=True) == ["mine"]
+    conn.commit()
+    assert cache.execute(conn, query, scalars=True) == ["mine"]
+    assert cache.execute(conn, query, scalars=True) == ["mine"]
+    assert cache.hits == 1
+
+
+def test_bulk_mutations_invalidate(conn):
+    cache = ResultCache()
+    assert len(cache.execute(conn, _select(), scalars=True)) == 5
+    bulk_execute(conn, items, sa.delete(items), Where("id", 2, comp.greater))
+    conn.commit()
+    assert cache.execute(conn, _select(), scalars=True) == [1, 2]
+
+
+def test_explicit_invalidation_by_table_or_name(conn):
+    cache = ResultCache()
+    cache.execute(conn, _select())
+    invalidate("cache_others")
+    cache.execute(conn, _select())
+    cache.invalidate(items)
+    cache.execute(conn, _select())
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_memory_backend_evicts_lru_and_expired_entries():
+    backend = MemoryBackend(maxsize=2)
+    backend.set("a", [1], frozenset({"t"}), None)
+    backend.set("b", [2], frozenset({"t"}), None)
+    assert backend.get("a") == [1]
+    backend.set("c", [3], frozenset({"u"}), None)
+    assert backend.get("b") is None and len(backend) == 2
+    backend.set("d", [4], frozenset(), 0.001)
+    time.sleep(0.002)
+    assert backend.get("d") is None
+    backend.invalidate(["u"])
+    assert backend.get("c") is None
+    with pytest.raises(ValueError):
+        MemoryBackend(maxsize=0)
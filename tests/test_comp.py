@@ -1,11 +1,14 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 
+import pytest
 import sqlalchemy as sa
+from gyver.database import default_metadata
 
 from gyver.query import comp, where
+from gyver.query.null import NullBind
 from gyver.query.utils import as_date, as_time, compile_stmt
 
-from .mocks import Another, Person, PersonAddress
+from .mocks import Another, Person, PersonAddress, RelatedPerson
 
 
 def test_comparison_matches_expected():  # sourcery skip: none-compare
@@ -57,7 +60,13 @@ def test_comparison_matches_expected():  # sourcery skip: none-compare
     now = datetime.now()
     assert compile_stmt(
         as_date(comp.equals)(Person.last_login, now.date())
-    ) == compile_stmt(sa.func.date(Person.last_login) == now.date())
+    ) == compile_stmt(
+        sa.and_(
+            Person.last_login >= datetime.combine(now.date(), datetime.min.time()),
+            Person.last_login
+            < datetime.combine(now.date(), datetime.min.time()) + timedelta(days=1),
+        )
+    )
     assert compile_stmt(
         as_time(comp.greater)(Person.last_login, now.time())
         == compile_stmt(sa.func.time(Person.last_login) > now.time())
@@ -70,3 +79,66 @@ def test_field_resolver_resolves_correctly():
             "another.id", "another_id", resolver_class=where.FieldResolver
         ).bind(PersonAddress)
     ) == compile_stmt(Another.id_ == PersonAddress.another_id)
+
+
+@pytest.fixture
+def relations():
+    engine = sa.create_engine("sqlite:///:memory:")
+    default_metadata.create_all(engine)
+    with sa.orm.Session(engine) as session:
+        first, second = Another(name="first"), Another(name="second")
+        addresses = [
+            PersonAddress(another=first),
+            PersonAddress(another=first),
+            PersonAddress(another=second),
+            PersonAddress(),
+        ]
+        session.add_all(
+            [
+                RelatedPerson(id_=1, address=addresses[:2]),
+                RelatedPerson(id_=2, address=addresses[2:]),
+                RelatedPerson(id_=3, address=[]),
+            ]
+        )
+        session.commit()
+        yield session
+    engine.dispose()
+
+
+def _related_ids(session, strategy, target, inner, min_count=1):
+    check = comp.make_relation_check(inner, strategy, min_count)
+    query = sa.select(RelatedPerson.id_).order_by(RelatedPerson.id_)
+    return session.scalars(
+        query.where(where.Where("address", target, check).bind(RelatedPerson))
+    ).all()
+
+
+@pytest.mark.parametrize("strategy", list(comp.RelationStrategy))
+def test_relation_strategies_agree(relations, strategy):
+    first = where.Where("address.another_id", 1)
+    assert _related_ids(relations, strategy, True, first) == [1]
+    assert _related_ids(relations, strategy, False, first) == [2, 3]
+    assert _related_ids(relations, strategy, True, NullBind()) == [1, 2]
+    assert _related_ids(relations, strategy, False, NullBind()) == [3]
+    assert _related_ids(relations, strategy, True, NullBind(), 2) == [1, 2]
+    assert _related_ids(relations, strategy, True, first, 2) == [1]
+    assert _related_ids(relations, strategy, False, first, 2) == [2, 3]
+
+
+@pytest.mark.parametrize("strategy", list(comp.RelationStrategy))
+def test_relation_strategies_handle_nullable_keys(relations, strategy):
+    check = comp.make_relation_check(where.Where("another.name", "first"), strategy)
+    query = sa.select(PersonAddress.id_).order_by(PersonAddress.id_)
+    matches = where.Where("another", False, check).bind(PersonAddress)
+    assert relations.scalars(query.where(matches)).all() == [3, 4]
+
+
+def test_relation_in_strategy_uses_a_semi_join():
+    check = comp.make_relation_check(
+        where.Where("address.id", 1), comp.RelationStrategy.IN
+    )
+    stmt = compile_stmt(where.Where("address", True, check).bind(RelatedPerson))
+    assert stmt.startswith("relatedperson.id IN (SELECT")
+    assert "EXISTS" not in stmt
+    with pytest.raises(ValueError):
+        comp.make_relation_check(NullBind(), min_count=0)
@@ -0,0 +1,67 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+import gyver.query
+
+OWN_IMPORT_BUDGET_US = 250_000
+
+
+def _run(code: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def _loaded_after(statement: str) -> set[str]:
+    result = _run(
+        f"import sys, json\n{statement}\nprint(json.dumps(list(sys.modules)))"
+    )
+    return set(json.loads(result.stdout))
+
+
+def test_package_import_is_lazy():
+    loaded = _loaded_after("import gyver.query")
+    assert "sqlalchemy" not in loaded
+    assert "gyver.query.where" not in loaded
+
+
+@pytest.mark.parametrize(
+    "statement",
+    [
+        "from gyver.query import comp",
+        "from gyver.query import compile_stmt",
+        "from gyver.query import Where, and_",
+    ],
+)
+def test_entity_module_and_orm_are_deferred(statement):
+    loaded = _loaded_after(statement)
+    assert "gyver.database" not in loaded
+    assert "sqlalchemy.orm" not in loaded
+
+
+def test_own_import_time_stays_within_budget():
+    result = _run("import gyver.query.spec, gyver.query.stream, gyver.query.instrument")
+    own = 0
+    for line in result.stderr.splitlines():
+        fields = line.removeprefix("import time:").split("|")
+        if len(fields) == 3 and fields[2].strip().startswith("gyver.query"):
+            own += int(fields[0])
+    assert 0 < own < OWN_IMPORT_BUDGET_US
+
+
+def test_public_names_resolve():
+    for name in gyver.query.__all__:
+        assert getattr(gyver.query, name) is not None
+    assert set(gyver.query.__all__) <= set(dir(gyver.query))
+    assert set(gyver.query.__all__) == {
+        *gyver.query._submodules,
+        *gyver.query._exports,
+    }
+    with pytest.raises(AttributeError):
+        gyver.query.missing  # type: ignore
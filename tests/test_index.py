@@ -0,0 +1,94 @@
+import gc
+import weakref
+
+import pytest
+import sqlalchemy as sa
+from gyver.database.entity import AbstractEntity
+
+from gyver.query import index
+from gyver.query.attribute import attribute_cache, retrieve_attr
+from gyver.query.exc import FieldNotFound
+
+from .mocks import Another, Person, PersonAddress, RelatedPerson, mock_table
+
+
+@pytest.fixture
+def registry():
+    index.enable_index(index.DEFAULT_DEPTH)
+    yield index.registry
+    index.disable_index()
+    index.registry.clear()
+
+
+def test_build_index_maps_entity_columns_and_id_alias():
+    field_index = index.build_index(Another)
+    assert field_index.get("name") is Another.name
+    assert field_index.get("id") is Another.id_
+    assert field_index.get("id_") is Another.id_
+
+
+def test_build_index_includes_relationship_paths_up_to_depth():
+    field_index = index.build_index(RelatedPerson, depth=2)
+    assert field_index.get("address.another.name") is Another.name
+    assert field_index.get("address.id") is PersonAddress.id_
+    assert "address.another" in field_index
+    shallow = index.build_index(RelatedPerson, depth=1)
+    assert "address.another.name" not in shallow
+
+
+def test_build_index_maps_table_columns():
+    field_index = index.build_index(mock_table)
+    assert field_index.get("id") is mock_table.c.id
+    assert not field_index.covers("id.name")
+
+
+def test_build_index_rejects_unsupported_mappers():
+    with pytest.raises(TypeError):
+        index.build_index(object())  # type: ignore
+
+
+def test_field_index_raises_field_not_found():
+    with pytest.raises(FieldNotFound):
+        index.build_index(Person).get("nonexistent")
+
+
+def test_retrieve_attr_uses_registry_when_enabled(registry: index.IndexRegistry):
+    attribute_cache.clear()
+    assert retrieve_attr(PersonAddress, "another.name") is Another.name
+    assert PersonAddress in registry
+    assert not attribute_cache.cache
+
+
+def test_retrieve_attr_raises_from_index_for_unknown_fields(
+    registry: index.IndexRegistry,
+):
+    with pytest.raises(FieldNotFound):
+        retrieve_attr(Person, "nonexistent")
+    with pytest.raises(FieldNotFound):
+        retrieve_attr(mock_table, "nonexistent")
+
+
+def test_retrieve_attr_falls_back_for_paths_deeper_than_index(
+    registry: index.IndexRegistry,
+):
+    registry.enable(depth=0)
+    assert retrieve_attr(PersonAddress, "another.name") is Another.name
+
+
+def test_warm_indexes_all_registered_entities(registry: index.IndexRegistry):
+    registry.warm()
+    assert all(
+        mapper in registry for mapper in (Person, Another, PersonAddress, RelatedPerson)
+    )
+
+
+def test_indexes_are_dropped_with_their_table(registry: index.IndexRegistry):
+    table = sa.Table("index_short_lived", sa.MetaData(), sa.Column("id", sa.Integer))
+    assert registry.get(table) is not None and table in registry
+    ref = weakref.ref(table)
+    del table
+    gc.collect()
+    assert ref() is None
+    registry.clear()
+    assert Person not in registry
+    assert registry.get(AbstractEntity) is None
@@ -0,0 +1,154 @@
+import asyncio
+import logging
+
+import pytest
+import sqlalchemy as sa
+from gyver.database import default_metadata
+
+from gyver.query import instrument
+from gyver.query.attribute import attribute_cache, retrieve_attr
+from gyver.query.group import and_
+from gyver.query.instrument import (
+    CounterSink,
+    Event,
+    LoggingSink,
+    OpenTelemetrySink,
+    instrumented,
+)
+from gyver.query.memo import bind_cache
+from gyver.query.paginate import LimitOffsetPaginate
+from gyver.query.utils import compile_stmt
+from gyver.query.where import ApplyWhere, Where
+from tests import mocks
+
+mapper = sa.Table(
+    "instrument_users",
+    default_metadata,
+    sa.Column("id", sa.Integer),
+    sa.Column("name", sa.String),
+)
+
+
+class ListSink:
+    def __init__(self) -> None:
+        self.events: list[Event] = []
+
+    def record(self, event: Event) -> None:
+        self.events.append(event)
+
+
+@pytest.fixture(autouse=True)
+def clear_state():
+    attribute_cache.clear()
+    bind_cache.clear()
+    yield
+    instrument.clear_sinks()
+
+
+def test_hooks_are_inactive_without_sinks():
+    assert instrument.sinks == ()
+    sink = ListSink()
+    Where("id", 1).bind(mapper)
+    with instrumented(sink):
+        assert instrument.sinks == (sink,)
+    assert instrument.sinks == ()
+    assert sink.events == []
+
+
+def test_bind_and_attribute_report_hits_and_misses():
+    counters = CounterSink()
+    with instrumented(counters):
+        Where("id", 1).bind(mapper)
+        Where("id", 1).bind(mapper)
+
+    binds = counters.counters[("bind", "instrument_users", "id")]
+    assert (binds.count, binds.hits, binds.misses) == (2, 1, 1)
+    attrs = counters.counters[("attribute", "instrument_users", "id")]
+    assert (attrs.count, attrs.hits, attrs.misses) == (1, 0, 1)
+    assert binds.total_ns > 0
+
+
+def test_attribute_hits_after_miss():
+    sink = ListSink()
+    with instrumented(sink):
+        retrieve_attr(mocks.Person, "name")
+        retrieve_attr(mocks.Person, "name")
+    assert [(event.mapper, event.hit) for event in sink.events] == [
+        ("Person", False),
+        ("Person", True),
+    ]
+
+
+def test_counter_sink_breaks_down_by_mapper():
+    counters = CounterSink()
+    with instrumented(counters):
+        and_(Where("id", 1), Where("name", "x")).bind(mapper)
+        Where("name", "x").bind(mocks.Person)
+
+    totals = counters.by_mapper("bind")
+    assert totals["instrument_users"].count == 3
+    assert totals["Person"].count == 1
+    counters.reset()
+    assert counters.counters == {}
+
+
+def test_apply_paginate_and_compile_are_timed():
+    sink = ListSink()
+    with instrumented(sink):
+        query = ApplyWhere(mapper, Where("id", 1)).apply(sa.select(mapper))
+        compile_stmt(LimitOffsetPaginate(10, 0).apply(query))
+
+    names = {(event.name, event.source) for event in sink.events}
+    assert ("apply_where", "ApplyWhere") in names
+    assert ("paginate", "LimitOffsetPaginate.apply") in names
+    assert ("compile", "compile_stmt") in names
+
+
+def test_timed_supports_coroutines():
+    sink = ListSink()
+
+    @instrument.timed("custom")
+    async def work():
+        return 1
+
+    with instrumented(sink):
+        assert asyncio.run(work()) == 1
+    assert [event.name for event in sink.events] == ["custom"]
+
+
+def test_logging_sink_logs_events(caplog):
+    with caplog.at_level(logging.DEBUG, logger="gyver.query"):
+        with instrumented(LoggingSink()):
+            Where("id", 1).bind(mapper)
+    assert any(
+        "bind Where mapper=instrument_users field=id hit=False" in message
+        for message in caplog.messages
+    )
+
+
+def test_opentelemetry_sink_emits_backdated_spans():
+    spans = []
+
+    class Span:
+        def __init__(self, name, start_time, attributes):
+            self.name, self.start_time, self.attributes = name, start_time, attributes
+
+        def end(self, end_time):
+            self.end_time = end_time
+            spans.append(self)
+
+    class Tracer:
+        def start_span(self, name, start_time, attributes):
+            return Span(name, start_time, attributes)
+
+    OpenTelemetrySink(Tracer()).record(Event("bind", 500, "Where", "users", "id", True))
+
+    (span,) = spans
+    assert span.name == "gyver.query.bind"
+    assert span.end_time - span.start_time == 500
+    assert span.attributes == {
+        "gyver.query.source": "Where",
+        "gyver.query.mapper": "users",
+        "gyver.query.field": "id",
+        "gyver.query.cache_hit": True,
+    }
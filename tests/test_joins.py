@@ -0,0 +1,97 @@
+import pytest
+import sqlalchemy as sa
+from gyver.database import default_metadata
+
+from gyver.query import comp
+from gyver.query.exc import FieldNotFound
+from gyver.query.group import and_, or_
+from gyver.query.joins import collect_fields, plan_joins
+from gyver.query.order_by import CompositeOrderBy, OrderBy
+from gyver.query.utils import compile_stmt
+from gyver.query.where import Where
+from tests import mocks
+
+
+@pytest.fixture
+def session():
+    engine = sa.create_engine("sqlite:///:memory:")
+    default_metadata.create_all(engine)
+    with sa.orm.Session(engine) as session:
+        first, second = mocks.Another(name="first"), mocks.Another(name="second")
+        addresses = [
+            mocks.PersonAddress(another=first),
+            mocks.PersonAddress(another=first),
+            mocks.PersonAddress(another=second),
+        ]
+        session.add_all(
+            [
+                mocks.RelatedPerson(id_=1, address=addresses[:2]),
+                mocks.RelatedPerson(id_=2, address=addresses[2:]),
+                mocks.RelatedPerson(id_=3, address=[]),
+            ]
+        )
+        session.commit()
+        yield session
+    engine.dispose()
+
+
+def test_collect_fields_walks_filters_and_orders():
+    assert collect_fields(
+        and_(Where("name", "x"), or_(Where("another.name", "y"), Where("id", 1))),
+        CompositeOrderBy(OrderBy.asc("another.id"), OrderBy.desc("name")),
+    ) == ["name", "another.name", "id", "another.id"]
+
+
+def test_to_one_paths_are_joined_once():
+    plan = plan_joins(
+        mocks.PersonAddress,
+        Where("another.name", "x"),
+        Where("another.id", 1, comp.greater),
+        order=[OrderBy.asc("another.name")],
+    )
+    assert plan.joins == (("another",),)
+    stmt = compile_stmt(plan.apply(sa.select(mocks.PersonAddress)))
+    assert stmt.count("JOIN another") == 1
+    assert "ORDER BY another.name ASC" in stmt
+
+
+def test_existing_joins_are_not_repeated():
+    query = sa.select(mocks.PersonAddress).join(mocks.PersonAddress.another)
+    stmt = compile_stmt(
+        plan_joins(mocks.PersonAddress, Where("another.name", "x")).apply(query)
+    )
+    assert stmt.count("JOIN another") == 1
+
+
+def test_to_many_paths_use_a_shared_exists(session):
+    plan = plan_joins(
+        mocks.RelatedPerson,
+        Where("address.another.name", "first"),
+        Where("address.id", 1),
+    )
+    assert plan.joins == ()
+    stmt = plan.apply(sa.select(mocks.RelatedPerson.id_))
+    assert compile_stmt(stmt).count("EXISTS") == 2
+    assert session.scalars(stmt).all() == [1]
+
+
+def test_to_many_paths_do_not_multiply_rows(session):
+    plan = plan_joins(mocks.RelatedPerson, Where("address.another.name", "first"))
+    stmt = plan.apply(sa.select(mocks.RelatedPerson.id_))
+    assert session.scalars(stmt).all() == [1]
+
+
+def test_or_groups_keep_separate_exists(session):
+    plan = plan_joins(
+        mocks.RelatedPerson,
+        or_(Where("address.another.name", "second"), Where("id", 3)),
+    )
+    stmt = plan.apply(sa.select(mocks.RelatedPerson.id_).order_by("id"))
+    assert session.scalars(stmt).all() == [2, 3]
+
+
+def test_plan_rejects_invalid_paths():
+    with pytest.raises(ValueError):
+        plan_joins(mocks.RelatedPerson, order=[OrderBy.asc("address.id")])
+    with pytest.raises(FieldNotFound):
+        plan_joins(mocks.PersonAddress, Where("missing.name", "x"))
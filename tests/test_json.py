@@ -0,0 +1,103 @@
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+
+from gyver.query import comp
+
+metadata = sa.MetaData()
+events = sa.Table(
+    "json_events",
+    metadata,
+    sa.Column("id", sa.Integer, primary_key=True),
+    sa.Column("data", sa.JSON),
+)
+documents = sa.Table(
+    "json_documents",
+    sa.MetaData(),
+    sa.Column("doc", postgresql.JSONB),
+)
+
+
+def _sql(expr, dialect) -> str:
+    return str(expr.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+
+
+@pytest.fixture
+def conn():
+    engine = sa.create_engine("sqlite://")
+    metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(
+            events.insert(),
+            [
+                {"id": 1, "data": {"tags": ["x", "y"], "n": 1}},
+                {"id": 2, "data": ["x", 2]},
+                {"id": 3, "data": []},
+                {"id": 4, "data": {}},
+            ],
+        )
+        yield conn
+    engine.dispose()
+
+
+def _ids(conn, condition) -> list[int]:
+    query = sa.select(events.c.id).where(condition).order_by(events.c.id)
+    return conn.scalars(query).all()
+
+
+def test_json_contains_compiles_per_dialect():
+    expr = comp.json_contains(events.c.data, "x")
+    assert _sql(expr, postgresql.dialect()) == (
+        "CAST(json_events.data AS JSONB) @> CAST('\"x\"' AS JSONB)"
+    )
+    assert _sql(expr, mysql.dialect()) == "'x' MEMBER OF (json_events.data)"
+    assert "json_each(json_events.data, '$')" in _sql(expr, sqlite.dialect())
+    assert _sql(comp.json_contains(events.c.data, [1]), mysql.dialect()) == (
+        "json_contains(json_events.data, '[1]')"
+    )
+
+
+def test_jsonb_columns_are_not_cast():
+    assert _sql(comp.json_has_key(documents.c.doc, "a"), postgresql.dialect()) == (
+        "json_documents.doc ? 'a'"
+    )
+
+
+def test_json_extract_uses_path_operators():
+    expr = comp.json_extract(documents.c.doc, "a.0")
+    assert _sql(expr, postgresql.dialect()) == (
+        'json_documents.doc #> CAST(\'{"a","0"}\' AS TEXT[])'
+    )
+    assert (
+        _sql(expr, mysql.dialect()) == "json_extract(json_documents.doc, '$.\"a\"[0]')"
+    )
+
+
+def test_json_comparators_on_sqlite(conn):
+    data = events.c.data
+    assert _ids(conn, comp.json_contains(data, "x")) == [2]
+    assert _ids(conn, comp.json_contains(data, ["x", 2])) == [2]
+    assert _ids(conn, comp.json_contains(data, {"n": 1})) == [1]
+    assert _ids(conn, comp.json_has_key(data, "tags")) == [1]
+    assert _ids(conn, comp.json_empty(data, True)) == [3, 4]
+    assert _ids(conn, comp.json_empty(data, False)) == [1, 2]
+    tags = comp.json_extract(data, "$.tags")
+    assert _ids(conn, comp.json_contains(tags, "y")) == [1]
+
+
+def test_sqlite_contains_follows_jsonb_containment(conn):
+    conn.execute(
+        events.insert(),
+        [
+            {"id": 5, "data": {"k": "v"}},
+            {"id": 6, "data": {"k": {"a": 1, "b": 2}, "l": [[1, 2], {"c": True}]}},
+            {"id": 7, "data": "v"},
+        ],
+    )
+    data = events.c.data
+    assert _ids(conn, comp.json_contains(data, "v")) == [7]
+    assert _ids(conn, comp.json_contains(data, {"k": {"a": 1}})) == [6]
+    assert _ids(conn, comp.json_contains(data, {"l": [[2], {}]})) == [6]
+    assert _ids(conn, comp.json_contains(data, {"l": [{"c": True}]})) == [6]
+    assert _ids(conn, comp.json_contains(data, {"k": {"a": 1, "z": 0}})) == []
+    assert _ids(conn, comp.json_contains(data, {"tags": "x"})) == []
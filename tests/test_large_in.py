@@ -0,0 +1,80 @@
+import pytest
+import sqlalchemy as sa
+from gyver.database import make_table
+from sqlalchemy.dialects import postgresql, sqlite
+
+from gyver.query import comp
+from gyver.query.comp import InStrategy, excludes_using, includes_using
+
+large_in_table = make_table(
+    "large_in_items",
+    sa.Column("id", sa.Integer, primary_key=True),
+)
+
+
+@pytest.fixture
+def engine():
+    engine = sa.create_engine("sqlite:///:memory:", poolclass=sa.pool.StaticPool)
+    with engine.connect() as conn:
+        large_in_table.create(conn)
+        conn.execute(large_in_table.insert().values([{"id": i} for i in range(1, 51)]))
+        conn.commit()
+    yield engine
+    engine.dispose()
+
+
+def _ids(conn: sa.Connection, clause) -> list[int]:
+    query = sa.select(large_in_table.c.id).where(clause).order_by(large_in_table.c.id)
+    return list(conn.execute(query).scalars())
+
+
+@pytest.mark.parametrize("strategy", list(InStrategy))
+def test_strategies_select_the_same_rows(engine: sa.Engine, strategy: InStrategy):
+    target = list(range(0, 60, 3))
+    field = large_in_table.c.id
+    with engine.connect() as conn:
+        expected = _ids(conn, comp.includes(field, target))
+        included = includes_using(strategy, threshold=5, chunk_size=4)(field, target)
+        excluded = excludes_using(strategy, threshold=5, chunk_size=4)(field, target)
+        assert _ids(conn, included) == expected
+        assert _ids(conn, excluded) == _ids(conn, comp.excludes(field, target))
+        assert _ids(conn, includes_using(strategy)(field, [])) == []
+
+
+def test_auto_uses_any_array_on_postgresql_for_large_targets():
+    field = large_in_table.c.id
+    small = includes_using(threshold=3)(field, [1, 2])
+    large = includes_using(threshold=3)(field, [1, 2, 3, 4])
+    assert " IN " in str(small.compile(dialect=postgresql.dialect()))
+    assert "= ANY (%(param_1)s::INTEGER[])" in str(
+        large.compile(dialect=postgresql.dialect())
+    )
+    compiled = sa.select(field).where(large).compile(dialect=sqlite.dialect())
+    assert "POSTCOMPILE" in str(compiled)
+
+
+def test_array_strategy_keeps_one_statement_shape():
+    comparator = includes_using(InStrategy.ARRAY)
+    field = large_in_table.c.id
+    first = sa.select(field).where(comparator(field, [1, 2]))
+    second = sa.select(field).where(comparator(field, list(range(100))))
+    assert first._generate_cache_key().key == second._generate_cache_key().key
+
+
+def test_chunked_strategy_limits_list_size():
+    clause = includes_using(InStrategy.CHUNKED, chunk_size=2)(
+        large_in_table.c.id, [1, 2, 3, 4, 5]
+    )
+    compiled = str(clause.compile(compile_kwargs={"literal_binds": True}))
+    assert compiled.count(" IN ") == 3
+
+
+def test_accepts_numpy_arrays_and_iterables(engine: sa.Engine):
+    np = pytest.importorskip("numpy")
+    field = large_in_table.c.id
+    with engine.connect() as conn:
+        assert _ids(conn, comp.includes(field, np.array([1, 2, 3]))) == [1, 2, 3]
+        assert _ids(conn, includes_using()(field, (i for i in (4, 5)))) == [4, 5]
+        assert _ids(
+            conn, includes_using(InStrategy.LITERAL)(field, np.arange(6, 8))
+        ) == [6, 7]
@@ -1,6 +1,17 @@
+import gc
+import threading
+
+import pytest
 from sqlalchemy import Column, Integer, MetaData, String, Table
 
-from gyver.query.attribute import CACHE_SIZE, MaybeCache
+from gyver.query._helpers import MockTable
+from gyver.query.attribute import (
+    CACHE_SIZE,
+    MaybeCache,
+    attribute_cache,
+    is_persistent_mapper,
+    retrieve_attr,
+)
 from gyver.query.interface import Mapper
 
 
@@ -58,3 +69,102 @@ def test_decorator_caches_function_result():
     get_field(table, "name")
 
     assert cache.cache[(table, "name")] == table.c.name
+
+
+def test_get_refreshes_recency_of_hit_keys():
+    cache = MaybeCache(maxsize=2)
+    metadata = MetaData()
+    table = Table("my_table", metadata, Column("id", Integer), Column("name", String))
+    cache.put((table, "id"), table.c.id)
+    cache.put((table, "name"), table.c.name)
+    cache.get((table, "id"))
+    cache.put((table, "other"), table.c.name)
+    assert (table, "id") in cache.cache
+    assert (table, "name") not in cache.cache
+
+
+def test_stats_track_hits_misses_and_evictions():
+    cache = MaybeCache(maxsize=1)
+    metadata = MetaData()
+    table = Table("my_table", metadata, Column("id", Integer), Column("name", String))
+    cache.get((table, "id"))
+    cache.put((table, "id"), table.c.id)
+    cache.get((table, "id"))
+    cache.put((table, "name"), table.c.name)
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.evictions) == (1, 1, 1)
+    assert (stats.size, stats.maxsize) == (1, 1)
+
+
+def test_clear_resets_entries_and_stats():
+    cache = MaybeCache()
+    metadata = MetaData()
+    table = Table("my_table", metadata, Column("id", Integer), Column("name", String))
+    cache.put((table, "id"), table.c.id)
+    cache.get((table, "id"))
+    cache.clear()
+    assert not cache.cache
+    assert cache.stats().hits == 0
+
+
+def test_maxsize_must_be_positive():
+    with pytest.raises(ValueError):
+        MaybeCache(maxsize=0)
+
+
+def test_concurrent_access_keeps_cache_bounded():
+    cache = MaybeCache(maxsize=8)
+    metadata = MetaData()
+    table = Table("my_table", metadata, Column("id", Integer), Column("name", String))
+
+    def worker(offset: int):
+        for i in range(500):
+            key = (table, f"field{(i + offset) % 16}")
+            if cache.get(key) is None:
+                cache.put(key, table.c.id)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(cache.cache) <= 8
+
+
+def test_entries_are_dropped_when_the_mapper_is_collected():
+    cache = MaybeCache()
+    table = Table("my_table", MetaData(), Column("id", Integer))
+    cache.put((table, "id"), table.c.id)
+    assert len(cache.cache) == 1
+    del table
+    gc.collect()
+    assert not cache.cache
+    assert cache.stats().size == 0
+
+
+def test_admission_policy_rejects_transient_mappers():
+    cache = MaybeCache(admit=is_persistent_mapper)
+    table = Table("my_table", MetaData(), Column("id", Integer))
+    mock = MockTable(table.c)
+    assert cache.put((mock, "id"), table.c.id) is table.c.id
+    assert cache.put((table.alias(), "id"), table.c.id) is table.c.id
+    assert not cache.cache
+    assert cache.stats().rejections == 2
+
+
+def test_doorkeeper_only_admits_keys_seen_twice_when_full():
+    cache = MaybeCache(maxsize=1, doorkeeper=True)
+    table = Table("my_table", MetaData(), Column("id", Integer), Column("name", String))
+    cache.put((table, "id"), table.c.id)
+    cache.put((table, "name"), table.c.name)
+    assert (table, "id") in cache.cache
+    cache.put((table, "name"), table.c.name)
+    assert (table, "name") in cache.cache
+    assert (table, "id") not in cache.cache
+
+
+def test_retrieve_attr_does_not_cache_mock_tables():
+    table = Table("my_table", MetaData(), Column("id", Integer))
+    before = attribute_cache.stats().size
+    assert retrieve_attr(MockTable(table.c), "id") is table.c.id
+    assert attribute_cache.stats().size == before
@@ -0,0 +1,112 @@
+import contextvars
+
+import pytest
+import sqlalchemy as sa
+from gyver.database import default_metadata
+
+from gyver.query import comp
+from gyver.query.block import WhereBlock
+from gyver.query.group import and_, or_
+from gyver.query.memo import bind_cache
+from gyver.query.null import NullBind
+from gyver.query.utils import compile_stmt
+from gyver.query.where import AlwaysTrue, FieldResolver, Resolver, Where
+
+mapper = sa.Table(
+    "memo_users",
+    default_metadata,
+    sa.Column("id", sa.Integer),
+    sa.Column("name", sa.String),
+    sa.Column("active", sa.Boolean),
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    bind_cache.clear()
+    yield
+    bind_cache.clear()
+
+
+def test_clauses_are_immutable_and_hashable():
+    where = Where("id", 5, comp.greater)
+    assert where == Where("id", 5, comp.greater)
+    assert hash(where) == hash(Where("id", 5, comp.greater))
+    assert hash(and_(where)) == hash(and_(Where("id", 5, comp.greater)))
+    assert NullBind() == NullBind() and hash(NullBind()) == hash(NullBind())
+    assert AlwaysTrue() == AlwaysTrue()
+    with pytest.raises(AttributeError):
+        where.field = "name"  # type: ignore
+
+
+def test_resolver_equality_distinguishes_value_types():
+    assert Resolver(1) != Resolver(True)
+    assert Where("active", 1) != Where("active", True)
+    assert Where("id", (True, 2), comp.includes) != Where("id", (1, 2), comp.includes)
+    assert Where("id", ((1,), 2)) != Where("id", ((True,), 2))
+    assert Where("id", frozenset({1})) != Where("id", frozenset({True}))
+    assert WhereBlock(["id"], [(1, 2)]) != WhereBlock(["id"], [(True, 2)])
+    assert Resolver([1.0]) != Resolver([1])
+    assert Where("id", (1, 2), comp.includes) == Where("id", (1, 2), comp.includes)
+
+
+def test_hashes_are_computed_once():
+    where = and_(*(Where("id", idx) for idx in range(100)))
+    assert hash(where) == where._hash == hash(and_(*where.where))
+    with pytest.raises(TypeError):
+        hash(and_(Where("id", [1], comp.includes)))
+
+
+def test_bind_is_memoized_per_mapper():
+    where = and_(Where("id", 5, comp.greater), Where("name", "x"))
+    first = where.bind(mapper)
+    assert where.bind(mapper) is first
+    assert and_(Where("id", 5, comp.greater), Where("name", "x")).bind(mapper) is first
+    assert bind_cache.stats().hits >= 1
+
+
+def test_bind_skips_memo_for_unhashable_values():
+    where = Where("id", [1, 2], comp.includes)
+    assert compile_stmt(where.bind(mapper)) == compile_stmt(mapper.c.id.in_([1, 2]))
+    assert not bind_cache.cache
+
+
+def test_extend_derives_tree_reusing_bound_subtrees():
+    base = and_(Where("active", True), or_(Where("id", 1), Where("id", 2)))
+    base.bind(mapper)
+    hits = bind_cache.stats().hits
+    derived = base.extend(Where("name", "x"))
+    assert derived.where[:2] == base.where
+    assert compile_stmt(derived.bind(mapper)) == compile_stmt(
+        sa.and_(
+            mapper.c.active == True,  # noqa: E712
+            sa.or_(mapper.c.id == 1, mapper.c.id == 2),
+            mapper.c.name == "x",
+        )
+    )
+    assert bind_cache.stats().hits == hits + 2
+
+
+tenant = contextvars.ContextVar("tenant", default=1)
+
+
+class TenantResolver(Resolver[int]):
+    def resolve(self, mapper):
+        return tenant.get()
+
+
+def test_context_resolvers_are_bound_every_time():
+    where = Where("id", "current", resolver_class=TenantResolver)
+    group = and_(Where("name", "x"), where)
+    assert compile_stmt(where.bind(mapper)) == compile_stmt(mapper.c.id == 1)
+    group.bind(mapper)
+    token = tenant.set(2)
+    try:
+        assert compile_stmt(where.bind(mapper)) == compile_stmt(mapper.c.id == 2)
+        assert compile_stmt(group.bind(mapper)) == compile_stmt(
+            sa.and_(mapper.c.name == "x", mapper.c.id == 2)
+        )
+    finally:
+        tenant.reset(token)
+    related = Where("id", "id", resolver_class=FieldResolver)
+    assert related.bind(mapper) is related.bind(mapper)
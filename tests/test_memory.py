@@ -0,0 +1,135 @@
+from types import SimpleNamespace
+
+import pytest
+import sqlalchemy as sa
+
+from gyver.query import comp
+from gyver.query.block import WhereBlock
+from gyver.query.exc import FieldNotFound, UnsupportedClause
+from gyver.query.group import and_, or_
+from gyver.query.memory import compile_predicate, filter_rows, mask, register
+from gyver.query.utils import as_lower
+from gyver.query.where import AlwaysFalse, FieldResolver, RawQuery, Where
+from tests import mocks
+
+np = pytest.importorskip("numpy")
+
+metadata = sa.MetaData()
+people = sa.Table(
+    "memory_people",
+    metadata,
+    sa.Column("id", sa.Integer, primary_key=True),
+    sa.Column("name", sa.Text),
+    sa.Column("age", sa.Integer, nullable=True),
+    sa.Column("limit_", sa.Integer),
+)
+rows = [
+    {"id": 1, "name": "alice", "age": 31, "limit_": 30},
+    {"id": 2, "name": "Bob", "age": None, "limit_": 10},
+    {"id": 3, "name": "carol", "age": 18, "limit_": 20},
+    {"id": 4, "name": "dave_x", "age": 45, "limit_": 50},
+]
+
+clauses = [
+    Where("name", "alice"),
+    Where("name", "alice", comp.not_equals),
+    Where("age", 30, comp.greater),
+    Where("age", 31, comp.lesser_equals),
+    Where("age", (18, 31), comp.between),
+    Where("age", (18, 31), comp.range),
+    Where("id", [1, 3], comp.includes),
+    Where("age", [31], comp.excludes),
+    Where("name", "a", comp.like),
+    Where("name", "ca", comp.rlike),
+    Where("name", "e", comp.llike),
+    Where("name", "B", comp.insensitive_like("llike")),
+    Where("name", "_x", comp.like),
+    Where("age", True, comp.isnull),
+    Where("age", None, comp.greater),
+    Where("age", "limit_", comp.greater, resolver_class=FieldResolver),
+    or_(Where("id", 2), and_(Where("age", 40, comp.lesser), Where("id", 1))),
+    WhereBlock(["age", "id"], [18, 3], [comp.greater_equals, comp.lesser]),
+    AlwaysFalse(),
+]
+
+
+@pytest.fixture(scope="module")
+def conn():
+    engine = sa.create_engine("sqlite://")
+    metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(people.insert(), rows)
+        yield conn
+    engine.dispose()
+
+
+def _sql_ids(conn, clause) -> list[int]:
+    query = sa.select(people.c.id).where(clause.bind(people)).order_by(people.c.id)
+    return conn.scalars(query).all()
+
+
+@pytest.mark.parametrize("clause", clauses)
+def test_rows_match_the_database(conn, clause):
+    expected = _sql_ids(conn, clause)
+    assert [row["id"] for row in filter_rows(clause, rows)] == expected
+    objects = [SimpleNamespace(**row) for row in rows]
+    assert [row.id for row in filter_rows(clause, objects)] == expected
+
+
+@pytest.mark.parametrize("clause", clauses)
+def test_masks_match_the_database(conn, clause):
+    columns = {
+        "id": np.array([row["id"] for row in rows]),
+        "name": np.array([row["name"] for row in rows]),
+        "age": np.array([row["age"] for row in rows], dtype=float),
+        "limit_": np.array([row["limit_"] for row in rows]),
+    }
+    result = mask(clause, columns)
+    assert result.dtype == bool
+    assert columns["id"][result].tolist() == _sql_ids(conn, clause)
+
+
+def test_dotted_fields_match_any_nested_value():
+    users = [
+        {"id": 1, "orders": [{"total": 5}, {"total": 50}], "team": {"name": "a"}},
+        {"id": 2, "orders": [], "team": None},
+        {"id": 3, "orders": [{"total": 1}], "team": {"name": "b"}},
+    ]
+    clause = or_(Where("orders.total", 10, comp.greater), Where("team.name", "b"))
+    assert [user["id"] for user in filter_rows(clause, users)] == [1, 3]
+    tags = [{"tags": ["x", "y"]}, {"tags": ["z"]}]
+    assert filter_rows(Where("tags", ["z"]), tags) == [{"tags": ["z"]}]
+
+
+def test_unsupported_clauses_raise():
+    with pytest.raises(UnsupportedClause):
+        compile_predicate(RawQuery(sa.true()))
+    with pytest.raises(UnsupportedClause):
+        compile_predicate(Where("name", "x", as_lower(comp.equals)))
+    with pytest.raises(UnsupportedClause):
+        mask(Where("name", "x", as_lower(comp.equals)), {"name": ["x"]})
+    with pytest.raises(FieldNotFound):
+        compile_predicate(Where("missing", 1))(SimpleNamespace(id=1))
+    with pytest.raises(FieldNotFound):
+        mask(Where("missing", 1), {"id": [1]})
+
+
+def test_registered_comparators_are_evaluated():
+    lowered = as_lower(comp.equals)
+    register(
+        lowered,
+        lambda value, target: value.lower() == target,
+        lambda values, target: np.char.lower(values.astype(str)) == target,
+    )
+    clause = Where("name", "bob", lowered)
+    assert [row["id"] for row in filter_rows(clause, rows)] == [2]
+    assert mask(clause, {"name": np.array(["Bob", "x"])}).tolist() == [True, False]
+
+
+def test_entity_instances_share_the_sql_filter():
+    persons = [mocks.Person(id_=idx, name=f"p{idx}", age=idx * 10) for idx in (1, 2)]
+    addresses = [mocks.PersonAddress(id_=1, another=mocks.Another(id_=7, name="x"))]
+    clause = or_(Where("id", 1), Where("age", 20, comp.greater_equals))
+    assert filter_rows(clause, persons) == persons
+    assert filter_rows(Where("id", 2), persons) == persons[1:]
+    assert filter_rows(Where("another.id", 7), addresses) == addresses
@@ -0,0 +1,172 @@
+from decimal import Decimal
+
+import sqlalchemy as sa
+from gyver.database import default_metadata
+
+from gyver.query import comp
+from gyver.query.group import and_, or_
+from gyver.query.null import NullBind
+from gyver.query.optimize import (
+    is_always_false,
+    is_always_true,
+    merge_predicates,
+    simplify,
+)
+from gyver.query.utils import compile_stmt
+from gyver.query.where import AlwaysFalse, AlwaysTrue, ApplyWhere, Where
+
+from .mocks import Another, PersonAddress
+
+mapper = sa.Table(
+    "optimize_users",
+    default_metadata,
+    sa.Column("id", sa.Integer),
+    sa.Column("name", sa.String),
+)
+
+
+def test_no_op_clauses_are_detected_structurally():
+    assert is_always_true(Where("id", None))
+    assert is_always_true(Where("id", 1, comp.always_true))
+    assert is_always_true(NullBind())
+    assert is_always_false(Where("id", 1, comp.always_false))
+    assert not is_always_true(Where("id", 0))
+    assert simplify(Where("id", None)) == AlwaysTrue()
+    assert simplify(Where("id", 1, comp.always_false)) == AlwaysFalse()
+
+
+def test_simplify_flattens_same_operator_groups():
+    a, b, c = Where("id", 1), Where("name", "x"), Where("id", 2)
+    assert simplify(and_(and_(a, b), and_(c))) == and_(a, b, c)
+    assert simplify(and_(or_(a, b), c)) == and_(or_(a, b), c)
+
+
+def test_simplify_drops_identity_elements():
+    a, b = Where("id", 1), Where("name", "x")
+    assert simplify(and_(a, NullBind(), Where("name", None), b)) == and_(a, b)
+    assert simplify(or_(a, AlwaysFalse(), b)) == or_(a, b)
+    assert simplify(and_(a, AlwaysTrue())) == a
+    assert simplify(and_(NullBind(), AlwaysTrue())) == AlwaysTrue()
+    assert simplify(or_(AlwaysFalse())) == AlwaysFalse()
+
+
+def test_simplify_short_circuits_absorbing_elements():
+    a = Where("id", 1)
+    assert simplify(and_(a, or_(Where("name", "x"), AlwaysTrue()))) == a
+    assert simplify(and_(a, AlwaysFalse())) == AlwaysFalse()
+    assert simplify(or_(a, NullBind())) == AlwaysTrue()
+
+
+def test_simplify_keeps_marks():
+    a = Where("id", 1)
+    assert simplify(and_(a, mark="tenant")) == and_(a, mark="tenant")
+    assert simplify(and_(and_(a, mark="tenant"), mark="tenant")) == and_(
+        a, mark="tenant"
+    )
+
+
+def test_apply_where_emits_simplified_sql():
+    query = ApplyWhere(
+        mapper,
+        and_(Where("id", 1), NullBind()),
+        Where("name", None),
+        and_(Where("name", "x")),
+    ).apply(sa.select(mapper))
+    assert compile_stmt(query) == compile_stmt(
+        sa.select(mapper).where(mapper.c.id == 1, mapper.c.name == "x")
+    )
+
+
+def test_relation_check_detects_empty_inner_clause_without_compiling():
+    check = comp.make_relation_check(and_(NullBind()))
+    assert compile_stmt(check(PersonAddress.another, True)) == compile_stmt(
+        PersonAddress.another.has()
+    )
+    check = comp.make_relation_check(Where("another.name", "x"))
+    assert compile_stmt(check(PersonAddress.another, False)) == compile_stmt(
+        ~PersonAddress.another.has(Another.name == "x")
+    )
+
+
+def test_merge_predicates_coalesces_equals_into_includes():
+    merged = merge_predicates(
+        or_(Where("name", "a"), Where("name", "b"), Where("id", 1), Where("name", "a"))
+    )
+    assert merged == or_(Where("name", ("a", "b"), comp.includes), Where("id", 1))
+    assert merge_predicates(
+        or_(Where("name", ("a", "b"), comp.includes), Where("name", "c"))
+    ) == Where("name", ("a", "b", "c"), comp.includes)
+
+
+def test_merge_predicates_intersects_ranges():
+    merged = merge_predicates(
+        and_(
+            Where("id", 10, comp.greater),
+            Where("id", 18, comp.greater_equals),
+            Where("id", 65, comp.lesser),
+        )
+    )
+    assert merged == Where("id", (18, 65), comp.range)
+    assert merge_predicates(
+        and_(Where("id", (1, 10), comp.between), Where("id", 5, comp.lesser_equals))
+    ) == Where("id", (1, 5), comp.between)
+    assert merge_predicates(
+        and_(Where("id", 1, comp.greater), Where("id", 5, comp.lesser_equals))
+    ) == and_(Where("id", 1, comp.greater), Where("id", 5, comp.lesser_equals))
+    assert merge_predicates(
+        and_(Where("id", 5, comp.greater_equals), Where("id", 5, comp.lesser_equals))
+    ) == Where("id", 5)
+
+
+def test_merge_predicates_intersects_members_with_bounds():
+    assert merge_predicates(
+        and_(Where("id", (1, 2, 3), comp.includes), Where("id", 2, comp.greater_equals))
+    ) == Where("id", (2, 3), comp.includes)
+    assert merge_predicates(
+        and_(Where("id", 4), Where("id", (1, 10), comp.range), Where("name", "x"))
+    ) == and_(Where("id", 4), Where("name", "x"))
+
+
+def test_merge_predicates_detects_contradictions():
+    assert is_always_false(
+        merge_predicates(
+            and_(
+                Where("name", "x"),
+                Where("id", 10, comp.greater),
+                Where("id", 5, comp.lesser),
+            )
+        )
+    )
+    assert is_always_false(merge_predicates(and_(Where("id", 1), Where("id", 2))))
+    assert merge_predicates(
+        or_(and_(Where("id", 1), Where("id", 2)), Where("name", "x"))
+    ) == Where("name", "x")
+
+
+def test_merge_predicates_leaves_incomparable_values_untouched():
+    clause = and_(Where("id", 1, comp.greater), Where("id", "a", comp.lesser))
+    assert merge_predicates(clause) == clause
+
+
+def test_merge_predicates_matches_members_by_type():
+    clause = and_(Where("id", (1, 2), comp.includes), Where("id", True))
+    assert is_always_false(merge_predicates(clause))
+
+
+def test_merge_predicates_reads_iterator_values_once():
+    clause = and_(
+        Where("id", iter([1, 2]), comp.includes), Where("id", "a", comp.lesser)
+    )
+    assert merge_predicates(clause) == and_(
+        Where("id", (1, 2), comp.includes), Where("id", "a", comp.lesser)
+    )
+
+
+def test_merge_predicates_matches_numbers_by_value():
+    assert merge_predicates(and_(Where("id", 1), Where("id", 1.0))) == Where("id", 1)
+    assert merge_predicates(
+        and_(Where("id", 1), Where("id", (1.0, 2), comp.includes))
+    ) == Where("id", 1)
+    assert merge_predicates(
+        and_(Where("id", Decimal("1.5")), Where("id", (1.5, 3), comp.includes))
+    ) == Where("id", Decimal("1.5"))
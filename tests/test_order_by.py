@@ -1,5 +1,14 @@
+import pytest
 import sqlalchemy as sa
-from gyver.query.order_by import OrderDirection, OrderBy
+
+from gyver.query.order_by import (
+    CompositeOrderBy,
+    NullsPosition,
+    OrderBy,
+    OrderDirection,
+    _column_map,
+    find_column,
+)
 from gyver.query.utils import compile_stmt
 from tests import mocks
 
@@ -22,3 +31,48 @@ def test_order_by_apply_applies_order_correctly():
     )
 
     assert OrderBy.none().apply(stmt) is stmt
+
+
+def test_order_by_applies_nulls_position():
+    stmt = sa.select(mocks.Person)
+    assert compile_stmt(
+        OrderBy.asc("name", NullsPosition.LAST).apply(stmt)
+    ) == compile_stmt(stmt.order_by(mocks.Person.name.asc().nulls_last()))
+    assert compile_stmt(
+        OrderBy.desc("age", NullsPosition.FIRST).apply(stmt)
+    ) == compile_stmt(stmt.order_by(mocks.Person.age.desc().nulls_first()))
+
+
+def test_order_by_falls_back_to_entity_attributes():
+    stmt = sa.select(mocks.Person.id_)
+    assert compile_stmt(OrderBy.desc("age").apply(stmt)) == compile_stmt(
+        stmt.order_by(mocks.Person.age.desc())
+    )
+    with pytest.raises(ValueError):
+        OrderBy.asc("unknown").apply(stmt)
+
+
+def test_find_column_prefers_projected_columns():
+    stmt = sa.select(mocks.PersonAddress, mocks.Another)
+    assert find_column(stmt, "id") is mocks.PersonAddress.__table__.c.id
+    assert find_column(stmt, "name") is mocks.Another.__table__.c.name
+
+
+def test_find_column_reuses_the_map_across_derived_statements():
+    stmt = sa.select(mocks.Person.id_, mocks.Person.name)
+    find_column(stmt, "name")
+    hits = _column_map.cache_info().hits
+    derived = stmt.where(mocks.Person.id_ > 1).order_by(mocks.Person.name)
+    assert find_column(derived, "name") is find_column(stmt, "name")
+    assert _column_map.cache_info().hits == hits + 2
+
+
+def test_composite_order_by_applies_all_fields_at_once():
+    stmt = sa.select(mocks.Person)
+    order = CompositeOrderBy(
+        OrderBy.desc("age", NullsPosition.LAST), OrderBy.none(), OrderBy.asc("id")
+    )
+    assert compile_stmt(order.apply(stmt)) == compile_stmt(
+        stmt.order_by(mocks.Person.age.desc().nulls_last(), mocks.Person.id_.asc())
+    )
+    assert CompositeOrderBy(OrderBy.none()).apply(stmt) is stmt
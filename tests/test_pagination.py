@@ -1,6 +1,30 @@
+import asyncio
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
 import sqlalchemy as sa
+from gyver.database import make_table
+from sqlalchemy.dialects import mysql, postgresql, sqlite
 
-from gyver.query.paginate import FieldPaginate, LimitOffsetPaginate, Paginate
+from gyver.query._dialect import Explain
+from gyver.query.exc import InvalidCursor
+from gyver.query.order_by import OrderBy
+from gyver.query.paginate import (
+    Cursor,
+    FieldPaginate,
+    KeysetPaginate,
+    LimitOffsetPaginate,
+    Page,
+    Paginate,
+    TotalMode,
+    afetch_page,
+    decode_cursor,
+    encode_cursor,
+    estimate_statement,
+    fetch_page,
+)
+from gyver.query.stream import stream
 from gyver.query.utils import compile_stmt
 from tests import mocks
 
@@ -48,3 +72,232 @@ def test_field_paginate_gets_correct_field_on_join():
     assert compile_stmt(FieldPaginate(limit, offset).apply(stmt)) == compile_stmt(
         stmt.where(mocks.PersonAddress.id_ > offset).limit(limit)
     )
+
+
+keyset_table = make_table(
+    "keyset_items",
+    sa.Column("id", sa.Integer, primary_key=True),
+    sa.Column("score", sa.Integer),
+    sa.Column("created_at", sa.Date),
+)
+
+
+@pytest.fixture
+def engine():
+    engine = sa.create_engine("sqlite:///:memory:", poolclass=sa.pool.StaticPool)
+    with engine.connect() as conn:
+        keyset_table.create(conn)
+        conn.execute(
+            keyset_table.insert().values(
+                [
+                    {"id": idx, "score": idx % 3, "created_at": date(2023, 1, idx)}
+                    for idx in range(1, 11)
+                ]
+            )
+        )
+        conn.commit()
+    yield engine
+    engine.dispose()
+
+
+def _walk(conn: sa.Connection, order: tuple[OrderBy, ...], row_comparison=True):
+    pages, cursor = [], None
+    while True:
+        paginate = KeysetPaginate(3, order, cursor, row_comparison)
+        rows = conn.execute(paginate.apply(sa.select(keyset_table))).all()
+        if not rows:
+            return pages
+        pages.append([row.id for row in rows])
+        cursor = paginate.next_cursor(rows[-1])
+
+
+def test_cursor_roundtrip_keeps_types():
+    values = (1, "a", date(2023, 1, 1), datetime(2023, 1, 1, 12), Decimal("1.5"))
+    assert decode_cursor(encode_cursor(values, backwards=True)) == Cursor(values, True)
+
+
+def test_decode_cursor_rejects_invalid_cursors():
+    with pytest.raises(InvalidCursor):
+        decode_cursor("not a cursor")
+
+
+def test_keyset_paginate_applies_row_comparison():
+    stmt = sa.select(mocks.Another)
+    paginate = KeysetPaginate(10, (OrderBy.asc("name"), OrderBy.asc("id")))
+    cursor = encode_cursor(["x", 5])
+    assert compile_stmt(
+        KeysetPaginate(10, paginate.order, cursor).apply(stmt)
+    ) == compile_stmt(
+        stmt.where(sa.tuple_(mocks.Another.name, mocks.Another.id_) > sa.tuple_("x", 5))
+        .order_by(mocks.Another.name.asc(), mocks.Another.id_.asc())
+        .limit(10)
+    )
+
+
+def test_keyset_paginate_walks_non_unique_keys(engine: sa.Engine):
+    expected = [[3, 6, 9], [1, 4, 7], [10, 2, 5], [8]]
+    order = (OrderBy.asc("score"), OrderBy.asc("id"))
+    with engine.connect() as conn:
+        assert _walk(conn, order) == expected
+        assert _walk(conn, order, row_comparison=False) == expected
+
+
+def test_keyset_paginate_supports_mixed_directions(engine: sa.Engine):
+    order = (OrderBy.desc("score"), OrderBy.asc("created_at"))
+    with engine.connect() as conn:
+        assert _walk(conn, order) == [[2, 5, 8], [1, 4, 7], [10, 3, 6], [9]]
+
+
+def test_keyset_paginate_walks_backwards(engine: sa.Engine):
+    order = (OrderBy.asc("score"), OrderBy.asc("id"))
+    with engine.connect() as conn:
+        paginate = KeysetPaginate(3, order, encode_cursor([1, 10]))
+        rows = conn.execute(paginate.apply(sa.select(keyset_table))).all()
+        backwards = KeysetPaginate(3, order, paginate.prev_cursor(rows[0]))
+        rows = conn.execute(backwards.apply(sa.select(keyset_table))).all()
+        assert [row.id for row in backwards.restore_order(rows)] == [4, 7, 10]
+
+
+def test_keyset_paginate_reads_cursor_from_entities():
+    another = mocks.Another(id_=3, name="x")
+    paginate = KeysetPaginate(10, (OrderBy.asc("name"), OrderBy.asc("id")))
+    assert decode_cursor(paginate.next_cursor(another)).values == ("x", 3)
+    assert decode_cursor(paginate.next_cursor({"name": "y", "id": 1})).values == (
+        "y",
+        1,
+    )
+
+
+def test_keyset_paginate_reads_cursor_from_entity_rows():
+    engine = sa.create_engine("sqlite://")
+    mocks.Another.__table__.create(engine)
+    with sa.orm.Session(engine) as session:
+        session.add_all([mocks.Another(id_=idx, name=f"n{idx}") for idx in (1, 2)])
+        session.flush()
+        paginate = KeysetPaginate(1, (OrderBy.asc("id"),))
+        rows = session.execute(paginate.apply(sa.select(mocks.Another))).all()
+        assert decode_cursor(paginate.next_cursor(rows[0])).values == (1,)
+    engine.dispose()
+
+
+def test_keyset_paginate_requires_selected_order_fields():
+    engine = sa.create_engine("sqlite://")
+    mocks.Person.__table__.create(engine)
+    paginate = KeysetPaginate(1, (OrderBy.asc("id"),))
+    with sa.orm.Session(engine) as session:
+        session.add(mocks.Person(id_=1, name="n1"))
+        session.flush()
+        with pytest.raises(ValueError, match="id must be selected"):
+            paginate.apply(sa.select(mocks.Person.name))
+        with pytest.raises(ValueError, match="id must be selected"):
+            list(stream(session, sa.select(mocks.Person.name), [OrderBy.asc("id")]))
+        query = paginate.apply(sa.select(mocks.Person.name, mocks.Person.id_))
+        rows = session.execute(query).all()
+        assert decode_cursor(paginate.next_cursor(rows[0])).values == (1,)
+    engine.dispose()
+
+
+def test_fetch_page_uses_lookahead_for_has_next(engine: sa.Engine):
+    query = sa.select(keyset_table).order_by(keyset_table.c.id)
+    with engine.connect() as conn:
+        page = fetch_page(conn, query, LimitOffsetPaginate(4, 4))
+        assert [row.id for row in page.items] == [5, 6, 7, 8]
+        assert page.has_next and page.total is None
+        last = fetch_page(conn, query, LimitOffsetPaginate(4, 8))
+        assert [row.id for row in last.items] == [9, 10]
+        assert not last.has_next
+        everything = fetch_page(conn, query, Paginate.none())
+        assert len(everything.items) == 10 and not everything.has_next
+
+
+def test_fetch_page_reads_exact_total_from_window(engine: sa.Engine):
+    query = sa.select(keyset_table.c.id).where(keyset_table.c.score > 0)
+    with engine.connect() as conn:
+        page = fetch_page(
+            conn,
+            query.order_by(keyset_table.c.id),
+            LimitOffsetPaginate(3, 3),
+            TotalMode.EXACT,
+            scalars=True,
+        )
+        empty = fetch_page(
+            conn,
+            query.where(keyset_table.c.id > 10),
+            FieldPaginate(3, 0),
+            TotalMode.EXACT,
+        )
+    assert page == Page([5, 7, 8], True, 7)
+    assert empty == Page([], False, 0)
+
+
+def test_fetch_page_exact_keeps_rows_and_counts_past_the_end(engine: sa.Engine):
+    query = sa.select(keyset_table).order_by(keyset_table.c.id)
+    with engine.connect() as conn:
+        page = fetch_page(conn, query, LimitOffsetPaginate(2, 0), TotalMode.EXACT)
+        past = fetch_page(conn, query, LimitOffsetPaginate(2, 20), TotalMode.EXACT)
+    assert [row.id for row in page.items] == [1, 2]
+    assert page.items[0]._fields == ("id", "score", "created_at")
+    assert page.total == 10
+    assert past == Page([], False, 10)
+
+
+def test_fetch_page_estimate_falls_back_to_exact_without_planner(engine: sa.Engine):
+    with engine.connect() as conn:
+        page = fetch_page(
+            conn,
+            sa.select(keyset_table),
+            KeysetPaginate(4, (OrderBy.asc("id"),)),
+            TotalMode.ESTIMATE,
+        )
+    assert [item[0] for item in page.items] == [1, 2, 3, 4]
+    assert (page.total, page.estimated, page.has_next) == (10, False, True)
+
+
+def test_estimate_statement_per_dialect():
+    query = sa.select(keyset_table).where(keyset_table.c.score == 1)
+    assert str(estimate_statement(query, postgresql.dialect())).startswith(
+        "EXPLAIN (FORMAT JSON) SELECT"
+    )
+    assert estimate_statement(query, mysql.dialect()) is None
+    assert "information_schema.TABLES" in str(
+        estimate_statement(sa.select(keyset_table), mysql.dialect())
+    )
+    assert estimate_statement(query, sqlite.dialect()) is None
+
+
+def test_estimate_statement_keeps_values_bound(engine: sa.Engine):
+    label = sa.cast(keyset_table.c.id, sa.Text)
+    query = sa.select(keyset_table).where(label == "a :b")
+    compiled = estimate_statement(query, postgresql.dialect()).compile(
+        dialect=postgresql.dialect()
+    )
+    assert "a :b" not in str(compiled)
+    assert list(compiled.params.values()) == ["a :b"]
+    with engine.connect() as conn:
+        for value in ("a :b", "1"):
+            explain = Explain(query.where(label == value), "EXPLAIN QUERY PLAN")
+            assert conn.execute(explain).all()
+
+
+class _AsyncConnection:
+    def __init__(self, conn: sa.Connection) -> None:
+        self.conn = conn
+        self.dialect = conn.dialect
+
+    async def execute(self, statement):
+        return self.conn.execute(statement)
+
+
+def test_afetch_page_matches_fetch_page(engine: sa.Engine):
+    query = sa.select(keyset_table).order_by(keyset_table.c.id)
+    with engine.connect() as conn:
+        expected = fetch_page(conn, query, LimitOffsetPaginate(3, 0), TotalMode.EXACT)
+        page = asyncio.run(
+            afetch_page(
+                _AsyncConnection(conn),
+                query,
+                LimitOffsetPaginate(3, 0),
+                TotalMode.ESTIMATE,
+            )
+        )
+    assert page == expected
@@ -0,0 +1,134 @@
+import asyncio
+import importlib.util
+from datetime import date
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from gyver.query import comp
+from gyver.query.parallel import (
+    aparallel_select,
+    parallel_select,
+    shard_statements,
+    split_range,
+)
+from gyver.query.where import ApplyWhere, Where
+
+requires_aiosqlite = pytest.mark.skipif(
+    importlib.util.find_spec("aiosqlite") is None, reason="aiosqlite not installed"
+)
+
+metadata = sa.MetaData()
+events = sa.Table(
+    "parallel_events",
+    metadata,
+    sa.Column("id", sa.Integer, primary_key=True),
+    sa.Column("kind", sa.Text),
+    sa.Column("score", sa.Integer, nullable=True),
+)
+rows = [
+    {"id": idx, "kind": "odd" if idx % 2 else "even", "score": idx % 7 or None}
+    for idx in range(1, 101)
+]
+
+
+@pytest.fixture
+def database(tmp_path):
+    url = f"sqlite:///{tmp_path / 'parallel.db'}"
+    engine = sa.create_engine(url)
+    metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(events.insert(), rows)
+    engine.dispose()
+    return url
+
+
+def _query():
+    query = sa.select(events.c.id, events.c.score)
+    return ApplyWhere(events, Where("kind", "even")).apply(query)
+
+
+def test_split_range_covers_everything():
+    assert split_range(1, 100, 4) == [(None, 25), (25, 50), (50, 75), (75, None)]
+    assert split_range(3, 3, 4) == [(None, None)]
+    assert split_range(date(2024, 1, 1), date(2024, 1, 5), 2) == [
+        (None, date(2024, 1, 3)),
+        (date(2024, 1, 3), None),
+    ]
+    with pytest.raises(ValueError):
+        split_range(1, 2, 0)
+
+
+def test_nullable_columns_get_a_null_shard():
+    assert len(shard_statements(_query(), events.c.id, [(None, None)])) == 1
+    assert len(shard_statements(_query(), events.c.score, [(None, None)])) == 2
+
+
+def test_parallel_select_matches_serial(database):
+    engine = sa.create_engine(database)
+    with engine.connect() as conn:
+        expected = conn.scalars(_query().order_by(events.c.id)).all()
+    assert (
+        parallel_select(engine, _query(), "id", shards=3, ordered=True, scalars=True)
+        == expected
+    )
+    unordered = parallel_select(engine, _query(), "score", shards=4, workers=2)
+    assert sorted(row.id for row in unordered) == expected
+    bounded = parallel_select(engine, _query(), "id", bounds=(40, 60), scalars=True)
+    assert sorted(bounded) == expected
+    empty = _query().where(Where("id", 0, comp.lesser).bind(events))
+    assert parallel_select(engine, empty, "id") == []
+    with pytest.raises(ValueError):
+        parallel_select(engine, _query().limit(5), "id")
+    engine.dispose()
+
+
+def test_parallel_select_keeps_the_callers_order(database):
+    engine = sa.create_engine(database)
+    newest = _query().order_by(events.c.id.desc())
+    assert parallel_select(
+        engine, newest, "id", shards=3, ordered=True, scalars=True
+    ) == list(range(100, 0, -2))
+    by_score = _query().order_by(events.c.score, events.c.id)
+    with pytest.raises(ValueError):
+        parallel_select(engine, by_score, "id", ordered=True)
+    with engine.connect() as conn:
+        expected = conn.execute(by_score).all()
+    assert parallel_select(engine, by_score, "id", shards=1, bounds=(1, 100)) == (
+        expected
+    )
+    engine.dispose()
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        sa.select(events.c.kind, sa.func.count(), sa.func.min(events.c.id)).group_by(
+            events.c.kind
+        ),
+        sa.select(events.c.id, events.c.kind).distinct(),
+        sa.select(sa.func.max(events.c.score).label("id")),
+    ],
+)
+def test_grouped_queries_cannot_be_sharded(database, query):
+    engine = sa.create_engine(database)
+    with pytest.raises(ValueError, match="GROUP BY"):
+        parallel_select(engine, query, "id")
+    engine.dispose()
+
+
+@requires_aiosqlite
+def test_aparallel_select_matches_sync(database):
+    async def run():
+        engine = create_async_engine(database.replace("sqlite", "sqlite+aiosqlite"))
+        ordered = await aparallel_select(
+            engine, _query(), "id", shards=5, workers=2, ordered=True, scalars=True
+        )
+        unordered = await aparallel_select(engine, _query(), "score")
+        await engine.dispose()
+        return ordered, unordered
+
+    ordered, unordered = asyncio.run(run())
+    assert ordered == list(range(2, 101, 2))
+    assert sorted(row.id for row in unordered) == ordered
@@ -73,3 +73,24 @@ def test_apply_where_returns_the_expected_result():
     assert compile_stmt(
         ApplyWhere(mapper, Where("id", 5, comp.greater)).apply(initial)
     ) == compile_stmt(initial.where(mapper.c.id > 5))
+
+
+def test_where_folds_plain_values_and_interns_fields():
+    field = "".join(["na", "me"])
+    where = Where(field, "x")
+    assert where.resolver is None and where.value == "x"
+    assert where.expected == Resolver("x")
+    assert where.field is Where("name", "y").field
+    assert not hasattr(where, "__dict__")
+
+    related = Where("id", "id", resolver_class=FieldResolver)
+    assert related.expected == FieldResolver("id")
+    assert related != Where("id", "id")
+    assert Where("id", 1) != Where("id", True)
+
+
+def test_with_field_keeps_the_comparison():
+    related = Where("id", "parent_id", comp.greater, FieldResolver)
+    moved = related.with_field("".join(["chi", "ld.id"]))
+    assert moved == Where("child.id", "parent_id", comp.greater, FieldResolver)
+    assert moved.field is Where("child.id").field
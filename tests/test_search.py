@@ -0,0 +1,134 @@
+import sqlite3
+import warnings
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+
+from gyver.query import comp
+from gyver.query.order_by import CompositeOrderBy, OrderBy, RankOrderBy
+from gyver.query.where import Where
+
+metadata = sa.MetaData()
+docs = sa.Table(
+    "docs",
+    metadata,
+    sa.Column("id", sa.Integer, primary_key=True),
+    sa.Column("body", sa.Text),
+    sa.Column("search", postgresql.TSVECTOR),
+)
+
+
+def _has_fts5() -> bool:
+    try:
+        sqlite3.connect(":memory:").execute("CREATE VIRTUAL TABLE t USING fts5(a)")
+    except sqlite3.OperationalError:
+        return False
+    return True
+
+
+requires_fts5 = pytest.mark.skipif(not _has_fts5(), reason="sqlite lacks FTS5")
+
+
+def _sql(expr, dialect) -> str:
+    return str(expr.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+
+
+@pytest.fixture
+def conn():
+    engine = sa.create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.exec_driver_sql("CREATE TABLE docs (id INTEGER PRIMARY KEY, body TEXT)")
+        conn.exec_driver_sql(
+            "CREATE VIRTUAL TABLE docs_fts USING fts5("
+            "body, content='docs', content_rowid='id')"
+        )
+        conn.execute(
+            docs.insert(),
+            [
+                {"id": 1, "body": "hello big world"},
+                {"id": 2, "body": "hello there"},
+                {"id": 3, "body": "world hello world hello"},
+            ],
+        )
+        conn.exec_driver_sql("INSERT INTO docs_fts(docs_fts) VALUES ('rebuild')")
+        yield conn
+    engine.dispose()
+
+
+def test_search_compiles_per_dialect():
+    expr = comp.search(docs.c.body, "hello world")
+    assert _sql(expr, postgresql.dialect()) == (
+        "to_tsvector('english'::regconfig, docs.body) @@ "
+        "websearch_to_tsquery('english'::regconfig, 'hello world')"
+    )
+    assert _sql(expr, mysql.dialect()) == (
+        'MATCH (docs.body) AGAINST (\'+"hello" +"world"\' IN BOOLEAN MODE)'
+    )
+    assert _sql(comp.search(docs.c.search, "x"), postgresql.dialect()).startswith(
+        "docs.search @@"
+    )
+    assert _sql(comp.fuzzy_match(docs.c.body, "helo"), postgresql.dialect()) == (
+        "docs.body %% 'helo'"
+    )
+
+
+def test_search_handles_quotes_and_empty_targets():
+    assert _sql(comp.search(docs.c.body, 'a"b "c'), mysql.dialect()) == (
+        'MATCH (docs.body) AGAINST (\'+"ab" +"c"\' IN BOOLEAN MODE)'
+    )
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        for target in ("", "  ", '" "'):
+            assert _sql(comp.search(docs.c.body, target), postgresql.dialect()) == (
+                "true"
+            )
+            assert _sql(comp.search(docs.c.body, target), sqlite.dialect()) == "1"
+            assert _sql(comp.search_rank(docs.c.body, target), mysql.dialect()) == (
+                "0.0"
+            )
+
+
+def test_search_rejects_unsafe_configs():
+    with pytest.raises(ValueError):
+        comp.search_using("english'; --")(docs.c.body, "x")
+
+
+def test_rank_order_by_orders_by_relevance():
+    query = RankOrderBy("body", "hello").apply(sa.select(docs.c.id, docs.c.body))
+    assert _sql(query, postgresql.dialect()).endswith(
+        "ORDER BY ts_rank(to_tsvector('english'::regconfig, docs.body), "
+        "websearch_to_tsquery('english'::regconfig, 'hello')) DESC"
+    )
+    assert RankOrderBy("body", None).apply(sa.select(docs.c.id)) is not None
+
+
+@requires_fts5
+def test_search_uses_fts5_on_sqlite(conn):
+    query = sa.select(docs.c.id, docs.c.body).where(
+        Where("body", "hello world", comp.search).bind(docs)
+    )
+    ordered = CompositeOrderBy(RankOrderBy("body", "hello world"), OrderBy.asc("id"))
+    assert conn.scalars(ordered.apply(query)).all() == [3, 1]
+    quoted = sa.select(docs.c.id).where(comp.search(docs.c.body, '"there'))
+    assert conn.scalars(quoted).all() == [2]
+
+
+@requires_fts5
+def test_search_uses_the_rowid_for_non_integer_keys(conn):
+    notes = sa.Table(
+        "notes",
+        sa.MetaData(),
+        sa.Column("uuid", sa.String, primary_key=True),
+        sa.Column("body", sa.Text),
+    )
+    conn.exec_driver_sql("CREATE TABLE notes (uuid TEXT PRIMARY KEY, body TEXT)")
+    conn.exec_driver_sql(
+        "CREATE VIRTUAL TABLE notes_fts USING fts5(body, content='notes')"
+    )
+    conn.execute(notes.insert(), [{"uuid": "a-1", "body": "hello"}])
+    conn.exec_driver_sql("INSERT INTO notes_fts(notes_fts) VALUES ('rebuild')")
+    query = sa.select(notes.c.uuid).where(comp.search(notes.c.body, "hello"))
+    assert conn.scalars(query).all() == ["a-1"]
+    ranked = sa.select(comp.search_rank(notes.c.body, "hello")).select_from(notes)
+    assert conn.scalar(ranked) > 0
@@ -0,0 +1,67 @@
+from datetime import date
+
+import pytest
+import sqlalchemy as sa
+
+from gyver.query.exc import FieldNotFound, InvalidFilter
+from gyver.query.null import NullBind
+from gyver.query.spec import FilterParser, parse_filters
+from gyver.query.utils import compile_stmt
+
+from .mocks import Another, Person, RelatedPerson
+
+
+def test_parse_filters_maps_suffixes_to_comparators():
+    clause = parse_filters(
+        Person,
+        {
+            "age__gte": "18",
+            "name__ilike": "jo",
+            "birth_date__between": "2000-01-01,2001-01-01",
+            "last_login__isnull": "false",
+            "id__in": "1,2",
+            "name": "john",
+        },
+    )
+    assert compile_stmt(clause.bind(Person)) == compile_stmt(
+        sa.and_(
+            Person.age >= 18,
+            Person.birth_date.between(date(2000, 1, 1), date(2001, 1, 1)),
+            Person.id_.in_([1, 2]),
+            Person.last_login.is_not(None),
+            Person.name == "john",
+            Person.name.ilike("%jo%"),
+        )
+    )
+
+
+def test_parse_filters_supports_relation_paths():
+    clause = parse_filters(RelatedPerson, {"address.another.name": "x"})
+    assert compile_stmt(clause.bind(RelatedPerson)) == compile_stmt(Another.name == "x")
+
+
+def test_parse_filters_validates_against_the_mapper():
+    with pytest.raises(FieldNotFound):
+        parse_filters(Person, {"unknown__gte": 1})
+    with pytest.raises(InvalidFilter):
+        parse_filters(Person, {"age__near": 1})
+    with pytest.raises(InvalidFilter):
+        parse_filters(Person, {"age__gte": "eighteen"})
+    with pytest.raises(InvalidFilter):
+        parse_filters(Person, {"age__between": "1,2,3"})
+    with pytest.raises(InvalidFilter):
+        parse_filters(Person, {"name__isnull": "maybe"})
+
+
+def test_parse_filters_without_params_is_a_no_op():
+    assert parse_filters(Person, {}) == NullBind()
+
+
+def test_plans_are_cached_per_mapper_and_keys():
+    parser = FilterParser()
+    first = parser.plan(Person, ["age__gte", "name"])
+    assert parser.plan(Person, ["name", "age__gte"]) is first
+    assert parser.plan(Another, ["name"]) is not first
+    assert parser.parse(Person, {"age__gte": 30, "name": "x"}) == parser.parse(
+        Person, {"name": "x", "age__gte": "30"}
+    )
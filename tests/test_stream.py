@@ -0,0 +1,130 @@
+import asyncio
+import importlib.util
+
+import pytest
+import sqlalchemy as sa
+from gyver.database import make_table
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from gyver.query import comp
+from gyver.query.order_by import OrderBy
+from gyver.query.stream import astream, stream
+from gyver.query.where import Where
+from tests import mocks
+
+requires_aiosqlite = pytest.mark.skipif(
+    importlib.util.find_spec("aiosqlite") is None, reason="aiosqlite not installed"
+)
+
+stream_table = make_table(
+    "stream_items",
+    sa.Column("id", sa.Integer, primary_key=True),
+    sa.Column("kind", sa.Text),
+)
+rows = [{"id": idx, "kind": "odd" if idx % 2 else "even"} for idx in range(1, 26)]
+
+
+@pytest.fixture
+def engine():
+    engine = sa.create_engine("sqlite:///:memory:", poolclass=sa.pool.StaticPool)
+    with engine.connect() as conn:
+        stream_table.create(conn)
+        conn.execute(stream_table.insert().values(rows))
+        conn.commit()
+    yield engine
+    engine.dispose()
+
+
+def test_stream_walks_all_rows(engine: sa.Engine):
+    with engine.connect() as conn:
+        ids = [
+            row.id
+            for row in stream(
+                conn, sa.select(stream_table), [OrderBy.asc("id")], page_size=4
+            )
+        ]
+    assert ids == list(range(1, 26))
+
+
+def test_stream_applies_filters_and_yields_batches(engine: sa.Engine):
+    with engine.connect() as conn:
+        pages = list(
+            stream(
+                conn,
+                sa.select(stream_table),
+                [OrderBy.desc("id")],
+                where=[Where("id", 10, comp.greater), Where("kind", "even")],
+                page_size=3,
+                batches=True,
+            )
+        )
+    assert [[row.id for row in page] for page in pages] == [
+        [24, 22, 20],
+        [18, 16, 14],
+        [12],
+    ]
+
+
+def test_stream_walks_entity_rows():
+    engine = sa.create_engine("sqlite://")
+    mocks.Person.__table__.create(engine)
+    with sa.orm.Session(engine) as session:
+        session.add_all([mocks.Person(id_=idx, name=f"p{idx}") for idx in range(1, 6)])
+        session.flush()
+        rows = stream(
+            session, sa.select(mocks.Person), [OrderBy.asc("id")], page_size=2
+        )
+        assert [row[0].id_ for row in rows] == [1, 2, 3, 4, 5]
+    engine.dispose()
+
+
+async def _seeded_engine():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:", poolclass=sa.pool.StaticPool
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(stream_table.create)
+        await conn.execute(stream_table.insert().values(rows))
+    return engine
+
+
+async def _collect(**kwargs):
+    engine = await _seeded_engine()
+    async with engine.connect() as conn:
+        result = [
+            item
+            async for item in astream(
+                conn, sa.select(stream_table), [OrderBy.asc("id")], **kwargs
+            )
+        ]
+    await engine.dispose()
+    return result
+
+
+@requires_aiosqlite
+@pytest.mark.parametrize("prefetch", [True, False])
+def test_astream_walks_all_rows(prefetch: bool):
+    result = asyncio.run(_collect(page_size=5, prefetch=prefetch))
+    assert [row.id for row in result] == list(range(1, 26))
+
+
+@requires_aiosqlite
+def test_astream_yields_batches():
+    result = asyncio.run(_collect(page_size=10, batches=True))
+    assert [len(page) for page in result] == [10, 10, 5]
+
+
+@requires_aiosqlite
+def test_astream_cancels_prefetch_when_consumer_stops():
+    async def first_row():
+        engine = await _seeded_engine()
+        async with engine.connect() as conn:
+            iterator = astream(
+                conn, sa.select(stream_table), [OrderBy.asc("id")], page_size=5
+            )
+            first = await iterator.__anext__()
+            await iterator.aclose()
+        await engine.dispose()
+        return first
+
+    assert asyncio.run(first_row()).id == 1
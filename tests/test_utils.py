@@ -0,0 +1,159 @@
+from datetime import date, datetime, time
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from gyver.query import comp
+from gyver.query.utils import (
+    as_date,
+    as_lower,
+    as_time,
+    as_upper,
+    compile_stmt,
+    is_case_insensitive,
+)
+
+metadata = sa.MetaData()
+events = sa.Table(
+    "util_events",
+    metadata,
+    sa.Column("id", sa.Integer, primary_key=True),
+    sa.Column("created_at", sa.DateTime),
+    sa.Column("day", sa.Date),
+    sa.Column("at", sa.Time),
+    sa.Column("name", sa.Text),
+    sa.Column("code", sa.String(collation="NOCASE")),
+    sa.Column("tag", sa.Text, info={"case_insensitive": True}),
+)
+sa.Index("ix_util_events_name", sa.func.upper(events.c.name))
+users = sa.Table(
+    "util_users",
+    sa.MetaData(),
+    sa.Column("email", postgresql.CITEXT),
+)
+
+
+@pytest.fixture
+def conn():
+    engine = sa.create_engine("sqlite://")
+    metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(
+            events.insert(),
+            [
+                {"id": 1, "created_at": datetime(2024, 1, 1, 0, 0), "code": "AB"},
+                {"id": 2, "created_at": datetime(2024, 1, 1, 23, 59), "code": "ab"},
+                {"id": 3, "created_at": datetime(2024, 1, 2, 12, 0), "code": "cd"},
+                {"id": 4, "created_at": datetime(2024, 1, 3, 0, 0), "code": None},
+            ],
+        )
+        yield conn
+    engine.dispose()
+
+
+def _ids(conn, condition) -> list[int]:
+    query = sa.select(events.c.id).where(condition).order_by(events.c.id)
+    return conn.scalars(query).all()
+
+
+@pytest.mark.parametrize(
+    "comparator, target",
+    [
+        (comp.equals, date(2024, 1, 1)),
+        (comp.not_equals, date(2024, 1, 1)),
+        (comp.greater, date(2024, 1, 1)),
+        (comp.greater_equals, date(2024, 1, 2)),
+        (comp.lesser, date(2024, 1, 2)),
+        (comp.lesser_equals, date(2024, 1, 2)),
+        (comp.between, (date(2024, 1, 1), date(2024, 1, 2))),
+        (comp.range, (date(2024, 1, 1), date(2024, 1, 3))),
+        (comp.includes, [date(2024, 1, 1), date(2024, 1, 3)]),
+    ],
+)
+def test_as_date_matches_function_semantics(conn, comparator, target):
+    rewritten = as_date(comparator)(events.c.created_at, target)
+    assert "date(" not in compile_stmt(rewritten)
+    assert _ids(conn, rewritten) == _ids(
+        conn, comparator(sa.func.date(events.c.created_at), target)
+    )
+
+
+def test_as_date_keeps_function_when_not_rewritable():
+    assert compile_stmt(
+        as_date(comp.equals)(events.c.created_at, datetime(2024, 1, 1))
+    ).startswith("date(")
+    assert compile_stmt(as_date(comp.like)(events.c.created_at, "2024")).startswith(
+        "date("
+    )
+    assert compile_stmt(as_date(comp.equals)(events.c.name, date(2024, 1, 1))) == (
+        "date(util_events.name) = '2024-01-01'"
+    )
+
+
+def test_converters_skip_columns_of_the_target_type():
+    assert compile_stmt(as_date(comp.equals)(events.c.day, date(2024, 1, 1))) == (
+        "util_events.day = '2024-01-01'"
+    )
+    assert compile_stmt(as_time(comp.greater)(events.c.at, time(12))) == (
+        "util_events.at > '12:00:00'"
+    )
+    assert compile_stmt(
+        as_time(comp.greater)(events.c.created_at, time(12))
+    ).startswith("time(")
+
+
+def test_case_insensitive_columns_are_compared_directly(conn):
+    assert is_case_insensitive(events.c.code)
+    assert is_case_insensitive(events.c.tag)
+    assert is_case_insensitive(users.c.email)
+    assert not is_case_insensitive(events.c.name)
+    rewritten = as_lower(comp.equals)(events.c.code, "ab")
+    assert compile_stmt(rewritten) == "util_events.code = 'ab'"
+    assert _ids(conn, rewritten) == [1, 2]
+    assert _ids(conn, as_upper(comp.includes)(events.c.code, ["AB", "CD"])) == [
+        1,
+        2,
+        3,
+    ]
+    assert compile_stmt(as_lower(comp.equals)(events.c.code, "Ab")).startswith("lower(")
+    assert compile_stmt(as_lower(comp.greater)(events.c.code, "ab")).startswith(
+        "lower("
+    )
+
+
+def test_case_converters_follow_declared_functional_indexes():
+    assert compile_stmt(as_lower(comp.equals)(events.c.name, "ab")) == (
+        "upper(util_events.name) = 'AB'"
+    )
+    assert compile_stmt(as_lower(comp.includes)(events.c.name, ["ab"])) == (
+        "upper(util_events.name) IN ('AB')"
+    )
+    assert compile_stmt(as_upper(comp.equals)(events.c.name, "AB")) == (
+        "upper(util_events.name) = 'AB'"
+    )
+    assert compile_stmt(as_lower(comp.like)(events.c.name, "ab")).startswith("lower(")
+
+
+def test_case_rewrites_need_folded_ascii_targets():
+    for target in ("ABC", "stra\u00dfe", ["ab", "Cd"]):
+        comparator = comp.includes if isinstance(target, list) else comp.equals
+        assert compile_stmt(as_lower(comparator)(events.c.name, target)).startswith(
+            "lower("
+        )
+        assert compile_stmt(as_lower(comparator)(events.c.code, target)).startswith(
+            "lower("
+        )
+    accent = sa.Column("accent", sa.String(collation="utf8mb4_0900_ai_ci"))
+    case_only = sa.Column("case_only", sa.String(collation="utf8mb4_0900_as_ci"))
+    assert not is_case_insensitive(accent)
+    assert is_case_insensitive(case_only)
+
+
+def test_case_rewrites_read_iterator_targets_once():
+    for column in (events.c.name, events.c.code):
+        for values in (["ab", "cd"], ["ab", "Cd"]):
+            expected = compile_stmt(as_lower(comp.includes)(column, list(values)))
+            assert compile_stmt(as_lower(comp.includes)(column, iter(values))) == (
+                expected
+            )